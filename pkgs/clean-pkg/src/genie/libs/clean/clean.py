@@ -1,4 +1,5 @@
 # Python
+import time
 import logging
 from functools import partial
 from collections import OrderedDict
@@ -25,6 +26,11 @@ from genie.libs.clean.utils import (
     get_image_handler)
 from genie.metaparser.util.schemaengine import Schema, Optional
 from genie.libs.clean.recovery import recovery_processor, block_section
+from genie.libs.clean.timing import (
+    stage_record,
+    save_records,
+    format_records,
+    get_image_size)
 
 # Logger
 log = logging.getLogger(__name__)
@@ -99,12 +105,19 @@ class BaseStage(TestContainer):
         # Update the parameters with user provided
         self.parameters.update(parameters)
 
-        for func in self:
+        # (step name, seconds) of each step run
+        self.step_timings = []
+
+        for name, func in zip(self.exec_order, self):
             # Retrieve a partial func with all func args populated
             func = self.apply_parameters(func, self.parameters)
 
             # Run it
-            func()
+            start = time.time()
+            try:
+                func()
+            finally:
+                self.step_timings.append((name, time.time() - start))
 
     def __iter__(self):
 
@@ -142,6 +155,8 @@ class CleanTestcase(Testcase):
         self.device_recovery_processor = None
         self.image_handler = get_image_handler(device)
         self.history = OrderedDict()
+        # Timing record of each stage run
+        self.timings = []
         super().__init__(*args, **kwargs)
 
     def __iter__(self):
@@ -154,6 +169,7 @@ class CleanTestcase(Testcase):
         '''
         self.discover()
         used_uids = {}
+        image_size = get_image_size(self.device.clean.get('images'))
 
         order = self.device.clean['order']
         while True:
@@ -219,7 +235,12 @@ class CleanTestcase(Testcase):
                 # like 'steps' and 'section' to be propagated. Do not remove.
                 cls.parameters.internal = new_section.parameters.internal
 
+                start = time.time()
                 yield new_section
+                self.timings.append(stage_record(
+                    self.device, stage, cls.uid, new_section.result, start,
+                    time.time(), getattr(cls, 'step_timings', None),
+                    image_size))
 
                 pass_order = self.stages[stage]['change_order_if_pass']
                 if pass_order and new_section.result in [Passed, Passx]:
@@ -347,6 +368,9 @@ class DeviceClean(BaseCleaner):
         global_stage_reuse_limit = getattr(
             self, 'global_stage_reuse_limit', GLOBAL_STAGE_REUSE_LIMIT)
 
+        # JSON lines file the stage timings are appended to
+        timings_file = getattr(self, 'timings_file', None)
+
         clean_testcase = CleanTestcase(device, global_stage_reuse_limit)
         if reporter:
             clean_testcase.reporter = reporter.testcase(clean_testcase)
@@ -354,7 +378,11 @@ class DeviceClean(BaseCleaner):
         with clean_testcase:
             # 1. Figure out what section to run
             # 2. Run them
-            result = clean_testcase()
+            try:
+                result = clean_testcase()
+            finally:
+                self.report_timings(device, clean_testcase.timings,
+                                    timings_file)
 
             if not result:
                 # change back to defaults so consecutive runs in a script wont
@@ -364,6 +392,19 @@ class DeviceClean(BaseCleaner):
 
                 raise Exception("Clean {result}.".format(result=str(result)))
 
+    @staticmethod
+    def report_timings(device, timings, timings_file=None):
+        if not timings:
+            return
+        log.info(banner("Clean stage timings of '{}'".format(device.name)))
+        log.info(format_records(timings))
+        if timings_file:
+            try:
+                save_records(timings_file, timings)
+            except OSError as e:
+                log.warning("Cannot save clean timings to {f}: {e}"
+                            .format(f=timings_file, e=e))
+
 
 class PyatsDeviceClean(DeviceClean):
 
@@ -2,10 +2,17 @@ import logging
 
 # Genie
 from genie.libs.clean.utils import validate_clean
+from genie.libs.clean.timing import (
+    CleanEstimator,
+    load_records,
+    get_plan_devices,
+    format_plan)
 
 # pyATS
 from pyats.cli.base import Subcommand
 from pyats.utils.commands import do_lint
+from pyats.utils.yaml import Loader
+from pyats.utils.yaml.markup import Processor as MarkupProcessor
 
 log = logging.getLogger(__name__)
 
@@ -44,6 +51,18 @@ class ValidateClean(Subcommand):
                                  dest = 'lint',
                                  default = True,
                                  help = "Do not lint the testbed YAML file")
+        # estimate the clean duration
+        self.parser.add_argument('--plan',
+                                 action='store_true',
+                                 default=False,
+                                 help='Estimate the clean duration from the '
+                                      'timings of past cleans')
+        self.parser.add_argument('--timings-file',
+                                 metavar='FILE',
+                                 type=str,
+                                 help='Clean timings file written by the '
+                                      'cleaner timings_file option, used by '
+                                      '--plan')
 
     def run(self, args):
         if args.lint:
@@ -62,3 +81,38 @@ class ValidateClean(Subcommand):
             for exception in validation_results['exceptions']:
                 log.error(exception)
 
+        if args.plan:
+            self.plan(args)
+
+    def plan(self, args):
+        if not args.timings_file:
+            log.error('--plan requires --timings-file')
+            return
+
+        try:
+            records = load_records(args.timings_file)
+        except OSError as e:
+            log.error('Cannot read the timings file: {}'.format(e))
+            return
+
+        # Load yaml without parsing markup
+        loader = Loader(enable_extensions=True,
+                        markupprocessor=MarkupProcessor(reference=True,
+                                                        callable=False,
+                                                        env_var=False,
+                                                        include_file=False,
+                                                        ask=False,
+                                                        encode=False))
+        try:
+            clean_dict = loader.load(args.clean_file, locations={})
+            testbed_dict = loader.load(args.testbed_file, locations={})
+        except Exception as e:
+            log.error('Cannot load the clean or testbed file: {}'.format(e))
+            return
+
+        plan = CleanEstimator(records).plan(
+            get_plan_devices(clean_dict, testbed_dict))
+
+        log.info('\nClean Plan')
+        log.info('----------')
+        log.info(format_plan(plan))
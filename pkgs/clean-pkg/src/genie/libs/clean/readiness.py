@@ -0,0 +1,419 @@
+'''Readiness probes for devices coming back from a reload or a power cycle.
+
+Instead of sleeping for a fixed time before reconnecting, clean stages and
+the recovery processor can wait until the device answers on the network or
+on its console:
+
+    >>> from genie.libs.clean.readiness import wait_for_device
+    >>> wait_for_device(device, timeout=600)
+
+The probes built from the device connections run concurrently, and are
+retried with an exponential backoff until one of them succeeds. The time the
+device took to come back is recorded per platform in `boot_times`, and
+optionally appended to a file, so the stage timeouts can be tuned.
+'''
+
+# Python
+import re
+import json
+import time
+import socket
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Genie
+from genie.metaparser.util.schemaengine import Optional
+
+# Logger
+log = logging.getLogger(__name__)
+
+# sysUpTime.0
+SYS_UPTIME_OID = '1.3.6.1.2.1.1.3.0'
+
+# What a console prints once the device booted
+CONSOLE_ACTIVITY_PATTERN = r'(Press RETURN to get started|[Uu]sername:|' \
+                           r'[Ll]ogin:|[Pp]assword:)'
+
+# Prompt of the booted device, anchored to its hostname so that the rommon
+# prompt and the '#' progress lines of the boot do not match
+CONSOLE_PROMPT_PATTERN = r'^\s*{hostname}(\([^)]*\))?[>#]\s*$'
+
+# Telnet IAC sequences, removed from the console output
+_TELNET_IAC = re.compile(rb'\xff[\xfb-\xfe].|\xff[\xf0-\xfa]')
+
+
+class Probe(object):
+    '''Base class of the readiness probes.
+
+    Args:
+        host (`str`): Address to probe
+        port (`int`): Port to probe
+        timeout (`int`): Time in seconds allowed for one check. Default to 5
+    '''
+
+    name = 'probe'
+
+    def __init__(self, host, port, timeout=5):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def __repr__(self):
+        return '{n}({h}:{p})'.format(n=self.name, h=self.host, p=self.port)
+
+    def check(self):
+        '''Returns True if the device answered the probe'''
+        raise NotImplementedError
+
+
+class TcpProbe(Probe):
+    '''Probe succeeding once the port accepts connections, and, if given,
+    sends a banner matching `banner`. Used for ssh (`SSH-` banner) and
+    telnet ports.
+    '''
+
+    name = 'tcp'
+
+    def __init__(self, host, port, banner=None, timeout=5):
+        super().__init__(host, port, timeout=timeout)
+        self.banner = banner
+
+    def check(self):
+        with socket.create_connection((self.host, self.port),
+                                      timeout=self.timeout) as sock:
+            if not self.banner:
+                return True
+            data = sock.recv(256).decode(errors='replace')
+            return bool(re.search(self.banner, data))
+
+
+class ConsoleActivityProbe(Probe):
+    '''Probe succeeding once the device console, behind a terminal server,
+    prints something matching `pattern`.
+
+    The console is only read. When it stays silent for `timeout` seconds, a
+    carriage return is sent once to get the prompt of a device which is
+    already up, matched when `hostname` is given. A console line in use by
+    another session does not accept the connection, so the device
+    connections must be destroyed first.
+    '''
+
+    name = 'console'
+
+    def __init__(self, host, port, pattern=CONSOLE_ACTIVITY_PATTERN,
+                 hostname=None, timeout=5):
+        super().__init__(host, port, timeout=timeout)
+        if hostname:
+            pattern = '{p}|{h}'.format(p=pattern, h=CONSOLE_PROMPT_PATTERN
+                                       .format(hostname=re.escape(hostname)))
+        self.pattern = pattern
+
+    def _read(self, sock):
+        data = b''
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            try:
+                chunk = sock.recv(4096)
+            except socket.timeout:
+                break
+            if not chunk:
+                break
+            data += chunk
+            text = _TELNET_IAC.sub(b'', data).decode(errors='replace')
+            if re.search(self.pattern, text, re.MULTILINE):
+                return True
+        return False
+
+    def check(self):
+        with socket.create_connection((self.host, self.port),
+                                      timeout=self.timeout) as sock:
+            if self._read(sock):
+                return True
+            sock.sendall(b'\r')
+            return self._read(sock)
+
+
+class SnmpUptimeProbe(Probe):
+    '''Probe succeeding once the device answers sysUpTime over SNMP, and has
+    been up for at least `min_uptime` seconds. Requires pysnmp.
+    '''
+
+    name = 'snmp'
+
+    def __init__(self, host, port=161, community='public', min_uptime=0,
+                 timeout=5):
+        super().__init__(host, port, timeout=timeout)
+        self.community = community
+        self.min_uptime = min_uptime
+
+    def check(self):
+        from genie.libs.sdk.powercycler.snmp_client import SNMPClient
+        client = SNMPClient(host=self.host, port=self.port,
+                            read_community=self.community)
+        value = client.snmp_get(SYS_UPTIME_OID)[0]
+        # TimeTicks, in hundredths of a second
+        return int(value) / 100 >= self.min_uptime
+
+
+PROBES = ('ssh', 'telnet', 'console', 'snmp')
+
+# Schema of the `readiness_probe` argument of the stages and recovery,
+# passed to wait_for_device
+readiness_schema = {
+    Optional('timeout'): int,
+    Optional('probes'): list,
+    Optional('interval'): int,
+    Optional('max_interval'): int,
+    Optional('via'): str,
+    Optional('snmp_community'): str,
+    Optional('probe_timeout'): int,
+    Optional('boot_times_file'): str,
+}
+
+
+def get_device_probes(device, probes=None, via=None, snmp_community=None,
+                      probe_timeout=5):
+    '''Build the readiness probes of a device from its connections.
+
+    Args:
+        device (`obj`): Device object
+        probes (`list`): Kinds of probes to build, among 'ssh', 'telnet',
+                         'console' and 'snmp'. Default to all of them
+        via (`str`): Only probe this connection
+        snmp_community (`str`): SNMP community of the snmp probe. No snmp
+                                probe without it
+        probe_timeout (`int`): Time in seconds allowed for one check
+
+    Returns:
+        `list` of `Probe`
+    '''
+    probes = probes or PROBES
+    ret = []
+    snmp_hosts = set()
+    for name, connection in getattr(device, 'connections', {}).items():
+        if via and name != via:
+            continue
+        try:
+            host = connection.get('ip') or connection.get('host')
+            protocol = connection.get('protocol')
+            port = connection.get('port')
+        except AttributeError:
+            continue
+        if not host:
+            continue
+        host = str(host)
+
+        if protocol == 'ssh' and 'ssh' in probes:
+            ret.append(TcpProbe(host, port or 22, banner=r'SSH-',
+                                timeout=probe_timeout))
+        elif protocol == 'telnet' and port and 'console' in probes:
+            # telnet to a terminal server port is the console
+            ret.append(ConsoleActivityProbe(host, port, hostname=device.name,
+                                            timeout=probe_timeout))
+        elif protocol == 'telnet' and 'telnet' in probes:
+            ret.append(TcpProbe(host, port or 23, timeout=probe_timeout))
+
+        if snmp_community and 'snmp' in probes and \
+                protocol == 'ssh' and host not in snmp_hosts:
+            snmp_hosts.add(host)
+            ret.append(SnmpUptimeProbe(host, community=snmp_community,
+                                       timeout=probe_timeout))
+    return ret
+
+
+class ReadinessProbe(object):
+    '''Run probes concurrently until one succeeds.
+
+    Args:
+        probes (`list`): Probes to run
+        timeout (`int`): Max time in seconds to wait. Default to 600
+        interval (`int`): Time in seconds between the first rounds of
+                          probes, multiplied by `backoff` after each round.
+                          Default to 5
+        max_interval (`int`): Max time in seconds between two rounds.
+                              Default to 60
+        backoff (`int`): Factor applied to the interval after each round.
+                         Default to 2
+    '''
+
+    def __init__(self, probes, timeout=600, interval=5, max_interval=60,
+                 backoff=2):
+        self.probes = list(probes)
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+
+    @staticmethod
+    def _check(probe):
+        try:
+            return probe.check()
+        except Exception as e:
+            log.debug('Probe {p} failed: {e}'.format(p=probe, e=e))
+            return False
+
+    def wait(self):
+        '''Wait until a probe succeeds.
+
+        Returns:
+            (`float`, `Probe`): seconds waited and the probe which succeeded
+
+        Raises:
+            TimeoutError: No probe succeeded within the timeout
+        '''
+        if not self.probes:
+            raise ValueError('No readiness probe to run')
+
+        start = time.monotonic()
+        deadline = start + self.timeout
+        interval = self.interval
+        with ThreadPoolExecutor(max_workers=len(self.probes)) as executor:
+            while True:
+                results = list(executor.map(self._check, self.probes))
+                for probe, ready in zip(self.probes, results):
+                    if ready:
+                        return time.monotonic() - start, probe
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        'No readiness probe succeeded within {t} seconds: {p}'
+                        .format(t=self.timeout, p=self.probes))
+                log.info('Device not ready yet, probing again in {} seconds'
+                         .format(int(min(interval, remaining))))
+                time.sleep(min(interval, remaining))
+                interval = min(interval * self.backoff, self.max_interval)
+
+
+class BootTimes(object):
+    '''Boot times observed per os and platform.
+
+    Args:
+        path (`str`): JSON lines file where each boot time is appended, to
+                      summarize boot times across runs
+    '''
+
+    def __init__(self, path=None):
+        self.path = path
+        self._records = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def platform(device):
+        return (getattr(device, 'os', None) or 'generic',
+                getattr(device, 'platform', None) or 'generic')
+
+    def record(self, device, seconds, probe=None, path=None):
+        os_, platform = self.platform(device)
+        record = {'device': device.name, 'os': os_, 'platform': platform,
+                  'seconds': round(seconds, 1),
+                  'probe': getattr(probe, 'name', None),
+                  'time': time.time()}
+        path = path or self.path
+        with self._lock:
+            self._records.append(record)
+            if path:
+                try:
+                    with open(path, 'a') as f:
+                        f.write(json.dumps(record) + '\n')
+                except OSError as e:
+                    log.warning('Cannot write boot time to {p}: {e}'
+                                .format(p=path, e=e))
+        return record
+
+    def load(self, path=None):
+        '''Records of this process, or of the file'''
+        path = path or self.path
+        if not path:
+            with self._lock:
+                return list(self._records)
+        records = []
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+        except (OSError, ValueError) as e:
+            log.warning('Cannot read boot times from {p}: {e}'
+                        .format(p=path, e=e))
+        return records
+
+    def summary(self, path=None):
+        '''Boot times per (os, platform)
+
+        Returns:
+            `dict`: {(os, platform): {'count', 'min', 'max', 'mean'}}
+        '''
+        per_platform = {}
+        for record in self.load(path):
+            per_platform.setdefault((record['os'], record['platform']), []).\
+                append(record['seconds'])
+        return {key: {'count': len(values),
+                      'min': min(values),
+                      'max': max(values),
+                      'mean': round(sum(values) / len(values), 1)}
+                for key, values in per_platform.items()}
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+boot_times = BootTimes()
+
+
+def wait_for_device(device, timeout=600, probes=None, interval=5,
+                    max_interval=60, via=None, snmp_community=None,
+                    probe_timeout=5, since=None, boot_times_file=None):
+    '''Wait until a device answers its readiness probes, and record the time
+    it took to come back.
+
+    Args:
+        device (`obj`): Device object
+        timeout (`int`): Max time in seconds to wait. Default to 600
+        probes (`list`): Kinds of probes, among 'ssh', 'telnet', 'console'
+                         and 'snmp'. Default to all of them
+        interval (`int`): First time in seconds between two rounds of probes.
+                          Default to 5
+        max_interval (`int`): Max time in seconds between two rounds of
+                              probes. Default to 60
+        via (`str`): Only probe this connection
+        snmp_community (`str`): SNMP community used by the snmp probe
+        probe_timeout (`int`): Time in seconds allowed for one check
+        since (`float`): time.time() when the reload or power cycle started,
+                         boot time is measured from it. Default to now
+        boot_times_file (`str`): JSON lines file the boot time is appended to
+
+    Returns:
+        `float`: boot time in seconds
+
+    Raises:
+        TimeoutError: The device did not come back within the timeout
+        ValueError: No probe can be built from the device connections
+    '''
+    device_probes = get_device_probes(device, probes=probes, via=via,
+                                      snmp_community=snmp_community,
+                                      probe_timeout=probe_timeout)
+    if not device_probes:
+        raise ValueError('No readiness probe can be built from the '
+                         'connections of {}'.format(device.name))
+
+    log.info('Waiting for {d} to be ready, probing {p}'.format(
+        d=device.name, p=device_probes))
+    start = time.time() if since is None else since
+    _, probe = ReadinessProbe(device_probes, timeout=timeout,
+                              interval=interval,
+                              max_interval=max_interval).wait()
+    seconds = time.time() - start
+
+    record = boot_times.record(device, seconds, probe=probe,
+                               path=boot_times_file)
+    key = (record['os'], record['platform'])
+    stats = boot_times.summary(boot_times_file).get(key)
+    log.info('{d} ready after {s:.0f} seconds ({p} probe). Boot time of '
+             '{o}/{pl}: min {mi}s, mean {me}s, max {ma}s over {c} boot(s)'
+             .format(d=device.name, s=seconds, p=probe.name, o=key[0],
+                     pl=key[1], mi=stats['min'], me=stats['mean'],
+                     ma=stats['max'], c=stats['count']))
+    return seconds
@@ -14,8 +14,8 @@ from unicon.eal.dialogs import Statement
 
 # Genie
 from genie.libs import clean
-from genie.abstract import Lookup
-from genie.libs.clean.utils import clean_schema
+from genie.libs.clean.utils import clean_schema, lookup_from_device
+from genie.libs.clean.readiness import readiness_schema, wait_for_device
 
 # MetaParser
 from genie.metaparser.util.schemaengine import Optional, Or
@@ -70,7 +70,8 @@ def _connectivity(device, console_activity_pattern=None, console_breakboot_char=
                   grub_breakboot_char=None, break_count=10,
                   timeout=None, golden_image=None, tftp_boot=None,
                   recovery_password=None, clear_line=True, powercycler=True,
-                  powercycler_delay=30, section=None, reconnect_delay=60, **kwargs):
+                  powercycler_delay=30, section=None, reconnect_delay=60,
+                  readiness_probe=None, **kwargs):
 
     '''Powercycle the device and start the recovery process
        Args:
@@ -89,6 +90,8 @@ def _connectivity(device, console_activity_pattern=None, console_breakboot_char=
            clear_line: <Should clearline execute, 'bool'> (Default: True)
            powercycler_delay: <Powercycler delay between on/off>, 'int'> (Default: 30)
            reconnect_delay: <Once device recovered, delay before final reconnect>, 'int'> (Default: 60)
+           readiness_probe ('dict'): wait_for_device arguments, to wait for the device to be
+                                     ready instead of sleeping for reconnect_delay
        Returns:
            None
     '''
@@ -116,9 +119,12 @@ def _connectivity(device, console_activity_pattern=None, console_breakboot_char=
                             "console port line".format(device.name))
 
     # Step-3: Powercycle device
+    # boot time is measured from the power cycle
+    since = None
     if powercycler:
         log.info(banner("Powercycling device '{}'".format(device.name)))
 
+        since = time.time()
         try:
             device.api.execute_power_cycle_device(delay=powercycler_delay)
         except Exception as e:
@@ -149,7 +155,7 @@ def _connectivity(device, console_activity_pattern=None, console_breakboot_char=
 
     # For each default connection, start a fork to try to recover the device
     try:
-        abstract = Lookup.from_device(device, packages={'clean': clean})
+        abstract = lookup_from_device(device, packages={'clean': clean})
         # Item is needed to be able to know in which parallel child
         # we are
 
@@ -183,8 +189,18 @@ def _connectivity(device, console_activity_pattern=None, console_breakboot_char=
         log.info("Successfully recovered the device '{}'".\
                  format(device.name))
 
-    log.info('Sleeping for {r} before reconnection'.format(r=reconnect_delay))
-    time.sleep(reconnect_delay)
+    if readiness_probe is not None:
+        readiness_args = dict(readiness_probe)
+        readiness_args.setdefault('timeout', timeout or 600)
+        try:
+            wait_for_device(device, since=since, **readiness_args)
+        except (TimeoutError, ValueError) as e:
+            # Still try to reconnect below
+            log.warning('Device {d} is not ready: {e}'.format(d=device.name,
+                                                              e=e))
+    else:
+        log.info('Sleeping for {r} before reconnection'.format(r=reconnect_delay))
+        time.sleep(reconnect_delay)
 
     # Step-5: Disconnect and reconnect to the device
     if not _disconnect_reconnect(device):
@@ -220,6 +236,7 @@ def _connectivity(device, console_activity_pattern=None, console_breakboot_char=
     Optional('powercycler'): bool,
     Optional('powercycler_delay'): int,
     Optional('reconnect_delay'): int,
+    Optional('readiness_probe'): readiness_schema,
     Optional('post_recovery_configuration'): str,
 })
 def recovery_processor(
@@ -239,6 +256,7 @@ def recovery_processor(
         powercycler_delay=30,
         reconnect_delay=60,
         post_recovery_configuration=None,
+        readiness_probe=None,
         ):
 
     '''
@@ -258,6 +276,15 @@ def recovery_processor(
           powercycler: <Should powercycler execute, 'bool'> (Default: True)
           powercycler_delay: <Powercycler delay between on/off>, 'int'> (Default: 30)
           reconnect_delay: <Once device recovered, delay before final reconnect>, 'int'> (Default: 60)
+          readiness_probe: <Wait for the device to answer its probes instead of sleeping for reconnect_delay>
+            timeout: <Max time in seconds to wait, 'int'> (Default: timeout, or 600)
+            probes: <Probes among ssh, telnet, console and snmp, 'list'> (Default: all)
+            interval: <First time in seconds between two rounds of probes, doubled after each round, 'int'> (Default: 5)
+            max_interval: <Max time in seconds between two rounds of probes, 'int'> (Default: 60)
+            via: <Only probe this connection, 'str'>
+            snmp_community: <SNMP community of the snmp probe, 'str'>
+            probe_timeout: <Time in seconds allowed for one probe, 'int'> (Default: 5)
+            boot_times_file: <File the observed boot times are appended to, 'str'>
           clear_line: <Should clearline execute, 'bool'> (Default: True)
           post_recovery_configuration: <Configuration to apply to the device, 'str'>
           golden_image: <Golden image to boot the device with, 'list' or 'dict' in the format below>
@@ -361,7 +388,8 @@ Recovery Steps:
                           console_breakboot_telnet_break, grub_activity_pattern,
                           grub_breakboot_char, break_count, timeout,
                           golden_image, tftp_boot, recovery_password, clear_line, powercycler,
-                          powercycler_delay, section, reconnect_delay)
+                          powercycler_delay, section, reconnect_delay,
+                          readiness_probe=readiness_probe)
         except Exception as e:
             # Could not recover the device!
             log.error(banner("*** Terminating Genie Clean ***"))
@@ -15,6 +15,7 @@ from genie.libs.clean.recovery.recovery import _disconnect_reconnect
 from genie.metaparser.util.schemaengine import Optional, Any
 from genie.utils.timeout import Timeout
 from genie.libs.clean import BaseStage
+from genie.libs.clean.readiness import readiness_schema, wait_for_device
 from genie.libs.sdk.libs.abstracted_libs.iosxe.subsection import get_default_dir
 from genie.libs.clean.utils import raise_
 
@@ -811,6 +812,33 @@ reload:
     reconnect_via (str, optional): Specify which connection to use after reloading.
         Defaults to the 'default' connection in the testbed yaml file.
 
+    readiness_probe (optional): Wait until the device answers on the network
+        or on its console before reconnecting, instead of reconnecting
+        blindly. The time the device took to come back is logged per platform.
+
+        timeout (int, optional): Max time in seconds to wait. Defaults to the
+            reload timeout.
+
+        probes (list, optional): Probes to run among ssh, telnet, console and
+            snmp. Defaults to all the probes the device connections allow.
+
+        interval (int, optional): Time in seconds between the first two rounds
+            of probes, doubled after each round. Defaults to 5.
+
+        max_interval (int, optional): Max time in seconds between two rounds
+            of probes. Defaults to 60.
+
+        via (str, optional): Only probe this connection.
+
+        snmp_community (str, optional): SNMP community of the snmp probe.
+            No snmp probe without it.
+
+        probe_timeout (int, optional): Time in seconds allowed for one probe.
+            Defaults to 5.
+
+        boot_times_file (str, optional): File the observed boot times are
+            appended to, to summarize them per platform across runs.
+
 
 Example
 -------
@@ -822,6 +850,9 @@ reload:
         reconnect_sleep: 200 (Unicon NXOS reload service argument)
     check_modules:
         check: False
+    readiness_probe:
+        probes: [ssh]
+        boot_times_file: /ws/boot_times.json
 """
     # =================
     # Argument Defaults
@@ -841,6 +872,7 @@ reload:
         'ignore_modules': None
     }
     RECONNECT_VIA = None
+    READINESS_PROBE = None
 
     # ============
     # Stage Schema
@@ -862,6 +894,7 @@ reload:
             Any(): Any()
         },
         Optional('reconnect_via'): str,
+        Optional('readiness_probe'): readiness_schema,
     }
 
     # ==============================
@@ -888,6 +921,7 @@ reload:
 
         with steps.start(f"Reload {device.name}") as step:
 
+            self.reload_start_time = time.time()
             try:
                 device.reload(**self.reload_service_args)
             except Exception as e:
@@ -916,7 +950,8 @@ reload:
 
 
     def disconnect_and_reconnect(self, steps, device, reload_service_args=None,
-                                 reconnect_via=RECONNECT_VIA):
+                                 reconnect_via=RECONNECT_VIA,
+                                 readiness_probe=READINESS_PROBE):
 
         if reload_service_args is None:
             # If user provides no custom values, take the defaults
@@ -935,6 +970,21 @@ reload:
             except Exception:
                 log.warning("Failed to destroy the device connection but "
                             "attempting to continue", exc_info=True)
+
+            if readiness_probe is not None:
+                readiness_args = dict(readiness_probe)
+                readiness_args.setdefault('timeout',
+                                          reload_service_args['timeout'])
+                try:
+                    wait_for_device(
+                        device, since=getattr(self, 'reload_start_time', None),
+                        **readiness_args)
+                except TimeoutError as e:
+                    step.failed("Device is not ready", from_exception=e)
+                except ValueError as e:
+                    log.warning(f"Cannot probe {device.name}, reconnecting "
+                                f"without waiting: {e}")
+
             connect_kwargs = {
                         'learn_hostname': True,
                         'prompt_recovery': reload_service_args['prompt_recovery']
@@ -7,10 +7,13 @@ import fnmatch
 import logging
 import ipaddress
 from typing import List
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
 # Genie
 from genie.utils.timeout import Timeout
 from genie.libs.clean import BaseStage
+from genie.libs.clean.readiness import readiness_schema, wait_for_device
 from genie.libs.clean.utils import (
     _apply_configuration,
     find_clean_variable,
@@ -18,6 +21,8 @@ from genie.libs.clean.utils import (
     remove_string_from_image,
     raise_)
 from genie.metaparser.util.schemaengine import Optional, Required, Any, Or
+from genie.libs.filetransferutils.session import session_pool
+from genie.libs.sdk.libs.utils.connection import is_connection_pool
 
 # pyATS
 from pyats.utils.fileutils import FileUtils
@@ -711,6 +716,83 @@ copy_to_linux:
                     step.skipped("File has been copied correctly but cannot "
                                  "verify file size")
 
+
+class _StepRecorder(object):
+    '''Record steps run outside of the section, to report them later.
+
+    Provides the `start` and result methods of the aetest steps used by the
+    stages. A result ends its step like it does for aetest steps, and an
+    exception raised in a step errors it. As for aetest steps started with
+    `continue_=False`, a failed or errored step (or substep) stops the code
+    recording the steps: `_Stop` is raised out of the outermost step.
+    '''
+
+    # Results which stop the recording code
+    STOP_RESULTS = ('failed', 'errored')
+
+    # Not Exceptions, like the aetest step signals, so that results are
+    # not caught by the error handling of the steps
+    class _Result(BaseException):
+        pass
+
+    class _Stop(BaseException):
+        pass
+
+    def __init__(self, name=None):
+        self.name = name
+        self.result = None
+        self.reason = None
+        self.from_exception = None
+        self.details = []
+        self.error = None
+
+    @contextmanager
+    def start(self, name):
+        step = _StepRecorder(name)
+        self.details.append(step)
+        try:
+            yield step
+        except self._Stop:
+            # a substep failed
+            raise
+        except self._Result:
+            pass
+        except Exception as e:
+            step.result, step.reason, step.from_exception = \
+                'errored', str(e), e
+        if step.result in self.STOP_RESULTS:
+            raise self._Stop()
+
+    def _end(self, result, reason, from_exception):
+        self.result = result
+        self.reason = reason
+        self.from_exception = from_exception
+        raise self._Result()
+
+    def passed(self, reason=None, from_exception=None):
+        self._end('passed', reason, from_exception)
+
+    def passx(self, reason=None, from_exception=None):
+        self._end('passx', reason, from_exception)
+
+    def skipped(self, reason=None, from_exception=None):
+        self._end('skipped', reason, from_exception)
+
+    def failed(self, reason=None, from_exception=None):
+        self._end('failed', reason, from_exception)
+
+    def report(self, steps):
+        '''Report the recorded steps with `steps`'''
+        for detail in self.details:
+            with steps.start(detail.name) as step:
+                detail.report(step)
+                if detail.result:
+                    kwargs = {}
+                    if detail.from_exception:
+                        kwargs['from_exception'] = detail.from_exception
+                    getattr(step, detail.result)(detail.reason, **kwargs)
+
+
 class CopyToDevice(BaseStage):
     """This stage will copy an image to a device from a networked location.
 
@@ -797,6 +879,12 @@ copy_to_device:
     prompt_recovery(bool, optional): Enable the prompt recovery when the  execution
         command timeout. Defaults to False.
 
+    max_workers (int, optional): Maximum number of destinations (standby and
+        stack member directories) handled concurrently. Only used when the
+        device connection is a connection pool, as the commands of all the
+        destinations run on the active. Defaults to None, one worker per
+        destination.
+
 Example
 -------
 copy_to_device:
@@ -834,6 +922,7 @@ copy_to_device:
     UNIQUE_NUMBER = None
     RENAME_IMAGES = None
     PROMPT_RECOVERY = False
+    MAX_WORKERS = None
 
 
     # ============
@@ -869,7 +958,8 @@ copy_to_device:
         Optional('unique_file_name', description="Appends a random six-digit number to the end of the image name.", default=UNIQUE_FILE_NAME): bool,
         Optional('unique_number', description="Appends the provided number to the end of the image name. Requires unique_file_name is True to be applied.", default=UNIQUE_NUMBER): int,
         Optional('rename_images', description="Rename the image to the provided name. If multiple files exist then an incrementing number is also appended.", default=RENAME_IMAGES): str,
-        Optional('prompt_recovery', description="Enable the prompt recovery when the  execution command timeout.", default=PROMPT_RECOVERY): bool
+        Optional('prompt_recovery', description="Enable the prompt recovery when the  execution command timeout.", default=PROMPT_RECOVERY): bool,
+        Optional('max_workers', description="Maximum number of destinations handled concurrently when the device connection is a connection pool.", default=MAX_WORKERS): int
     }
 
     # ==============================
@@ -900,6 +990,7 @@ copy_to_device:
                        unique_number=UNIQUE_NUMBER,
                        rename_images=RENAME_IMAGES,
                        prompt_recovery=PROMPT_RECOVERY,
+                       max_workers=MAX_WORKERS,
                        **kwargs
                        ):
         log.info("Section steps:\n1- Verify correct number of images provided"
@@ -916,8 +1007,9 @@ copy_to_device:
         # Get args
         server = origin['hostname']
 
-        # Establish FileUtils session for all FileUtils operations
-        file_utils = FileUtils(testbed=device.testbed)
+        # Use the shared FileUtils session of the server, kept open for the
+        # other stages and APIs using it
+        file_utils = session_pool.get(device.testbed, server, protocol)
 
         string_to_remove = file_utils.get_server_block(server).get('path', '')
         image_files = remove_string_from_image(images=origin['files'],
@@ -959,10 +1051,42 @@ copy_to_device:
                 else:
                     step.passed("Correct number of images provided")
 
+        protected_files = list(protected_files or [])
+        if not skip_deletion:
+            # TODO: add golden images, config to protected files once we have golden section
+            for key in ('golden_config', 'golden_image'):
+                protected_files.extend(find_clean_variable(self, key) or [])
+
+        copy_args = dict(
+            origin=origin, destination_act=destination_act, server=server,
+            file_utils=file_utils, protocol=protocol, vrf=vrf,
+            timeout=timeout, compact=compact, use_kstack=use_kstack,
+            overwrite=overwrite, skip_deletion=skip_deletion,
+            copy_attempts=copy_attempts,
+            copy_attempts_sleep=copy_attempts_sleep,
+            check_file_stability=check_file_stability,
+            stability_check_tries=stability_check_tries,
+            stability_check_delay=stability_check_delay,
+            min_free_space_percent=min_free_space_percent,
+            interface=interface, unique_file_name=unique_file_name,
+            unique_number=unique_number, rename_images=rename_images,
+            prompt_recovery=prompt_recovery, **kwargs)
+
+        # Destinations share the device connection, they can only be handled
+        # concurrently when it is a connection pool
+        workers = 1
+        if len(destinations) > 1 and max_workers != 1:
+            if is_connection_pool(device):
+                workers = min(len(destinations),
+                              max_workers or len(destinations))
+            else:
+                log.info("The connection to {} is not a connection pool, "
+                         "copying to {} one destination at a time"
+                         .format(device.name, ', '.join(destinations)))
+
         # Loop over all image files provided by user
         for index, file in enumerate(image_files):
             # Init
-            files_to_copy = {}
             unknown_size = False
 
             # Get filesize of image files on remote server
@@ -992,295 +1116,302 @@ copy_to_device:
                 else:
                     step.passed("Verified filesize of file '{}' to be "
                                 "{} bytes".format(file, file_size))
-            for dest in destinations:
-
-                # Execute 'dir' before copying image files
-                dir_before = device.execute('dir {}'.format(dest))
-
-                # Check if file with same name and size exists on device
-                dest_file_path = os.path.join(dest, os.path.basename(file))
-                image_mapping = self.history[
-                    'CopyToDevice'].parameters.setdefault('image_mapping', {})
-                image_mapping.update({origin['files'][index]: dest_file_path})
-                with steps.start("Check if file '{}' exists on device {} {}".\
-                                format(dest_file_path, device.name, dest)) as step:
-                    # Check if file exists
-                    try:
-                        exist = device.api.verify_file_exists(
-                            file=dest_file_path,
-                            size=file_size,
-                            dir_output=dir_before)
-                    except Exception as e:
-                        exist = False
-                        log.warning("Unable to check if image '{}' exists on device {} {}."
-                                    "Error: {}".format(dest_file_path,
-                                                       device.name,
-                                                       dest,
-                                                       str(e)))
-
-                    if (not exist) or (exist and overwrite) or (exist and (unique_file_name or unique_number or rename_images)):
-                        # Update list of files to copy
-                        file_copy_info = {
-                            file: {
-                                'size': file_size,
-                                'dest_path': dest_file_path,
-                                'exist': exist
-                            }
+
+            # Check, copy and verify the file on each destination. The
+            # destinations are handled concurrently when the device connection
+            # is a connection pool, their steps are reported in order.
+            def copy_to_destination(dest):
+                return self._copy_to_destination(
+                    device, dest, file, index, file_size, unknown_size,
+                    protected_files=list(protected_files), **copy_args)
+
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(copy_to_destination,
+                                                destinations))
+            else:
+                results = map(copy_to_destination, destinations)
+
+            parameters = self.history['CopyToDevice'].parameters
+            for result in results:
+                result.report(steps)
+                parameters.setdefault('image_mapping', {}).update(
+                    result.image_mapping)
+                if result.files_copied:
+                    parameters.setdefault('files_copied', {}).update(
+                        result.files_copied)
+                protected_files.extend(name for name in result.protected_files
+                                       if name not in protected_files)
+                if result.error:
+                    raise result.error
+
+    def _copy_to_destination(self, device, dest, file, index, file_size,
+                             unknown_size, origin, destination_act, server,
+                             file_utils, protocol, vrf, timeout, compact,
+                             use_kstack, protected_files, overwrite,
+                             skip_deletion, copy_attempts, copy_attempts_sleep,
+                             check_file_stability, stability_check_tries,
+                             stability_check_delay, min_free_space_percent,
+                             interface, unique_file_name, unique_number,
+                             rename_images, prompt_recovery, **kwargs):
+        '''Check, copy and verify an image file on one destination.
+
+        The steps are recorded rather than reported so that destinations
+        can be handled concurrently, the caller reports them and merges the
+        returned history in the destinations order.
+
+        Returns:
+            `_StepRecorder` with `image_mapping`, `files_copied` and
+            `protected_files` of the destination
+        '''
+        steps = _StepRecorder()
+        steps.image_mapping = {}
+        steps.files_copied = {}
+        steps.protected_files = protected_files
+        files_to_copy = {}
+
+        try:
+            # Execute 'dir' before copying image files
+            dir_before = device.execute('dir {}'.format(dest))
+
+            # Check if file with same name and size exists on device
+            dest_file_path = os.path.join(dest, os.path.basename(file))
+            steps.image_mapping[origin['files'][index]] = dest_file_path
+            with steps.start("Check if file '{}' exists on device {} {}".\
+                            format(dest_file_path, device.name, dest)) as step:
+                # Check if file exists
+                try:
+                    exist = device.api.verify_file_exists(
+                        file=dest_file_path,
+                        size=file_size,
+                        dir_output=dir_before)
+                except Exception as e:
+                    exist = False
+                    log.warning("Unable to check if image '{}' exists on device {} {}."
+                                "Error: {}".format(dest_file_path,
+                                                   device.name,
+                                                   dest,
+                                                   str(e)))
+
+                if (not exist) or (exist and overwrite) or (exist and (unique_file_name or unique_number or rename_images)):
+                    # Update list of files to copy
+                    file_copy_info = {
+                        file: {
+                            'size': file_size,
+                            'dest_path': dest_file_path,
+                            'exist': exist
                         }
-                        files_to_copy.update(file_copy_info)
-                        # Print message to user
-                        step.passed("Proceeding with copying image {} to device {}".\
-                                    format(dest_file_path, device.name))
-                    else:
-                        step.passed(
-                            "Image '{}' already exists on device {} {}, "
-                            "skipping copy".format(file, device.name, dest))
-
-                # Check if any file copy is in progress
-                if check_file_stability:
-                    for file in files_to_copy:
-                        with steps.start("Verify stability of file '{}'".\
-                                         format(file)) as step:
-                            # Check file stability
+                    }
+                    files_to_copy.update(file_copy_info)
+                    # Print message to user
+                    step.passed("Proceeding with copying image {} to device {}".\
+                                format(dest_file_path, device.name))
+                else:
+                    step.passed(
+                        "Image '{}' already exists on device {} {}, "
+                        "skipping copy".format(file, device.name, dest))
+
+            # Check if any file copy is in progress
+            if check_file_stability:
+                for file_to_copy in files_to_copy:
+                    with steps.start("Verify stability of file '{}'".\
+                                     format(file_to_copy)) as step:
+                        # Check file stability
+                        try:
+                            stable = device.api.verify_file_size_stable_on_server(
+                                file=file_to_copy,
+                                server=file_utils.get_hostname(server),
+                                protocol=protocol,
+                                fu_session=file_utils,
+                                delay=stability_check_delay,
+                                max_tries=stability_check_tries)
+
+                            if not stable:
+                                step.failed(
+                                    "The size of file '{}' on server is not "
+                                    "stable\n".format(file_to_copy), )
+                            else:
+                                step.passed(
+                                    "Size of file '{}' is stable".format(file_to_copy))
+                        except NotImplementedError:
+                            # cannot check using tftp
+                            step.passx(
+                                "Unable to check file stability over {protocol}"
+                                .format(protocol=protocol))
+                        except Exception as e:
+                            log.error(str(e))
+                            step.failed(
+                                "Error while verifying file stability on "
+                                "server\n")
+
+            # Verify available space on the device is sufficient for image copy, delete
+            # unprotected files if needed, copy file to the device
+            # unless overwrite: False
+            if files_to_copy:
+                with steps.start(
+                        "Verify sufficient free space on device '{}' '{}' or delete"
+                        " unprotected files".format(device.name,
+                                                    dest)) as step:
+
+                    if unknown_size:
+                        total_size = -1
+                        log.warning("Amount of space required cannot be confirmed, "
+                                    "copying the files on the device '{}' '{}' may fail".\
+                                    format(device.name, dest))
+
+                    # Try to free up disk space if skip_deletion is not set to True
+                    if not skip_deletion:
+                        # Only calculate size of file being copied
+                        total_size = sum(0 if file_data['exist'] \
+                                         else file_data['size'] for \
+                                         file_data in files_to_copy.values())
+
+                        try:
+                            free_space = device.api.free_up_disk_space(
+                                destination=dest,
+                                required_size=total_size,
+                                skip_deletion=skip_deletion,
+                                protected_files=protected_files,
+                                min_free_space_percent=min_free_space_percent,
+                                dir_output=dir_before,
+                                allow_deletion_failure=True)
+                            if not free_space:
+                                step.failed("Unable to create enough space for "
+                                               "image on device {} {}".\
+                                               format(device.name, dest))
+                            else:
+                                step.passed(
+                                    "Device {} {} has sufficient space to "
+                                    "copy images".format(device.name, dest))
+                        except Exception as e:
+                            log.error(str(e))
+                            step.failed("Error while creating free space for "
+                                           "image on device {} {}".\
+                                           format(device.name, dest))
+
+            # Copy the file to the devices
+            for file_to_copy, file_data in files_to_copy.items():
+                with steps.start("Copying image file {} to device {} {}".\
+                                 format(file_to_copy, device.name, dest)) as step:
+
+                    # Copy file unless overwrite is False
+                    if not overwrite and file_data['exist'] and not (unique_file_name or unique_number or rename_images):
+                        step.skipped(
+                            "File with the same name size exists on "
+                            "the device {} {}, skipped copying".format(
+                                device.name, dest))
+
+                    for i in range(1, copy_attempts + 1):
+                        if unique_file_name or unique_number or rename_images:
+
+                            log.info('renaming files for copying')
+                            if rename_images:
+                                rename_images = rename_images + '_' + str(index)
+
                             try:
-                                stable = device.api.verify_file_size_stable_on_server(
-                                    file=file,
-                                    server=file_utils.get_hostname(server),
+                                new_name = device.api.modify_filename(
+                                    file=os.path.basename(file_to_copy),
+                                    directory=destination_act,
+                                    server=server,
                                     protocol=protocol,
-                                    fu_session=file_utils,
-                                    delay=stability_check_delay,
-                                    max_tries=stability_check_tries)
-
-                                if not stable:
-                                    step.failed(
-                                        "The size of file '{}' on server is not "
-                                        "stable\n".format(file), )
-                                else:
-                                    step.passed(
-                                        "Size of file '{}' is stable".format(file))
-                            except NotImplementedError:
-                                # cannot check using tftp
-                                step.passx(
-                                    "Unable to check file stability over {protocol}"
-                                    .format(protocol=protocol))
+                                    unique_file_name=unique_file_name,
+                                    unique_number=unique_number,
+                                    new_name=rename_images)
                             except Exception as e:
-                                log.error(str(e))
                                 step.failed(
-                                    "Error while verifying file stability on "
-                                    "server\n")
-
-                # Verify available space on the device is sufficient for image copy, delete
-                # unprotected files if needed, copy file to the device
-                # unless overwrite: False
-                if files_to_copy:
-                    with steps.start(
-                            "Verify sufficient free space on device '{}' '{}' or delete"
-                            " unprotected files".format(device.name,
-                                                        dest)) as step:
-
-                        if unknown_size:
-                            total_size = -1
-                            log.warning("Amount of space required cannot be confirmed, "
-                                        "copying the files on the device '{}' '{}' may fail".\
-                                        format(device.name, dest))
-
-                        if not protected_files:
-                            protected_files = []
-
-                        # Try to free up disk space if skip_deletion is not set to True
-                        if not skip_deletion:
-                            # TODO: add golden images, config to protected files once we have golden section
-                            golden_config = find_clean_variable(
-                                self, 'golden_config')
-                            golden_image = find_clean_variable(
-                                self, 'golden_image')
-
-                            if golden_config:
-                                protected_files.extend(golden_config)
-                            if golden_image:
-                                protected_files.extend(golden_image)
-
-                            # Only calculate size of file being copied
-                            total_size = sum(0 if file_data['exist'] \
-                                             else file_data['size'] for \
-                                             file_data in files_to_copy.values())
+                                    "Can not change file name. Terminating clean:\n{e}".format(e=e))
 
-                            try:
-                                free_space = device.api.free_up_disk_space(
-                                    destination=dest,
-                                    required_size=total_size,
-                                    skip_deletion=skip_deletion,
-                                    protected_files=protected_files,
-                                    min_free_space_percent=min_free_space_percent,
-                                    dir_output=dir_before,
-                                    allow_deletion_failure=True)
-                                if not free_space:
-                                    step.failed("Unable to create enough space for "
-                                                   "image on device {} {}".\
-                                                   format(device.name, dest))
-                                else:
-                                    step.passed(
-                                        "Device {} {} has sufficient space to "
-                                        "copy images".format(device.name, dest))
-                            except Exception as e:
-                                log.error(str(e))
-                                step.failed("Error while creating free space for "
-                                               "image on device {} {}".\
-                                               format(device.name, dest))
+                            log.info(f'Renamed {os.path.basename(file_to_copy)} to {new_name}')
 
-                # Copy the file to the devices
-                for file, file_data in files_to_copy.items():
-                    with steps.start("Copying image file {} to device {} {}".\
-                                     format(file, device.name, dest)) as step:
-
-                        # Copy file unless overwrite is False
-                        if not overwrite and file_data['exist'] and not (unique_file_name or unique_number or rename_images):
-                            step.skipped(
-                                "File with the same name size exists on "
-                                "the device {} {}, skipped copying".format(
-                                    device.name, dest))
-
-                        for i in range(1, copy_attempts + 1):
-                            if unique_file_name or unique_number or rename_images:
-
-                                log.info('renaming files for copying')
-                                if rename_images:
-                                    rename_images = rename_images + '_' + str(index)
-
-                                try:
-                                    new_name = device.api.modify_filename(
-                                        file=os.path.basename(file),
-                                        directory=destination_act,
-                                        server=server,
-                                        protocol=protocol,
-                                        unique_file_name=unique_file_name,
-                                        unique_number=unique_number,
-                                        new_name=rename_images)
-                                except Exception as e:
-                                    step.failed(
-                                        "Can not change file name. Terminating clean:\n{e}".format(e=e))
-
-                                log.info(f'Renamed {os.path.basename(file)} to {new_name}')
-
-                                renamed_local_path = os.path.join(dest, new_name)
-
-                                renamed_file_data = {x: y for x,y in file_data.items()}
-                                renamed_file_data['dest_path'] = renamed_local_path
-
-                                self.history['CopyToDevice'].parameters['image_mapping'][file] = renamed_local_path
-
-                                try:
-                                    device.api.\
-                                        copy_to_device(protocol=protocol,
-                                                       server=file_utils.get_hostname(server),
-                                                       remote_path=file,
-                                                       local_path=renamed_local_path,
-                                                       vrf=vrf,
-                                                       timeout=timeout,
-                                                       compact=compact,
-                                                       use_kstack=use_kstack,
-                                                       interface=interface,
-                                                       overwrite=overwrite,
-                                                       prompt_recovery=prompt_recovery,
-                                                       **kwargs)
-                                except Exception as e:
-                                    # Retry attempt if user specified
-                                    if i < copy_attempts:
-                                        log.warning("Attempt #{}: Unable to copy {} to '{} {}' due to:\n{}".\
-                                                    format(i, file, device.name, dest, e))
-                                        log.info("Sleeping for {} seconds before retrying"
-                                                 .format(copy_attempts_sleep))
-                                        time.sleep(copy_attempts_sleep)
-                                        continue
-                                    else:
-                                        log.error(str(e))
-                                        step.failed(
-                                            "Failed to copy image '{}' to '{}' on device"
-                                            " '{}'\n".format(file, dest,
-                                                             device.name), )
-                            else:
-                                try:
-                                    device.api. \
-                                        copy_to_device(protocol=protocol,
-                                                       server=file_utils.get_hostname(server),
-                                                       remote_path=file,
-                                                       local_path=file_data['dest_path'],
-                                                       vrf=vrf,
-                                                       timeout=timeout,
-                                                       compact=compact,
-                                                       use_kstack=use_kstack,
-                                                       interface=interface,
-                                                       overwrite=overwrite,
-                                                       prompt_recovery=prompt_recovery,
-                                                       **kwargs)
-                                except Exception as e:
-                                    # Retry attempt if user specified
-                                    if i < copy_attempts:
-                                        log.warning("Attempt #{}: Unable to copy {} to '{} {}' due to:\n{}". \
-                                                    format(i, file, device.name, dest, e))
-                                        log.info("Sleeping for {} seconds before retrying"
-                                                 .format(copy_attempts_sleep))
-                                        time.sleep(copy_attempts_sleep)
-                                        continue
-                                    else:
-                                        log.error(str(e))
-                                        step.failed(
-                                            "Failed to copy image '{}' to '{}' on device"
-                                            " '{}'\n".format(file, dest,
-                                                             device.name), )
+                            renamed_local_path = os.path.join(dest, new_name)
 
-                            log.info(
-                                "File {} has been copied to {} on device {}"
-                                " successfully".format(file, dest,
-                                                       device.name))
-                            success_copy_ha = True
-                            break
+                            file_data = {x: y for x,y in file_data.items()}
+                            file_data['dest_path'] = renamed_local_path
 
-                        # Save the file copied path and size info for future use
-                        history = self.history['CopyToDevice'].parameters.\
-                                            setdefault('files_copied', {})
+                            steps.image_mapping[file_to_copy] = renamed_local_path
 
-                        if unique_file_name or unique_number or rename_images:
-                            history.update({file: renamed_file_data})
+                        try:
+                            device.api. \
+                                copy_to_device(protocol=protocol,
+                                               server=file_utils.get_hostname(server),
+                                               remote_path=file_to_copy,
+                                               local_path=file_data['dest_path'],
+                                               vrf=vrf,
+                                               timeout=timeout,
+                                               compact=compact,
+                                               use_kstack=use_kstack,
+                                               interface=interface,
+                                               overwrite=overwrite,
+                                               prompt_recovery=prompt_recovery,
+                                               **kwargs)
+                        except Exception as e:
+                            # Retry attempt if user specified
+                            if i < copy_attempts:
+                                log.warning("Attempt #{}: Unable to copy {} to '{} {}' due to:\n{}". \
+                                            format(i, file_to_copy, device.name, dest, e))
+                                log.info("Sleeping for {} seconds before retrying"
+                                         .format(copy_attempts_sleep))
+                                time.sleep(copy_attempts_sleep)
+                                continue
+                            else:
+                                log.error(str(e))
+                                step.failed(
+                                    "Failed to copy image '{}' to '{}' on device"
+                                    " '{}'\n".format(file_to_copy, dest,
+                                                     device.name), )
+
+                        log.info(
+                            "File {} has been copied to {} on device {}"
+                            " successfully".format(file_to_copy, dest,
+                                                   device.name))
+                        break
+
+                    # Save the file copied path and size info for future use
+                    steps.files_copied[file_to_copy] = file_data
+
+            with steps.start("Verify images successfully copied") as step:
+                # If nothing copied don't need to verify, skip
+                if not steps.files_copied:
+                    step.skipped(
+                        "Image files were not copied for {} {} in previous steps, "
+                        "skipping verification steps".format(device.name, dest))
+
+                # Execute 'dir' after copying image files
+                dir_after = device.execute('dir {}'.format(dest))
+
+                for name, image_data in steps.files_copied.items():
+                    with step.start("Verify image '{}' copied to {} on device {}".\
+                                    format(image_data['dest_path'], dest, device.name)) as substep:
+                        # if size is -1 it means it failed to get the size
+                        if not device.api.verify_file_exists(file=image_data['dest_path'],
+                                                             size=image_data['size'],
+                                                             dir_output=dir_after):
+                            substep.failed(
+                                "Either the file failed to copy OR the local file size is different "
+                                "than the origin file size on the device {}.".format(device.name))
                         else:
-                            history.update({file: file_data})
-
-                with steps.start("Verify images successfully copied") as step:
-                    # If nothing copied don't need to verify, skip
-                    if 'files_copied' not in self.history[
-                            'CopyToDevice'].parameters:
-                        step.skipped(
-                            "Image files were not copied for {} {} in previous steps, "
-                            "skipping verification steps".format(device.name, dest))
-
-                    # Execute 'dir' after copying image files
-                    dir_after = device.execute('dir {}'.format(dest))
-
-                    for name, image_data in self.history['CopyToDevice'].\
-                                                    parameters['files_copied'].items():
-                        with step.start("Verify image '{}' copied to {} on device {}".\
-                                        format(image_data['dest_path'], dest, device.name)) as substep:
-                            # if size is -1 it means it failed to get the size
-                            if not device.api.verify_file_exists(file=image_data['dest_path'],
-                                                                 size=image_data['size'],
-                                                                 dir_output=dir_after):
-                                substep.failed(
-                                    "Either the file failed to copy OR the local file size is different "
-                                    "than the origin file size on the device {}.".format(device.name))
+                            file_name = os.path.basename(file)
+                            if file_name not in protected_files:
+                                protected_files.append(file_name)
+                            log.info('{file_name} added to protected list'.format(file_name=file_name))
+                            if image_data['size'] != -1:
+                                substep.passed(
+                                    "File was successfully copied to device {}. "
+                                    "Local file size is the same as the origin file size.".\
+                                    format(device.name))
                             else:
-                                file_name = os.path.basename(file)
-                                if file_name not in protected_files:
-                                    protected_files.append(file_name)
-                                log.info('{file_name} added to protected list'.format(file_name=file_name))
-                                if image_data['size'] != -1:
-                                    substep.passed(
-                                        "File was successfully copied to device {}. "
-                                        "Local file size is the same as the origin file size.".\
-                                        format(device.name))
-                                else:
-                                    substep.skipped(
-                                        "File has been copied to device {}.Cannot verify integrity as "
-                                        "the original file size is unknown.".format(device.name))
+                                substep.skipped(
+                                    "File has been copied to device {}.Cannot verify integrity as "
+                                    "the original file size is unknown.".format(device.name))
+        except _StepRecorder._Stop:
+            # A step failed, the steps after it are not run. Its result
+            # stops the section when the caller reports it.
+            pass
+        except Exception as e:
+            # Raised by the caller once the recorded steps are reported
+            steps.error = e
+
+        return steps
 
 
 class WriteErase(BaseStage):
@@ -1363,6 +1494,33 @@ reload:
     reconnect_via (str, optional): Specify which connection to use after reloading.
         Defaults to the 'default' connection in the testbed yaml file.
 
+    readiness_probe (optional): Wait until the device answers on the network
+        or on its console before reconnecting, instead of reconnecting
+        blindly. The time the device took to come back is logged per platform.
+
+        timeout (int, optional): Max time in seconds to wait. Defaults to the
+            reload timeout.
+
+        probes (list, optional): Probes to run among ssh, telnet, console and
+            snmp. Defaults to all the probes the device connections allow.
+
+        interval (int, optional): Time in seconds between the first two rounds
+            of probes, doubled after each round. Defaults to 5.
+
+        max_interval (int, optional): Max time in seconds between two rounds
+            of probes. Defaults to 60.
+
+        via (str, optional): Only probe this connection.
+
+        snmp_community (str, optional): SNMP community of the snmp probe.
+            No snmp probe without it.
+
+        probe_timeout (int, optional): Time in seconds allowed for one probe.
+            Defaults to 5.
+
+        boot_times_file (str, optional): File the observed boot times are
+            appended to, to summarize them per platform across runs.
+
 
 Example
 -------
@@ -1374,6 +1532,9 @@ reload:
         reconnect_sleep: 200 (Unicon NXOS reload service argument)
     check_modules:
         check: False
+    readiness_probe:
+        probes: [ssh]
+        boot_times_file: /ws/boot_times.json
 """
     # =================
     # Argument Defaults
@@ -1390,6 +1551,7 @@ reload:
         'ignore_modules': None
     }
     RECONNECT_VIA = None
+    READINESS_PROBE = None
 
     # ============
     # Stage Schema
@@ -1408,6 +1570,7 @@ reload:
             Any(): Any()
         },
         Optional('reconnect_via'): str,
+        Optional('readiness_probe'): readiness_schema,
     }
 
     # ==============================
@@ -1433,6 +1596,7 @@ reload:
 
         with steps.start(f"Reload {device.name}") as step:
 
+            self.reload_start_time = time.time()
             try:
                 device.reload(**reload_service_args)
             except Exception as e:
@@ -1440,7 +1604,8 @@ reload:
                             f"seconds.", from_exception=e)
 
     def disconnect_and_reconnect(self, steps, device, reload_service_args=None,
-                                 reconnect_via=RECONNECT_VIA):
+                                 reconnect_via=RECONNECT_VIA,
+                                 readiness_probe=READINESS_PROBE):
 
         if reload_service_args is None:
             # If user provides no custom values, take the defaults
@@ -1459,6 +1624,21 @@ reload:
             except Exception:
                 log.warning("Failed to destroy the device connection but "
                             "attempting to continue", exc_info=True)
+
+            if readiness_probe is not None:
+                readiness_args = dict(readiness_probe)
+                readiness_args.setdefault('timeout',
+                                          reload_service_args['timeout'])
+                try:
+                    wait_for_device(
+                        device, since=getattr(self, 'reload_start_time', None),
+                        **readiness_args)
+                except TimeoutError as e:
+                    step.failed("Device is not ready", from_exception=e)
+                except ValueError as e:
+                    log.warning(f"Cannot probe {device.name}, reconnecting "
+                                f"without waiting: {e}")
+
             connect_kwargs = {
                         'learn_hostname': True,
                         'prompt_recovery': reload_service_args['prompt_recovery']
@@ -2665,11 +2845,40 @@ power_cycle:
     connect_retry_wait (int, optional). Time to wait before retrying to
         connect to the device. Defaults to 60 seconds.
 
+    readiness_probe (optional): Wait until the device answers on the network
+        or on its console before connecting, instead of sleeping for
+        sleep_before_connect. The time the device took to come back is logged per platform.
+
+        timeout (int, optional): Max time in seconds to wait. Defaults to the
+            boot timeout.
+
+        probes (list, optional): Probes to run among ssh, telnet, console and
+            snmp. Defaults to all the probes the device connections allow.
+
+        interval (int, optional): Time in seconds between the first two rounds
+            of probes, doubled after each round. Defaults to 5.
+
+        max_interval (int, optional): Max time in seconds between two rounds
+            of probes. Defaults to 60.
+
+        via (str, optional): Only probe this connection.
+
+        snmp_community (str, optional): SNMP community of the snmp probe.
+            No snmp probe without it.
+
+        probe_timeout (int, optional): Time in seconds allowed for one probe.
+            Defaults to 5.
+
+        boot_times_file (str, optional): File the observed boot times are
+            appended to, to summarize them per platform across runs.
+
 Example
 -------
 power_cycle:
     sleep_after_power_off: 5
     sleep_after_connect: 10
+    readiness_probe:
+        probes: [console]
 """
 
     # =================
@@ -2681,6 +2890,7 @@ power_cycle:
     SLEEP_AFTER_CONNECT = 0
     CONNECT_ARGUMENTS = {}
     CONNECT_RETRY_WAIT = 60
+    READINESS_PROBE = None
 
     # ============
     # Stage Schema
@@ -2692,6 +2902,7 @@ power_cycle:
         Optional('sleep_after_connect'): int,
         Optional('connect_arguments'): dict,
         Optional('connect_retry_wait'): int,
+        Optional('readiness_probe'): readiness_schema,
     }
 
     # ==============================
@@ -2705,6 +2916,7 @@ power_cycle:
     def powercycle(self, steps, device, sleep_after_power_off=SLEEP_AFTER_POWER_OFF):
 
         with steps.start(f"Powercycling '{device.name}'") as step:
+            self.power_cycle_time = time.time()
             try:
                 device.api.execute_power_cycle_device(delay=sleep_after_power_off)
             except Exception as e:
@@ -2714,9 +2926,29 @@ power_cycle:
                   sleep_before_connect=SLEEP_BEFORE_CONNECT,
                   sleep_after_connect=SLEEP_AFTER_CONNECT,
                   connect_arguments=CONNECT_ARGUMENTS,
-                  connect_retry_wait=CONNECT_RETRY_WAIT):
+                  connect_retry_wait=CONNECT_RETRY_WAIT,
+                  readiness_probe=READINESS_PROBE):
+
+        waited = False
+        if readiness_probe is not None:
+            with steps.start(f"Waiting for '{device.name}' to be ready") as step:
+                readiness_args = dict(readiness_probe)
+                readiness_args.setdefault('timeout', boot_timeout)
+                device.destroy()
+                try:
+                    seconds = wait_for_device(
+                        device, since=getattr(self, 'power_cycle_time', None),
+                        **readiness_args)
+                except TimeoutError as e:
+                    step.failed("Device is not ready", from_exception=e)
+                except ValueError as e:
+                    log.warning(f"Cannot probe {device.name}, sleeping "
+                                f"instead: {e}")
+                else:
+                    waited = True
+                    step.passed(f"Device ready after {seconds:.0f} seconds")
 
-        if sleep_before_connect:
+        if sleep_before_connect and not waited:
             with steps.start(f"Sleeping for {sleep_before_connect} seconds before connect") as step:
                 time.sleep(sleep_before_connect)
                 step.passed(f'Waited {sleep_before_connect} seconds')
@@ -1,6 +1,6 @@
 import unittest
 
-from unittest.mock import Mock, call, ANY
+from unittest.mock import Mock, call, ANY, patch
 
 from genie.libs.clean.stages.stages import CopyToDevice
 from genie.libs.clean.stages.tests.utils import create_test_device
@@ -97,6 +97,47 @@ class VerifyCopyToDevice(unittest.TestCase):
             call('dir bootflash:')
         ])
 
+    def test_copy_to_device_no_free_space(self):
+        dir_output = '''
+            Directory of bootflash:/
+                    11  drwx            16384  Nov 25 2016 19:32:53 -07:00  lost+found
+                    1940303872 bytes total (1036210176 bytes free)
+        '''
+        self.device.execute = Mock(return_value=dir_output)
+        self.device.api.free_up_disk_space = Mock(return_value=False)
+
+        steps = Steps()
+
+        self.device.testbed = Testbed('mytb', servers={
+            'server1': {
+                'address': '127.0.0.1',
+                'protocol': 'scp'
+            }
+        })
+
+        # We expect the free space step to fail and to stop the stage
+        with self.assertRaises(TerminateStepSignal):
+            self.cls.copy_to_device(
+                steps=steps, device=self.device,
+                origin=dict(
+                    files=['/path/test.bin'],
+                    hostname='server1'
+                ),
+                destination=dict(
+                    directory='bootflash:'
+                ),
+                protocol='scp',
+            )
+
+        # Check the overall result is as expected, and that nothing was
+        # copied after the failure
+        self.assertEqual(Failed, steps.details[-1].result)
+        self.assertIn('Verify sufficient free space',
+                      steps.details[-1].name)
+        self.device.execute.assert_called_once_with('dir bootflash:')
+        self.assertNotIn('files_copied',
+                         self.cls.history['CopyToDevice'].parameters)
+
 
     def test_copy_to_device_long_filename(self):
         filler = 'a' * 125
@@ -330,3 +371,75 @@ class VerifyCopyToDevice(unittest.TestCase):
                  error_pattern=ANY),
             call('dir bootflash:')
         ])
+
+    @patch('genie.libs.clean.stages.stages.is_connection_pool',
+           Mock(return_value=True))
+    def test_copy_to_device_ha_concurrent(self):
+
+        def dir_output(directory, files=''):
+            return f'''
+                Directory of {directory}/
+                        11  drwx            16384  Nov 25 2016 19:32:53 -07:00  lost+found
+                        12  -rw-                0  Dec 13 2016 11:36:36 -07:00  ds_stats.txt
+                        {files}
+                        1940303872 bytes total (1036210176 bytes free)
+            '''
+
+        class MockExecute:
+
+            def __init__(self, *args, **kwargs):
+                self.data = {}
+                for directory in ['bootflash:', 'stby-bootflash:']:
+                    self.data[f'dir {directory}'] = iter([
+                        dir_output(directory),
+                        dir_output(directory, '8033  -rw-             4096  '
+                                              'Nov 25 2016 18:42:07 -07:00  '
+                                              'test.bin')])
+                    self.data['copy scp://127.0.0.1//path/test.bin '
+                              f'{directory}/test.bin'] = iter([''])
+
+            def __call__(self, cmd, *args, **kwargs):
+                output = next(self.data[cmd])
+                return output
+
+        self.device.execute = Mock(side_effect=MockExecute())
+
+        steps = Steps()
+
+        testbed = Testbed('mytb', servers={
+            'server1': {
+                'address': '127.0.0.1',
+                'protocol': 'scp'
+            }
+        })
+
+        self.device.testbed = testbed
+
+        # Call the method to be tested (clean step inside class)
+        self.cls.copy_to_device(
+            steps=steps, device=self.device,
+            origin=dict(
+                files=['/path/test.bin'],
+                hostname='server1'
+            ),
+            destination=dict(
+                directory='bootflash:',
+                standby_directory='stby-bootflash:'
+            ),
+            protocol='scp',
+        )
+
+        # Check that the result is expected, with the steps of each
+        # destination reported in order
+        for step in steps.details:
+            self.assertEqual(Passed, step.result)
+        self.assertIn('stby-bootflash:', steps.details[2].name)
+        self.assertIn(' bootflash:', steps.details[6].name)
+        for directory in ['bootflash:', 'stby-bootflash:']:
+            self.device.execute.assert_any_call(
+                f'copy scp://127.0.0.1//path/test.bin {directory}/test.bin',
+                prompt_recovery=False, timeout=300, reply=ANY,
+                error_pattern=ANY)
+        self.assertEqual(
+            self.cls.history['CopyToDevice'].parameters['image_mapping'],
+            {'/path/test.bin': 'bootflash:/test.bin'})
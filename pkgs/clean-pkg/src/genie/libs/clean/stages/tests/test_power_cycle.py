@@ -1,7 +1,7 @@
 import logging
 import unittest
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from genie.libs.clean.stages.stages import PowerCycle
 from genie.libs.clean.stages.tests.utils import CommonStageTests, create_test_device
@@ -136,3 +136,42 @@ class Reconnect(unittest.TestCase):
         # Check the step result is as expected
         self.assertEqual(Passed, steps.details[2].result)
         self.assertEqual('Sleeping for 0.1 seconds after connect', steps.details[2].name)
+
+    @patch('genie.libs.clean.stages.stages.wait_for_device', return_value=42)
+    def test_readiness_probe(self, wait_for_device):
+        # Make sure we have a unique Steps() object for result verification
+        steps = Steps()
+
+        # To simulate pass case
+        self.device.connect = Mock()
+
+        # The readiness probe replaces the sleep before connect
+        self.cls.reconnect(
+            steps=steps, device=self.device, boot_timeout=5,
+            sleep_before_connect=60, sleep_after_connect=0,
+            readiness_probe={'probes': ['ssh']}
+        )
+
+        # Check the step result is as expected
+        self.assertEqual(Passed, steps.details[0].result)
+        self.assertEqual("Waiting for 'PE1' to be ready", steps.details[0].name)
+        self.assertEqual(Passed, steps.details[1].result)
+        self.assertEqual("Reconnecting to 'PE1'", steps.details[1].name)
+        wait_for_device.assert_called_once_with(
+            self.device, since=None, probes=['ssh'], timeout=5)
+
+    @patch('genie.libs.clean.stages.stages.wait_for_device',
+           side_effect=TimeoutError)
+    def test_readiness_probe_timeout(self, wait_for_device):
+        # Make sure we have a unique Steps() object for result verification
+        steps = Steps()
+
+        # We expect this step to fail so make sure it raises the signal
+        with self.assertRaises(TerminateStepSignal):
+            self.cls.reconnect(
+                steps=steps, device=self.device, boot_timeout=5,
+                readiness_probe={}
+            )
+
+        # Check the overall result is as expected
+        self.assertEqual(Failed, steps.details[0].result)
@@ -81,6 +81,21 @@ class TestBaseStage(unittest.TestCase):
         self.stage(test=123)
         func1.assert_called_with(test=123)
 
+    @mock.patch.multiple(
+        stage, func1=mock.DEFAULT, func2=mock.DEFAULT,
+        apply_parameters=lambda func, args: partial(func, **args))
+    def test_running_stage_step_timings(self, func1, func2):
+
+        self.stage.exec_order = ['func1', 'func2']
+        func2.side_effect = Exception
+
+        # the step timings are kept even if a step raises
+        with self.assertRaises(Exception):
+            self.stage()
+
+        self.assertEqual(['func1', 'func2'],
+                         [name for name, _ in self.stage.step_timings])
+
 
 class TestCleanTestcase(unittest.TestCase):
 
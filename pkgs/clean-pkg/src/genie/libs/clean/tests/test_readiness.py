@@ -0,0 +1,185 @@
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from genie.libs.clean import readiness
+from genie.libs.clean.readiness import (BootTimes, ConsoleActivityProbe,
+                                        ReadinessProbe, TcpProbe,
+                                        get_device_probes, wait_for_device)
+
+
+class BannerServer(object):
+    ''' Local server sending `banner` to each connection '''
+
+    def __init__(self, banner=b'', reply=b''):
+        self.banner = banner
+        self.reply = reply
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(5)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                if self.banner:
+                    conn.sendall(self.banner)
+                if self.reply and conn.recv(16):
+                    conn.sendall(self.reply)
+                conn.recv(16)
+
+    def close(self):
+        self.sock.close()
+
+
+class TestProbes(unittest.TestCase):
+
+    def test_tcp_probe(self):
+        server = BannerServer(banner=b'SSH-2.0-Cisco-1.25\r\n')
+        self.addCleanup(server.close)
+        self.assertTrue(TcpProbe('127.0.0.1', server.port).check())
+        self.assertTrue(TcpProbe('127.0.0.1', server.port,
+                                 banner=r'SSH-').check())
+        self.assertFalse(TcpProbe('127.0.0.1', server.port,
+                                  banner=r'Telnet').check())
+
+    def test_tcp_probe_closed_port(self):
+        server = BannerServer()
+        server.close()
+        with self.assertRaises(OSError):
+            TcpProbe('127.0.0.1', server.port, timeout=1).check()
+
+    def test_console_probe_activity(self):
+        server = BannerServer(banner=b'\xff\xfb\x01\r\nPress RETURN to get '
+                                     b'started!\r\n')
+        self.addCleanup(server.close)
+        self.assertTrue(
+            ConsoleActivityProbe('127.0.0.1', server.port, timeout=1).check())
+
+    def test_console_probe_prompt(self):
+        for prompt in (b'\r\nR1#', b'\r\nR1>', b'\r\nR1(config)# '):
+            server = BannerServer(reply=prompt)
+            self.addCleanup(server.close)
+            self.assertTrue(ConsoleActivityProbe(
+                '127.0.0.1', server.port, hostname='R1', timeout=1).check())
+
+    def test_console_probe_booting(self):
+        # progress lines and rommon prompt are not the device prompt
+        for output in (b'\r\n#####################\r\n',
+                       b'\r\nrommon 1 > ', b'\r\nR2#'):
+            server = BannerServer(reply=output)
+            self.addCleanup(server.close)
+            self.assertFalse(ConsoleActivityProbe(
+                '127.0.0.1', server.port, hostname='R1',
+                timeout=0.2).check())
+
+    def test_console_probe_silent(self):
+        server = BannerServer()
+        self.addCleanup(server.close)
+        self.assertFalse(
+            ConsoleActivityProbe('127.0.0.1', server.port,
+                                 timeout=0.2).check())
+
+    def test_get_device_probes(self):
+        device = Mock()
+        device.name = 'R1'
+        device.connections = {
+            'defaults': {'class': Mock()},
+            'a': {'protocol': 'telnet', 'ip': '10.1.1.1', 'port': 2001},
+            'vty': {'protocol': 'ssh', 'ip': '10.2.2.2'},
+            'mgmt': {'protocol': 'telnet', 'ip': '10.2.2.2'},
+        }
+        probes = get_device_probes(device, snmp_community='public')
+        self.assertEqual([(p.name, p.host, p.port) for p in probes],
+                         [('console', '10.1.1.1', 2001),
+                          ('tcp', '10.2.2.2', 22),
+                          ('snmp', '10.2.2.2', 161),
+                          ('tcp', '10.2.2.2', 23)])
+        probes = get_device_probes(device, probes=['ssh'])
+        self.assertEqual([(p.name, p.port) for p in probes], [('tcp', 22)])
+        probes = get_device_probes(device, via='a')
+        self.assertEqual([p.name for p in probes], ['console'])
+        self.assertRegex('R1#', probes[0].pattern)
+
+
+class TestReadinessProbe(unittest.TestCase):
+
+    def test_wait(self):
+        failing = Mock(check=Mock(side_effect=OSError))
+        ready = Mock(check=Mock(side_effect=[False, False, True]))
+        with patch.object(readiness.time, 'sleep') as sleep:
+            seconds, probe = ReadinessProbe(
+                [failing, ready], interval=1, max_interval=3).wait()
+        self.assertIs(probe, ready)
+        self.assertEqual(failing.check.call_count, 3)
+        # backoff
+        self.assertEqual([c[0][0] for c in sleep.call_args_list], [1, 2])
+
+    def test_wait_timeout(self):
+        probe = Mock(check=Mock(return_value=False))
+        with self.assertRaises(TimeoutError):
+            ReadinessProbe([probe], timeout=0.1, interval=0.05).wait()
+
+    def test_wait_no_probe(self):
+        with self.assertRaises(ValueError):
+            ReadinessProbe([]).wait()
+
+
+def create_device(name, os, platform):
+    device = Mock(os=os, platform=platform)
+    device.name = name
+    return device
+
+
+class TestBootTimes(unittest.TestCase):
+
+    def test_summary(self):
+        boot_times = BootTimes()
+        for name, platform, seconds in (('R1', 'cat9k', 100),
+                                        ('R2', 'cat9k', 200),
+                                        ('R3', 'n9k', 50)):
+            boot_times.record(create_device(name, 'iosxe', platform),
+                              seconds)
+        self.assertEqual(boot_times.summary(), {
+            ('iosxe', 'cat9k'): {'count': 2, 'min': 100, 'max': 200,
+                                 'mean': 150},
+            ('iosxe', 'n9k'): {'count': 1, 'min': 50, 'max': 50,
+                               'mean': 50}})
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'boot_times.json')
+            BootTimes(path).record(create_device('N1', 'nxos', None), 300)
+            BootTimes(path).record(create_device('N2', 'nxos', None), 100)
+            self.assertEqual(BootTimes().summary(path), {
+                ('nxos', 'generic'): {'count': 2, 'min': 100, 'max': 300,
+                                      'mean': 200}})
+
+    @patch.object(readiness, 'boot_times', new_callable=BootTimes)
+    def test_wait_for_device(self, boot_times):
+        server = BannerServer(banner=b'SSH-2.0-Cisco-1.25\r\n')
+        self.addCleanup(server.close)
+        device = create_device('R1', 'iosxe', 'cat9k')
+        device.connections = {
+            'vty': {'protocol': 'ssh', 'ip': '127.0.0.1',
+                    'port': server.port}}
+        seconds = wait_for_device(device, timeout=5)
+        self.assertLess(seconds, 5)
+        self.assertEqual(boot_times.summary()[('iosxe', 'cat9k')]['count'], 1)
+
+        device.connections = {}
+        with self.assertRaises(ValueError):
+            wait_for_device(device, timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,11 @@
+import time
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 
 from unicon import Connection
 from unicon.settings import Settings
 
+from genie.libs.clean.recovery import recovery
 from genie.libs.clean.recovery.recovery import recovery_processor
 
 import logging
@@ -51,3 +53,24 @@ class TestRecovery(unittest.TestCase):
             golden_image=['bootflash:asr1000_golden.bin'],
             reconnect_delay=1)
         self.assertTrue(section.parent.parameters['block_section'])
+
+    @patch('genie.libs.clean.recovery.recovery._disconnect_reconnect',
+           return_value=True)
+    @patch('genie.libs.clean.recovery.recovery.pcall')
+    @patch('genie.libs.clean.recovery.recovery.lookup_from_device')
+    @patch('genie.libs.clean.recovery.recovery.wait_for_device')
+    def test_readiness_probe_since_power_cycle(self, wait_for_device, *_):
+        device = MagicMock()
+        device.is_ha = False
+        device.api.execute_power_cycle_device.side_effect = \
+            lambda delay: time.sleep(delay)
+        with patch.object(recovery.time, 'time', return_value=100), \
+                patch.object(recovery.time, 'sleep') as sleep:
+            recovery._connectivity(
+                device, clear_line=False, powercycler_delay=30,
+                golden_image=['bootflash:asr1000_golden.bin'],
+                readiness_probe={'probes': ['ssh']})
+        sleep.assert_called_once_with(30)
+        # the boot time includes the power cycle
+        wait_for_device.assert_called_once_with(
+            device, probes=['ssh'], timeout=600, since=100)
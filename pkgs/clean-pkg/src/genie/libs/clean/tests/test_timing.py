@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from genie.libs.clean.timing import (CleanEstimator, format_plan,
+                                     format_records, get_image_size,
+                                     get_plan_devices, load_records,
+                                     save_records, stage_record)
+
+GB = 1024 * 1024 * 1024
+
+
+def create_record(stage, seconds, platform='cat9k', image_size=GB,
+                  result='passed', device='R1'):
+    return {'device': device, 'os': 'iosxe', 'platform': platform,
+            'image_size': image_size, 'stage': stage, 'uid': stage,
+            'result': result, 'start': 0, 'seconds': seconds, 'steps': []}
+
+
+class TestRecords(unittest.TestCase):
+
+    def test_stage_record(self):
+        device = Mock(os='iosxe', platform='cat9k')
+        device.name = 'R1'
+        record = stage_record(device, 'copy_to_device__2', 'CopyToDevice(2)',
+                              'passed', 10, 25.5, [('copy', 15.25)], GB)
+        self.assertEqual(record, {
+            'device': 'R1', 'os': 'iosxe', 'platform': 'cat9k',
+            'image_size': GB, 'stage': 'copy_to_device',
+            'uid': 'CopyToDevice(2)', 'result': 'passed', 'start': 10,
+            'seconds': 15.5, 'steps': [{'name': 'copy', 'seconds': 15.25}]})
+        self.assertIn('CopyToDevice(2)', format_records([record]))
+
+    def test_save_load(self):
+        records = [create_record('reload', 300), create_record('connect', 5)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'timings.json')
+            save_records(path, records[:1])
+            save_records(path, records[1:])
+            self.assertEqual(load_records(path), records)
+
+    def test_image_size(self):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'x' * 10)
+            f.flush()
+            self.assertEqual(get_image_size([f.name]), 10)
+            # images on a server are not sized, even if the path exists
+            # locally
+            self.assertIsNone(get_image_size(['sftp://server' + f.name]))
+            self.assertEqual(
+                get_image_size(['sftp://server' + f.name, f.name]), 10)
+            self.assertEqual(get_image_size({'image': [f.name, f.name]}), 20)
+        self.assertIsNone(get_image_size(['/does/not/exist.bin']))
+        self.assertIsNone(get_image_size(None))
+
+
+class TestCleanEstimator(unittest.TestCase):
+
+    def setUp(self):
+        self.estimator = CleanEstimator([
+            create_record('copy_to_device', 100),
+            create_record('copy_to_device', 300),
+            create_record('copy_to_device', 200),
+            create_record('copy_to_device', 900, image_size=3 * GB),
+            create_record('copy_to_device', 5000, result='failed'),
+            create_record('reload', 600, platform='cat9k'),
+            create_record('reload', 400, platform='asr1k'),
+            create_record('connect', 5),
+        ])
+
+    def test_stage(self):
+        self.assertEqual(self.estimator.stage(
+            'copy_to_device', 'iosxe', 'cat9k', GB), (200, 3))
+        self.assertEqual(self.estimator.stage(
+            'copy_to_device', 'iosxe', 'cat9k', 3 * GB), (900, 1))
+        # unknown image size bucket
+        self.assertEqual(self.estimator.stage(
+            'copy_to_device', 'iosxe', 'cat9k', 6 * GB), (250, 4))
+        # unknown platform
+        self.assertEqual(self.estimator.stage(
+            'reload', 'iosxe', 'cat3k'), (500, 2))
+        self.assertEqual(self.estimator.stage('reload__2', 'iosxe', 'asr1k'),
+                         (400, 1))
+        self.assertEqual(self.estimator.stage('write_erase', 'iosxe'),
+                         (None, 0))
+
+    def test_plan(self):
+        plan = self.estimator.plan({
+            'R1': {'order': ['connect', 'copy_to_device', 'reload'],
+                   'os': 'iosxe', 'platform': 'cat9k', 'image_size': GB},
+            'R2': {'order': ['connect', 'reload', 'write_erase'],
+                   'os': 'iosxe', 'platform': 'asr1k', 'image_size': None},
+        })
+        self.assertEqual(plan['critical_path'], 'R1')
+        self.assertEqual(plan['seconds'], 805)
+        self.assertEqual(plan['devices']['R2']['seconds'], 405)
+        self.assertEqual(plan['devices']['R2']['unknown'], ['write_erase'])
+
+        report = format_plan(plan)
+        self.assertIn('Estimated clean duration: 00:13:25, critical path: R1',
+                      report)
+        self.assertIn('No timing for R2: write_erase', report)
+
+    def test_plan_devices(self):
+        clean_dict = {'devices': {'R1': {'order': ['connect'],
+                                         'images': ['/does/not/exist']},
+                                  'R2': None}}
+        testbed_dict = {'devices': {'R1': {'os': 'iosxe',
+                                           'platform': 'cat9k'}}}
+        self.assertEqual(get_plan_devices(clean_dict, testbed_dict), {
+            'R1': {'order': ['connect'], 'os': 'iosxe', 'platform': 'cat9k',
+                   'image_size': None},
+            'R2': {'order': [], 'os': None, 'platform': None,
+                   'image_size': None}})
+
+
+if __name__ == '__main__':
+    unittest.main()
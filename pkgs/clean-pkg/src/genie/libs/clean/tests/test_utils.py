@@ -1,9 +1,15 @@
+import re
+import sys
 import unittest
+import subprocess
+import textwrap
 
 from unittest import mock
 
 from genie.libs.clean import BaseStage
-from genie.libs.clean.utils import deprecate_stage
+from genie.libs.clean.utils import (deprecate_stage, get_clean_function,
+                                    load_clean_json)
+from genie.libs.clean.stages.tests.utils import create_test_device
 
 
 class TestDeprecateStage(unittest.TestCase):
@@ -106,3 +112,49 @@ class TestDeprecateStage(unittest.TestCase):
         ])
 
 
+class TestGetCleanFunction(unittest.TestCase):
+
+    def setUp(self):
+        self.device = create_test_device('PE1', os='iosxe', platform='cat9k')
+
+    def test_abstracted_stage(self):
+        stage = get_clean_function('change_boot_variable', load_clean_json(),
+                                   self.device)
+        self.assertEqual('genie.libs.clean.stages.iosxe.cat9k.stages',
+                         stage.__module__)
+
+        # Not defined for cat9k, found for iosxe
+        stage = get_clean_function('reload', load_clean_json(), self.device)
+        self.assertEqual('genie.libs.clean.stages.iosxe.stages',
+                         stage.__module__)
+
+    def test_import_time(self):
+        # Resolve a stage in a new interpreter with -X importtime, only the
+        # stages of the device tokens must be imported
+        code = textwrap.dedent('''
+            from genie.libs.clean.utils import get_clean_function, load_clean_json
+            from genie.libs.clean.stages.tests.utils import create_test_device
+            device = create_test_device('PE1', os='iosxe', platform='cat9k')
+            get_clean_function('reload', load_clean_json(), device)
+        ''')
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                stderr=subprocess.PIPE, universal_newlines=True,
+                                check=True).stderr
+
+        # import time: self [us] | cumulative | imported package
+        imported = {}
+        for line in output.splitlines():
+            match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)$',
+                             line)
+            if match:
+                imported[match.group(3)] = int(match.group(1))
+
+        stages = {name for name in imported
+                  if name.startswith('genie.libs.clean.stages.')
+                  and name.endswith('.stages')}
+        self.assertIn('genie.libs.clean.stages.iosxe.stages', stages)
+        self.assertLessEqual(stages, {
+            'genie.libs.clean.stages.stages',
+            'genie.libs.clean.stages.iosxe.stages',
+            'genie.libs.clean.stages.iosxe.cat9k.stages'},
+            'Imported in {:.3f}s'.format(sum(imported.values()) / 1e6))
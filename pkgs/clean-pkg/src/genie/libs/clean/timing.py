@@ -0,0 +1,269 @@
+'''Clean stage timings and clean duration estimation.
+
+Each stage run by clean is recorded with the wall time of the stage and of
+each of its steps, along with the device os, platform and image size:
+
+    {"device": "R1", "os": "iosxe", "platform": "cat9k",
+     "image_size": 1065353216, "stage": "copy_to_device",
+     "uid": "CopyToDevice", "result": "passed", "start": 1760000000.0,
+     "seconds": 312.4, "steps": [{"name": "copy_to_device",
+                                  "seconds": 310.2}, ...]}
+
+The records are appended as JSON lines to the `timings_file` of the cleaner,
+and are used by `pyats validate clean --plan` to estimate how long a clean
+will take, per device and for the whole testbed.
+'''
+
+# Python
+import os
+import json
+import time
+import logging
+import statistics
+from urllib.parse import urlparse
+
+# 3rd party
+from prettytable import PrettyTable
+
+# Logger
+log = logging.getLogger(__name__)
+
+# Image sizes are compared in buckets of this many bytes
+IMAGE_SIZE_BUCKET = 512 * 1024 * 1024
+
+
+def get_image_size(images):
+    '''Total size in bytes of the clean images which are local files.
+
+    Images given as urls (e.g. on a file server) are not sized.
+
+    Args:
+        images (`list` or `dict`): images of the clean yaml
+
+    Returns:
+        `int`, or None if no image size is known
+    '''
+    if isinstance(images, dict):
+        paths = [path for value in images.values()
+                 for path in (value if isinstance(value, list) else [value])]
+    else:
+        paths = list(images or [])
+
+    size = None
+    for path in paths:
+        if not isinstance(path, str) or urlparse(path).scheme:
+            continue
+        try:
+            size = (size or 0) + os.path.getsize(path)
+        except OSError:
+            continue
+    return size
+
+
+def stage_record(device, stage, uid, result, start, end, steps=None,
+                 image_size=None):
+    '''Build the timing record of a stage run.
+
+    Args:
+        device (`obj`): Device object
+        stage (`str`): Stage name as in the clean order
+        uid (`str`): Stage section uid
+        result (`obj`): Stage result
+        start (`float`): time.time() when the stage started
+        end (`float`): time.time() when the stage ended
+        steps (`list`): (step name, seconds) of the stage steps
+        image_size (`int`): Size in bytes of the clean images
+
+    Returns:
+        `dict`
+    '''
+    return {'device': device.name,
+            'os': getattr(device, 'os', None),
+            'platform': getattr(device, 'platform', None),
+            'image_size': image_size,
+            'stage': stage.split('__')[0],
+            'uid': uid,
+            'result': str(result),
+            'start': start,
+            'seconds': round(end - start, 3),
+            'steps': [{'name': name, 'seconds': round(seconds, 3)}
+                      for name, seconds in steps or []]}
+
+
+def save_records(path, records):
+    '''Append timing records to a JSON lines file'''
+    with open(path, 'a') as f:
+        f.write(''.join(json.dumps(record) + '\n' for record in records))
+
+
+def load_records(path):
+    '''Load the timing records of a JSON lines file'''
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                log.warning('Ignoring invalid timing record: {}'.format(line))
+    return records
+
+
+def format_table(header, rows):
+    '''Format rows as a text table'''
+    table = PrettyTable(header)
+    table.align = 'l'
+    for row in rows:
+        table.add_row(row)
+    return table.get_string()
+
+
+def format_records(records):
+    '''Text table of the stage and step timings of records'''
+    rows = []
+    for record in records:
+        rows.append([record['device'], record['uid'], '',
+                     '{:.1f}'.format(record['seconds']), record['result']])
+        for step in record['steps']:
+            rows.append(['', '', step['name'],
+                         '{:.1f}'.format(step['seconds']), ''])
+    return format_table(['device', 'stage', 'step', 'seconds', 'result'],
+                        rows)
+
+
+def _size_bucket(image_size):
+    if image_size is None:
+        return None
+    return int(image_size // IMAGE_SIZE_BUCKET)
+
+
+class CleanEstimator(object):
+    '''Estimate stage durations from past timing records.
+
+    A stage duration is the median of the passed runs of the stage on the
+    same os, platform and image size. When there is none, the image size,
+    then the platform, then the os are ignored.
+
+    Args:
+        records (`list`): Timing records
+    '''
+
+    def __init__(self, records):
+        self._durations = {}
+        for record in records:
+            if record.get('result') not in ('passed', 'passx'):
+                continue
+            for key in self._keys(record['stage'], record.get('os'),
+                                  record.get('platform'),
+                                  record.get('image_size')):
+                self._durations.setdefault(key, []).append(record['seconds'])
+
+    @staticmethod
+    def _keys(stage, os_, platform, image_size):
+        stage = stage.split('__')[0]
+        return [(stage, os_, platform, _size_bucket(image_size)),
+                (stage, os_, platform),
+                (stage, os_),
+                (stage,)]
+
+    def stage(self, stage, os_=None, platform=None, image_size=None):
+        '''Estimated duration in seconds of a stage
+
+        Returns:
+            (`float`, `int`): seconds and number of runs it is based on, or
+                              (None, 0) if the stage never ran
+        '''
+        for key in self._keys(stage, os_, platform, image_size):
+            durations = self._durations.get(key)
+            if durations:
+                return statistics.median(durations), len(durations)
+        return None, 0
+
+    def device(self, order, os_=None, platform=None, image_size=None):
+        '''Estimated durations of the stages of a clean order
+
+        Returns:
+            `dict`: {'stages': [(stage, seconds, runs)], 'seconds': total,
+                     'unknown': [stages which never ran]}
+        '''
+        stages = []
+        unknown = []
+        total = 0
+        for stage in order:
+            seconds, runs = self.stage(stage, os_, platform, image_size)
+            stages.append((stage, seconds, runs))
+            if seconds is None:
+                unknown.append(stage)
+            else:
+                total += seconds
+        return {'stages': stages, 'seconds': total, 'unknown': unknown}
+
+    def plan(self, devices):
+        '''Estimate the clean of devices cleaned in parallel.
+
+        Args:
+            devices (`dict`): {name: {'order': list, 'os': str,
+                                      'platform': str, 'image_size': int}}
+
+        Returns:
+            `dict`: {'devices': {name: device estimation},
+                     'seconds': duration of the slowest device,
+                     'critical_path': name of the slowest device}
+        '''
+        estimations = {}
+        for name, data in devices.items():
+            estimations[name] = self.device(data.get('order', []),
+                                            data.get('os'),
+                                            data.get('platform'),
+                                            data.get('image_size'))
+        critical_path = max(estimations,
+                            key=lambda name: estimations[name]['seconds'],
+                            default=None)
+        return {'devices': estimations,
+                'seconds': estimations[critical_path]['seconds']
+                if critical_path else 0,
+                'critical_path': critical_path}
+
+
+def get_plan_devices(clean_dict, testbed_dict):
+    '''Devices to estimate, from the clean and testbed yaml contents'''
+    devices = {}
+    tb_devices = (testbed_dict or {}).get('devices') or {}
+    for name, clean_data in (clean_dict.get('devices') or {}).items():
+        clean_data = clean_data or {}
+        tb_device = tb_devices.get(name) or {}
+        devices[name] = {
+            'order': clean_data.get('order', []),
+            'os': tb_device.get('os'),
+            'platform': tb_device.get('platform'),
+            'image_size': get_image_size(clean_data.get('images'))}
+    return devices
+
+
+def format_plan(plan):
+    '''Text report of a clean plan'''
+
+    def _seconds(seconds):
+        if seconds is None:
+            return 'unknown'
+        return time.strftime('%H:%M:%S', time.gmtime(seconds))
+
+    rows = []
+    for name, estimation in sorted(plan['devices'].items()):
+        for stage, seconds, runs in estimation['stages']:
+            rows.append([name, stage, _seconds(seconds), runs])
+        rows.append([name, 'total', _seconds(estimation['seconds']), ''])
+    lines = [format_table(['device', 'stage', 'estimated', 'runs'], rows)]
+    if plan['critical_path']:
+        lines.append('Estimated clean duration: {d}, critical path: {c}'
+                     .format(d=_seconds(plan['seconds']),
+                             c=plan['critical_path']))
+    unknown = {name: estimation['unknown']
+               for name, estimation in plan['devices'].items()
+               if estimation['unknown']}
+    for name, stages in sorted(unknown.items()):
+        lines.append('No timing for {n}: {s}'.format(n=name,
+                                                      s=', '.join(stages)))
+    return '\n'.join(lines)
@@ -299,13 +299,26 @@ def get_clean_function(clean_name, clean_data, device):
         pkg = importlib.import_module(iterated_data['package'])
     else:
         pkg = clean
-    lookup = Lookup.from_device(device, packages={"clean": pkg})
+    lookup = lookup_from_device(device, packages={"clean": pkg})
     try:
         return getattr(_get_submodule(lookup.clean, iterated_data["module_name"]), name)
     except Exception:
         raise Exception(f"The clean stage '{name}' does not exist under the "
                         f"following abstraction tokens: {['com'] + tokens}") from None
 
+def lookup_from_device(device, packages):
+    """Return the abstraction lookup of the device.
+
+    LazyLookup of genie.libs.sdk only imports the modules of the device
+    tokens, not the whole package. Lookup is used when the sdk is not
+    installed.
+    """
+    try:
+        from genie.libs.sdk.libs.utils.abstract_index import LazyLookup
+    except ImportError:
+        return Lookup.from_device(device, packages=packages)
+    return LazyLookup.from_device(device, packages=packages)
+
 def _get_submodule(abs_mod, mods):
     """recursively find the submodule"""
     ret = abs_mod
@@ -511,7 +524,7 @@ def validate_clean(clean_file, testbed_file, lint=True):
             setattr(dev, 'clean', clean_data)
             try:
                 # Get abstracted ImageHandler class
-                abstract = Lookup.from_device(dev, packages={'clean': clean})
+                abstract = lookup_from_device(dev, packages={'clean': clean})
                 ImageHandler = abstract.clean.stages.image_handler.ImageHandler
                 image_handler = ImageHandler(dev, dev.clean['images'])
                 initialize_clean_sections(image_handler, clean_data['order'])
@@ -585,7 +598,7 @@ def remove_string_from_image(images, string):
 def get_image_handler(device):
     if device.clean.get('images'):
         # Get abstracted ImageHandler class
-        abstract = Lookup.from_device(device, packages={'clean': clean})
+        abstract = lookup_from_device(device, packages={'clean': clean})
         ImageHandler = abstract.clean.stages.image_handler.ImageHandler
         return ImageHandler(device, device.clean['images'])
     else:
@@ -629,7 +642,7 @@ def deprecate_stage(deprecated_in, removed_in=None, details=None):
 def get_clean_template(device, template='DEFAULT'):
     """API to return the clean template as a loaded dictionary."""
 
-    abstract = Lookup.from_device(device, packages={'clean': clean})
+    abstract = lookup_from_device(device, packages={'clean': clean})
     return getattr(abstract.clean.templates.templates, template)
 
 def raise_(ex):
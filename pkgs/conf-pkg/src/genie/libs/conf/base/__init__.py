@@ -7,3 +7,4 @@ from .password_type import *
 from .route_target import *
 from .route_distinguisher import *
 from .redistribution_attr import *
+from .incremental import *
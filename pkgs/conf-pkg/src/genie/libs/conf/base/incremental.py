@@ -0,0 +1,148 @@
+'''Incremental rendering of build_config/build_unconfig output.
+
+Conf objects re-render their whole CLI text on every `build_config` call.
+`IncrementalConfigMixin` keeps the rendered output per (object, attributes,
+unconfig) and only re-renders it once an attribute of the object, one of its
+parents or one of its children has been assigned. It also tracks which
+attributes were assigned so that `build_config_diff` can emit just the lines
+of the modified attributes.
+
+Example::
+
+    >>> intf.mtu = 1500
+    >>> intf.build_config_diff(apply=False)   # only the mtu line
+    >>> intf.build_config_cached()            # full config, rendered once
+    >>> intf.build_config_cached()            # served from cache
+
+Only attribute assignments are tracked. After mutating a container in place
+(e.g. adding an interface to a feature), call `invalidate_config_cache`.
+'''
+
+__all__ = (
+    'IncrementalConfigMixin',
+)
+
+from collections import abc
+
+from genie.conf.base.attributes import SubAttributes
+
+
+def _freeze(value):
+    '''Hashable key for an attributes specification.'''
+    if isinstance(value, abc.Mapping):
+        return tuple(sorted(((repr(k), _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class IncrementalConfigMixin(object):
+    '''Mixin caching rendered config and tracking modified attributes.
+
+    Must be listed before the conf base class so that attribute assignments
+    go through its `__setattr__`.
+    '''
+
+    # Name of the attribute pointing to the enclosing conf object (or None).
+    # Changes are propagated to it, and its changes invalidate this object.
+    _config_parent_attr = 'parent'
+
+    # Marker recorded on a parent when one of its children was modified
+    _CHILD_MODIFIED = '*'
+
+    # Whether build_config_diff always builds the full configuration, for
+    # objects which only render through their sub attributes (e.g. the
+    # device_attr of a feature)
+    _config_diff_full_build = False
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith('_'):
+            self._config_modified(name)
+
+    def _config_parent(self):
+        if self._config_parent_attr is None:
+            return None
+        parent = getattr(self, self._config_parent_attr, None)
+        if isinstance(parent, IncrementalConfigMixin):
+            return parent
+        return None
+
+    def _config_modified(self, name):
+        obj = self
+        while obj is not None:
+            d = obj.__dict__
+            d['_config_generation'] = d.get('_config_generation', 0) + 1
+            d.setdefault('_config_modified_attributes', set()).add(name)
+            name = self._CHILD_MODIFIED
+            obj = obj._config_parent()
+
+    def _config_cache_token(self):
+        token = []
+        obj = self
+        while obj is not None:
+            token.append(obj.__dict__.get('_config_generation', 0))
+            obj = obj._config_parent()
+        return tuple(token)
+
+    @property
+    def config_modified_attributes(self):
+        '''Attributes assigned since the last `build_config_diff`.'''
+        return frozenset(self.__dict__.get('_config_modified_attributes', ()))
+
+    def invalidate_config_cache(self):
+        '''Drop cached config of this object and of its parents.'''
+        self._config_modified(self._CHILD_MODIFIED)
+
+    def build_config_cached(self, attributes=None, unconfig=False, **kwargs):
+        '''Return the output of `build_config(apply=False)` (or
+        `build_unconfig`), rendering it again only if the object changed
+        since it was last rendered with the same arguments.'''
+        key = (bool(unconfig), _freeze(attributes), _freeze(kwargs))
+        token = self._config_cache_token()
+        cache = self.__dict__.setdefault('_config_cache', {})
+        try:
+            cached_token, cfg = cache[key]
+        except KeyError:
+            pass
+        else:
+            if cached_token == token:
+                return cfg
+        builder = self.build_unconfig if unconfig else self.build_config
+        cfg = builder(apply=False, attributes=attributes, **kwargs)
+        cache[key] = (token, cfg)
+        return cfg
+
+    def build_config_diff(self, apply=None, unconfig=False, **kwargs):
+        '''Build configuration for the attributes modified since the previous
+        `build_config_diff` call only.
+
+        If a child object was modified the full configuration is built.
+        `apply` defaults to True, and to False on sub attributes, whose
+        `build_config` may only return the configuration.
+
+        Returns:
+            None if nothing was modified, otherwise the same as
+            `build_config`/`build_unconfig`.
+        '''
+        modified = self.__dict__.get('_config_modified_attributes')
+        if not modified:
+            return None
+        pending = set(modified)
+        if apply is None:
+            apply = not isinstance(self, SubAttributes)
+        if self._config_diff_full_build or self._CHILD_MODIFIED in pending:
+            attributes = None
+        else:
+            attributes = {attr: None for attr in sorted(pending)}
+        builder = self.build_unconfig if unconfig else self.build_config
+        cfg = builder(apply=apply, attributes=attributes, **kwargs)
+        # Only cleared once built, so that a failed build can be retried
+        modified.difference_update(pending)
+        return cfg
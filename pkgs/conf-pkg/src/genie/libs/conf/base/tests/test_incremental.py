@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+import unittest
+
+from genie.libs.conf.base import IncrementalConfigMixin
+
+
+class Node(IncrementalConfigMixin):
+
+    def __init__(self, parent=None):
+        self._parent = parent
+        self._builds = 0
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def builds(self):
+        return self._builds
+
+    def build_config(self, apply=True, attributes=None, unconfig=False,
+                     **kwargs):
+        if getattr(self, 'error', None):
+            raise self.error
+        self._builds += 1
+        return (unconfig, attributes)
+
+    def build_unconfig(self, apply=True, attributes=None, **kwargs):
+        return self.build_config(apply=apply, attributes=attributes,
+                                 unconfig=True, **kwargs)
+
+
+class test_incremental_config(unittest.TestCase):
+
+    def test_cache(self):
+        parent = Node()
+        child = Node(parent=parent)
+        child.build_config_cached()
+        builds = child.builds
+        child.build_config_cached()
+        self.assertEqual(child.builds, builds)
+
+        # Attributes spec is part of the key
+        child.build_config_cached(attributes={'mtu': None})
+        self.assertEqual(child.builds, builds + 1)
+
+        # A parent change invalidates the child
+        parent.description = 'test'
+        child.build_config_cached()
+        self.assertEqual(child.builds, builds + 2)
+
+        # Unconfig is cached separately
+        self.assertEqual(child.build_config_cached(unconfig=True),
+                         (True, None))
+
+    def test_diff(self):
+        parent = Node()
+        child = Node(parent=parent)
+        parent.build_config_diff()
+        child.build_config_diff()
+
+        child.mtu = 1500
+        child.description = 'test'
+        self.assertEqual(child.build_config_diff(apply=False),
+                         (False, {'description': None, 'mtu': None}))
+        self.assertIsNone(child.build_config_diff(apply=False))
+
+        # A modified child triggers a full build of the parent
+        self.assertEqual(parent.build_config_diff(apply=False),
+                         (False, None))
+        self.assertIsNone(parent.build_config_diff(apply=False))
+
+    def test_diff_failed_build(self):
+        node = Node()
+        node.mtu = 1500
+        node.error = ValueError('invalid')
+        with self.assertRaises(ValueError):
+            node.build_config_diff(apply=False)
+
+        # The modified attributes are kept for the next build
+        node.error = None
+        self.assertEqual(node.build_config_diff(apply=False),
+                         (False, {'error': None, 'mtu': None}))
+        self.assertEqual(node.config_modified_attributes, frozenset())
+
+    def test_diff_full_build(self):
+        node = Node()
+        node._config_diff_full_build = True
+        node.mtu = 1500
+        self.assertEqual(node.build_config_diff(apply=False), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
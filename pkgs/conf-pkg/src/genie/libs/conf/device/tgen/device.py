@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 from genie.decorator import managedattribute
 
 import genie.libs.conf.device
-from genie.libs.conf.stream.stream import Stream
+from genie.libs.conf.stream.stream import Stream, StreamStatsSnapshot
 
 class Device(genie.libs.conf.device.Device):
     '''Base Device class for TGEN devices'''
@@ -62,6 +62,36 @@ class Device(genie.libs.conf.device.Device):
     def get_stream_stats(self, streams=None, **kwargs):
         raise NotImplementedError
 
+    # Last snapshot returned by get_stream_stats_snapshot
+    _last_stream_stats_snapshot = None
+
+    def get_stream_stats_snapshot(self, streams=None, *, delta=False,
+                                  **kwargs):
+        '''Collect statistics of all streams in one batch.
+
+        The statistics are fetched with a single `get_stream_stats` call and
+        returned as an array-backed `StreamStatsSnapshot`. The latest snapshot
+        is cached on the device so that successive polls can be diffed.
+
+        Args:
+            streams (`list`): Streams to collect. Defaults to all streams.
+            delta (`bool`): If True, return the difference (including rates)
+                since the previously cached snapshot. The first call returns
+                the plain snapshot.
+            kwargs: Passed to `get_stream_stats`.
+
+        Returns:
+            `StreamStatsSnapshot`
+        '''
+        stats = self.get_stream_stats(streams, **kwargs)
+        snapshot = StreamStatsSnapshot.from_stream_stats(
+            stats, streams=streams)
+        previous = self._last_stream_stats_snapshot
+        self._last_stream_stats_snapshot = snapshot
+        if delta and previous is not None:
+            return snapshot - previous
+        return snapshot
+
     def get_stream_resolved_mac_addresses(self, streams=None):
         raise NotImplementedError
 
@@ -36,6 +36,7 @@ from genie.conf.base.config import CliConfig
 from genie.conf.base.cli import CliConfigBuilder
 
 from genie.libs.conf.base import \
+    IncrementalConfigMixin, \
     MAC, \
     IPv4Address, IPv4Interface, \
     IPv6Address, IPv6Interface
@@ -44,7 +45,9 @@ from genie.libs.conf.l2vpn import IccpGroup
 import genie.libs.conf.interface
 
 
-class ConfigurableInterfaceNamespace(ConfigurableBase):
+class ConfigurableInterfaceNamespace(IncrementalConfigMixin, ConfigurableBase):
+
+    _config_parent_attr = 'interface'
 
     def __init__(self, interface=None):
         assert interface
@@ -65,10 +68,12 @@ class ConfigurableInterfaceNamespace(ConfigurableBase):
         return self.interface.device
 
 
-class Interface(genie.libs.conf.interface.Interface):
+class Interface(IncrementalConfigMixin, genie.libs.conf.interface.Interface):
     """ base Interface class for IOS-XR devices
     """
 
+    _config_parent_attr = None
+
     def __new__(cls, *args, **kwargs):
 
         factory_cls = cls
@@ -547,6 +547,53 @@ class test_xr_interface(TestCase):
                 ' exit'
                 ]))        
 
+    def test_incremental_build_config(self):
+        # Set Genie Tb
+        testbed = Testbed()
+        Genie.testbed = testbed
+
+        # Device
+        dev1 = Device(name='PE1', testbed=testbed, os='iosxr')
+        intf1 = Interface(name='GigabitEthernet0/0/0/0', device=dev1)
+
+        # Apply configuration
+        intf1.description = 'test'
+        intf1.mtu = 1492
+
+        # First diff build emits everything set so far
+        cfgs = intf1.build_config_diff(apply=False)
+        self.assertMultiLineEqual(
+            str(cfgs),
+            '\n'.join([
+                'interface GigabitEthernet0/0/0/0',
+                ' description test',
+                ' mtu 1492',
+                ' exit'
+                ]))
+
+        # Nothing modified since
+        self.assertIsNone(intf1.build_config_diff(apply=False))
+
+        # Only the modified attribute is rendered
+        intf1.mtu = 1500
+        self.assertEqual(intf1.config_modified_attributes, {'mtu'})
+        cfgs = intf1.build_config_diff(apply=False)
+        self.assertMultiLineEqual(
+            str(cfgs),
+            '\n'.join([
+                'interface GigabitEthernet0/0/0/0',
+                ' mtu 1500',
+                ' exit'
+                ]))
+
+        # Full config is cached until an attribute changes
+        cfgs1 = intf1.build_config_cached()
+        self.assertIs(intf1.build_config_cached(), cfgs1)
+        intf1.description = 'changed'
+        cfgs2 = intf1.build_config_cached()
+        self.assertIsNot(cfgs2, cfgs1)
+        self.assertIn(' description changed', str(cfgs2))
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -6,11 +6,12 @@ from genie.conf.base.attributes import UnsupportedAttributeWarning,\
 from genie.conf.base.cli import CliConfigBuilder
 from ..isis import Isis as _Isis
 from genie.conf.base.config import CliConfig
+from genie.libs.conf.base import IncrementalConfigMixin
 
 
 class Isis(ABC):
 
-    class DeviceAttributes(ABC):
+    class DeviceAttributes(IncrementalConfigMixin, ABC):
 
         def build_config(self, apply=True, attributes=None, unconfig=False, **kwargs):
             assert not kwargs, kwargs
@@ -233,7 +234,7 @@ class Isis(ABC):
         def build_unconfig(self, apply=True, attributes=None, **kwargs):
             return self.build_config(apply=apply, attributes=attributes, unconfig=True, **kwargs)
 
-        class AddressFamilyAttributes(ABC):
+        class AddressFamilyAttributes(IncrementalConfigMixin, ABC):
 
             def build_config(self, apply=True, attributes=None, unconfig=False, **kwargs):
                 assert not apply
@@ -5083,7 +5084,7 @@ class Isis(ABC):
             def build_unconfig(self, apply=True, attributes=None, **kwargs):
                 return self.build_config(apply=apply, attributes=attributes, unconfig=True, **kwargs)
 
-        class InterfaceAttributes(ABC):
+        class InterfaceAttributes(IncrementalConfigMixin, ABC):
 
             def build_config(self, apply=True, attributes=None, unconfig=False, **kwargs):
                 assert not apply
@@ -5197,7 +5198,7 @@ class Isis(ABC):
             def build_unconfig(self, apply=True, attributes=None, **kwargs):
                 return self.build_config(apply=apply, attributes=attributes, unconfig=True, **kwargs)
 
-            class AddressFamilyAttributes(ABC):
+            class AddressFamilyAttributes(IncrementalConfigMixin, ABC):
 
                 def build_config(self, apply=True, attributes=None, unconfig=False, **kwargs):
                     assert not apply
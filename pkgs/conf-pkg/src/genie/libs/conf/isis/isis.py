@@ -15,12 +15,15 @@ from genie.conf.base import Base, DeviceFeature, InterfaceFeature, LinkFeature,
 import genie.conf.base.attributes
 from genie.conf.base.attributes import SubAttributes, SubAttributesDict, AttributesHelper
 
-from genie.libs.conf.base import Routing
+from genie.libs.conf.base import Routing, IncrementalConfigMixin
 from genie.libs.conf.address_family import AddressFamily, AddressFamilySubAttributes
 from .isis_net import IsisAreaAddress, IsisSystemID, IsisNET
 
 
-class Isis(Routing, DeviceFeature, InterfaceFeature, LinkFeature):
+class Isis(IncrementalConfigMixin, Routing, DeviceFeature, InterfaceFeature, LinkFeature):
+
+    # Isis attributes only render through device_attr
+    _config_diff_full_build = True
 
     pid = managedattribute(
         name='pid',
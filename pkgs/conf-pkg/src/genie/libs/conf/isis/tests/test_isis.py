@@ -108,6 +108,41 @@ class test_isis(unittest.TestCase):
             ' exit',
             ]))
 
+    def test_IsisIncrementalBuildConfig(self):
+
+        isis = Isis("core")
+        self.dev1.add_feature(isis)
+        isis.device_attr['PE1'].net_id = "00.0000.0000.0001.00"
+        af = isis.device_attr['PE1'].address_family_attr['ipv4 unicast']
+
+        # First diff build emits everything set so far
+        self.assertIn('PE1', isis.build_config_diff(apply=False))
+        af.build_config_diff()
+        self.assertIsNone(isis.build_config_diff(apply=False))
+
+        # Isis attributes render through device_attr, so the full
+        # configuration is built
+        isis.nsr = True
+        self.assertEqual(isis.config_modified_attributes, {'nsr'})
+        cfgs = isis.build_config_diff(apply=False)
+        self.assertMultiLineEqual(str(cfgs['PE1']), '\n'.join([
+            'router isis core',
+            ' net 00.0000.0000.0001.00',
+            ' nsr',
+            ' address-family ipv4 unicast',
+            '  exit',
+            ' exit',
+            ]))
+        self.assertIsNone(isis.build_config_diff(apply=False))
+
+        # Sub attributes only return their configuration by default
+        af.metric_style = "wide"
+        self.assertMultiLineEqual(af.build_config_diff(), '\n'.join([
+            'address-family ipv4 unicast',
+            ' metric-style wide',
+            ' exit',
+            ]))
+
     def test_IsisPerAddrFamily(self):
 
         isis = Isis("core")
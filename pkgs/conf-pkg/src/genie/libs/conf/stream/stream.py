@@ -2,8 +2,10 @@
 __all__ = (
     'Stream',
     'StreamStats',
+    'StreamStatsSnapshot',
 )
 
+import array
 import functools
 import collections
 from collections import abc
@@ -11,8 +13,11 @@ import itertools
 import enum
 import logging
 import datetime
+import inspect
+import math
 import operator
 import re
+import types
 logger = logging.getLogger(__name__)
 
 try:
@@ -57,11 +62,32 @@ def _IPv6InterfaceRange_to_IPv6AddressRange(value):
     raise TypeError(value)
 
 
-def _asdict(self):
-    d = {}
-    for k in dir(self):
+@functools.lru_cache(maxsize=None)
+def _asdict_fields(cls):
+    '''Public data attribute names declared on `cls` (and its bases).
+
+    Computed once per class; methods and nested classes are left out so that
+    `_asdict` does not need to walk `dir()` for every object.
+    '''
+    fields = []
+    for k in dir(cls):
         if k.startswith('_'):
             continue
+        v = inspect.getattr_static(cls, k)
+        if isinstance(v, (types.FunctionType, staticmethod, classmethod,
+                          type)):
+            continue
+        fields.append(k)
+    return tuple(fields)
+
+
+def _asdict(self):
+    d = {}
+    fields = _asdict_fields(type(self))
+    extra_fields = sorted(
+        k for k in vars(self)
+        if not k.startswith('_') and k not in fields)
+    for k in itertools.chain(fields, extra_fields):
         try:
             v = getattr(self, k)
         except:
@@ -361,6 +387,167 @@ class StreamStats(object):
 
         return d
 
+
+def _stats_fields(cls):
+    return tuple(k for k in _asdict_fields(cls)
+                 if inspect.getattr_static(cls, k) is None)
+
+
+class StreamStatsSnapshot(object):
+    '''Array-backed statistics of many streams collected at once.
+
+    Where `StreamStats` holds one object per stream, interface and direction,
+    a snapshot stores each TX/RX counter as a single `array.array('d')` column
+    indexed by stream; unavailable values are stored as ``nan``. Deltas and
+    rates are therefore computed one column at a time, which keeps polling
+    hundreds of streams (e.g. for outage calculation) cheap.
+
+    Example:
+
+        >>> s1 = StreamStatsSnapshot.from_stream_stats(tgen.get_stream_stats())
+        >>> s2 = StreamStatsSnapshot.from_stream_stats(tgen.get_stream_stats())
+        >>> delta = s2 - s1
+        >>> delta.get(stream, 'total_pkt_rate', direction='rx')
+    '''
+
+    tx_fields = _stats_fields(TxStats)
+    rx_fields = _stats_fields(RxStats)
+
+    # Rate column computed from each counter column over the elapsed time
+    map_count_rate_stats = {
+        'total_pkts': 'total_pkt_rate',
+        'total_pkt_bits': 'total_pkt_bit_rate',
+        'total_pkt_bytes': 'total_pkt_byte_rate',
+        'out_of_sequence_pkts': 'out_of_sequence_pkt_rate',
+        'x_adv_seq_in_order_pkts': 'x_adv_seq_in_order_pkt_rate',
+        'x_adv_seq_reordered_pkts': 'x_adv_seq_reordered_pkt_rate',
+        'x_adv_seq_late_pkts': 'x_adv_seq_late_pkt_rate',
+        'x_adv_seq_duplicate_pkts': 'x_adv_seq_duplicate_pkt_rate',
+        'x_adv_seq_dropped_pkts': 'x_adv_seq_dropped_pkt_rate',
+    }
+
+    collect_time = None
+    elapsed_time = None
+
+    def __init__(self, streams=(), collect_time=None):
+        self.streams = tuple(streams)
+        self._index = {stream: i for i, stream in enumerate(self.streams)}
+        self.tx = {field: self._new_column() for field in self.tx_fields}
+        self.rx = {field: self._new_column() for field in self.rx_fields}
+        if collect_time is None:
+            collect_time = datetime.datetime.now()
+        self.collect_time = collect_time
+
+    def _new_column(self):
+        return array.array('d', itertools.repeat(math.nan, len(self.streams)))
+
+    @classmethod
+    def from_stream_stats(cls, stats, streams=None):
+        '''Build a snapshot from a `StreamStats` object.
+
+        Args:
+            stats (`StreamStats`): Statistics as returned by
+                `get_stream_stats`.
+            streams (`list`): Streams (and order) to include. Defaults to all
+                streams found in `stats`.
+        '''
+        if streams is None:
+            streams = stats.by_stream.keys()
+        snapshot = cls(streams, collect_time=stats.collect_time)
+        for i, stream in enumerate(snapshot.streams):
+            stream_stats = stats.by_stream.get(stream, None)
+            if stream_stats is None:
+                continue
+            for txrx in ('tx', 'rx'):
+                txrx_stats = getattr(stream_stats, txrx)
+                for field, column in getattr(snapshot, txrx).items():
+                    v = getattr(txrx_stats, field, None)
+                    if v is None:
+                        continue
+                    try:
+                        column[i] = v
+                    except TypeError:
+                        pass
+        return snapshot
+
+    def __len__(self):
+        return len(self.streams)
+
+    def __iter__(self):
+        return iter(self.streams)
+
+    def __contains__(self, stream):
+        return stream in self._index
+
+    def get(self, stream, field, direction='rx', default=None):
+        '''Return a single statistic value, or `default` if unavailable.'''
+        try:
+            v = getattr(self, direction)[field][self._index[stream]]
+        except KeyError:
+            return default
+        return default if math.isnan(v) else v
+
+    def _aligned_columns(self, other, txrx):
+        '''Columns of `other` re-indexed to follow `self.streams`.'''
+        other_columns = getattr(other, txrx)
+        if other.streams == self.streams:
+            return other_columns
+        indexes = [other._index.get(stream, None) for stream in self.streams]
+        return {
+            field: array.array('d', (
+                math.nan if i is None else column[i] for i in indexes))
+            for field, column in other_columns.items()}
+
+    def __sub__(self, other):
+        d = type(self)(self.streams, collect_time=other.collect_time)
+
+        for txrx in ('tx', 'rx'):
+            self_columns = getattr(self, txrx)
+            other_columns = self._aligned_columns(other, txrx)
+            d_columns = getattr(d, txrx)
+            for field, column in self_columns.items():
+                if field.endswith('_delay') \
+                        or field.endswith('_length') \
+                        or field.endswith('_rate'):
+                    # Makes no sense substituting these
+                    continue
+                d_columns[field] = array.array(
+                    'd', map(operator.sub, column, other_columns[field]))
+
+        try:
+            d.elapsed_time = \
+                (self.collect_time - other.collect_time).total_seconds()
+        except TypeError:
+            pass
+
+        if d.elapsed_time:
+            d._update_rate_stats(d.elapsed_time)
+
+        return d
+
+    def _update_rate_stats(self, elapsed_time):
+        for txrx in ('tx', 'rx'):
+            columns = getattr(self, txrx)
+            for count_attr, rate_attr in self.map_count_rate_stats.items():
+                if count_attr not in columns or rate_attr not in columns:
+                    continue
+                columns[rate_attr] = array.array(
+                    'd', (v / elapsed_time for v in columns[count_attr]))
+
+    def asdict(self):
+        '''Return ``{stream: {'tx': {...}, 'rx': {...}}}``.
+
+        Built column by column; unavailable values are returned as `None`.
+        '''
+        d = {stream: {'tx': {}, 'rx': {}} for stream in self.streams}
+        for txrx in ('tx', 'rx'):
+            stream_dicts = [d[stream][txrx] for stream in self.streams]
+            for field, column in getattr(self, txrx).items():
+                for stream_dict, v in zip(stream_dicts, column):
+                    stream_dict[field] = None if math.isnan(v) else v
+        return d
+
+
 @functools.total_ordering
 class Stream(ConfigurableBase):
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import datetime
 import unittest
 from unittest.mock import Mock
 
@@ -10,7 +11,7 @@ from genie.conf import Genie
 from genie.conf.base import Testbed, Device, Link, Interface
 from genie.conf.base.attributes import UnsupportedAttributeWarning
 
-from genie.libs.conf.stream import Stream
+from genie.libs.conf.stream import Stream, StreamStats, StreamStatsSnapshot
 from genie.libs.conf.base import MAC, IPv4Address, IPv6Address
 
 
@@ -137,6 +138,59 @@ class test_stream(TestCase):
         self.assertTypedEqual(stream1.obj_state, 'active')
         self.assertTypedEqual(stream1.sub_stream_increments, typedset(Stream.SubStreamIncrement, ()))
 
+
+class test_stream_stats_snapshot(unittest.TestCase):
+
+    def _stats(self, collect_time, **by_stream):
+        stats = StreamStats()
+        stats.collect_time = collect_time
+        for stream, (tx_pkts, rx_pkts) in by_stream.items():
+            stream_stats = stats.by_stream[stream] = StreamStats.ByStreamStats()
+            stream_stats.tx.total_pkts = tx_pkts
+            stream_stats.rx.total_pkts = rx_pkts
+        return stats
+
+    def test_from_stream_stats(self):
+        now = datetime.datetime.now()
+        snapshot = StreamStatsSnapshot.from_stream_stats(
+            self._stats(now, s1=(100, 90), s2=(50, 50)))
+        self.assertEqual(len(snapshot), 2)
+        self.assertIn('s1', snapshot)
+        self.assertEqual(snapshot.get('s1', 'total_pkts', direction='tx'), 100)
+        self.assertEqual(snapshot.get('s1', 'total_pkts'), 90)
+        self.assertIsNone(snapshot.get('s1', 'total_pkt_rate'))
+        self.assertIsNone(snapshot.get('s3', 'total_pkts'))
+        self.assertEqual(snapshot.collect_time, now)
+
+    def test_sub_and_rates(self):
+        now = datetime.datetime.now()
+        snapshot1 = StreamStatsSnapshot.from_stream_stats(
+            self._stats(now, s1=(100, 90), s2=(50, 50)))
+        snapshot2 = StreamStatsSnapshot.from_stream_stats(
+            self._stats(now + datetime.timedelta(seconds=10),
+                        s2=(150, 130), s1=(300, 290)))
+        delta = snapshot2 - snapshot1
+        self.assertEqual(delta.elapsed_time, 10)
+        self.assertEqual(delta.get('s1', 'total_pkts', direction='tx'), 200)
+        self.assertEqual(delta.get('s1', 'total_pkts'), 200)
+        self.assertEqual(delta.get('s1', 'total_pkt_rate'), 20)
+        self.assertEqual(delta.get('s2', 'total_pkts'), 80)
+        self.assertEqual(delta.get('s2', 'total_pkt_rate'), 8)
+
+    def test_asdict(self):
+        now = datetime.datetime.now()
+        snapshot = StreamStatsSnapshot.from_stream_stats(
+            self._stats(now, s1=(100, 90)))
+        d = snapshot.asdict()
+        self.assertEqual(set(d), {'s1'})
+        self.assertEqual(d['s1']['tx']['total_pkts'], 100)
+        self.assertEqual(d['s1']['rx']['total_pkts'], 90)
+        self.assertIsNone(d['s1']['rx']['min_delay'])
+        self.assertEqual(
+            d['s1']['rx']['total_pkts'],
+            self._stats(now, s1=(100, 90)).asdict()
+                ['by_stream']['s1']['rx']['total_pkts'])
+
 if __name__ == '__main__':
     unittest.main()
 
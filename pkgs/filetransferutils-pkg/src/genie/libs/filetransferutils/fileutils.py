@@ -5,7 +5,6 @@ import logging
 import contextlib
 import ipaddress
 import time
-from functools import lru_cache
 
 # Urlparse
 from urllib.parse import urlparse
@@ -25,6 +24,8 @@ except ImportError:
 from genie.abstract import Lookup
 from genie.libs import sdk, parser
 
+from .session import reachability_cache
+
 logger = logging.getLogger(__name__)
 
 # Error patterns to be caught when executing cli on device
@@ -338,18 +339,12 @@ class FileUtils(FileUtilsBase):
         """
         return urlparse(url)
 
-    @lru_cache(maxsize=32)
     def is_valid_ip_cache(self, ip, device, vrf=None):
         # check if ip is reachable from device by sending ping command,
-        # this one is cached that it only pings the first time
-        try:
-            if vrf:
-                device.ping(ip, vrf=vrf)
-            else:
-                device.ping(ip)
-            return True
-        except SubCommandFailure:
-            return False
+        # the result is shared by all FileUtils instances for the ttl of
+        # the reachability cache
+        return reachability_cache.check(ip, device, vrf,
+                                        self.is_valid_ip_no_cache)
 
     def is_valid_ip_no_cache(self, ip, device, vrf=None):
         # check if ip is reachable from device by sending ping command, not cached version
@@ -0,0 +1,271 @@
+""" Process-wide FileUtils sessions and reachability cache.
+
+Every `FileUtils(testbed=...)` opens its own connections to the file
+servers, and closes them on exit. Code touching the same server many times
+in a run (clean stages, copy and delete APIs, packet captures) paid the
+connection handshake on every call. `session_pool` hands out one FileUtils
+session per testbed, server and protocol, kept open between calls:
+
+    >>> from genie.libs.filetransferutils.session import session_pool
+    >>> with session_pool.session(testbed, server, 'sftp') as fu:
+    ...     fu.deletefile(target=url)
+
+A session idle for longer than `idle_timeout`, or which raised a connection
+error, is closed and replaced by a new one on the next call. The server may
+also have dropped a session before `idle_timeout`: a call on a reused session
+failing with a connection error is retried once on a new session. Sessions
+are never shared with a forked process.
+
+Sessions to a server port other than the protocol default are pooled
+separately, with the port set on them:
+
+    >>> with session_pool.session(testbed, server, 'scp', port=2222) as fu:
+    ...     fu.copyfile(source=url, destination=local_dir)
+
+`reachability_cache` keeps the result of pinging a server from a device for
+`ttl` seconds, for all the FileUtils instances of the process.
+"""
+
+import os
+import time
+import atexit
+import socket
+import logging
+import functools
+import threading
+import contextlib
+from collections import OrderedDict
+
+# FileUtils Core
+try:
+    from pyats.utils.fileutils import FileUtils as FileUtilsBase
+except ImportError:
+    # For apidoc building only
+    from unittest.mock import Mock; FileUtilsBase=Mock
+
+logger = logging.getLogger(__name__)
+
+# Errors after which a session is not reused
+CONNECTION_ERRORS = (ConnectionError, EOFError, TimeoutError, socket.timeout)
+
+
+class _Session(object):
+
+    def __init__(self, testbed, fu):
+        self.testbed = testbed
+        self.fu = fu
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        # whether a call went through the session
+        self.used = False
+
+
+class _PooledFileUtils(object):
+    """ FileUtils of a pooled session, as yielded by
+        `FileUtilsSessionPool.session`. A call failing with a connection
+        error on a reused session is retried once on a new session.
+    """
+
+    def __init__(self, pool, key, session, new_session):
+        self._pool = pool
+        self._key = key
+        self._session = session
+        self._new_session = new_session
+        # session replacing the one given, added to the pool on exit
+        self.replaced = None
+
+    @property
+    def session(self):
+        return self.replaced or self._session
+
+    def __getattr__(self, name):
+        value = getattr(self.session.fu, name)
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        def call(*args, **kwargs):
+            session = self.session
+            try:
+                result = getattr(session.fu, name)(*args, **kwargs)
+            except CONNECTION_ERRORS:
+                if not session.used or self.replaced:
+                    raise
+                logger.debug('FileUtils session %s dropped, retrying on a '
+                             'new session', self._key, exc_info=True)
+                self._pool.discard(self._key, session)
+                self.replaced = self._new_session()
+                result = getattr(self.replaced.fu, name)(*args, **kwargs)
+            self.session.used = True
+            return result
+        return call
+
+
+class FileUtilsSessionPool(object):
+    """ FileUtils sessions shared by server and protocol. """
+
+    def __init__(self, idle_timeout=300):
+        """
+            Parameters
+            ----------
+                idle_timeout: `int`
+                  Seconds after which an unused session is closed instead of
+                  reused, before the server drops it. Default to 300
+        """
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _close(session):
+        try:
+            session.fu.close()
+        except Exception:
+            logger.debug('Failed to close FileUtils session', exc_info=True)
+
+    @staticmethod
+    def _new_session(testbed, protocol, port):
+        fu = FileUtilsBase(testbed=testbed)
+        if port:
+            fu.get_child(protocol)
+            fu.children[protocol].SSH_DEFAULT_PORT = port
+        return _Session(testbed, fu)
+
+    def _get(self, testbed, server, protocol, port=None):
+        key = (id(testbed), server, protocol, port)
+        with self._lock:
+            if os.getpid() != self._pid:
+                # forked: the connections belong to the parent process
+                self._sessions = {}
+                self._pid = os.getpid()
+
+            session = self._sessions.get(key)
+            if session is not None and session.testbed is not testbed:
+                session = None
+            if session is not None and \
+                    time.monotonic() - session.last_used > self.idle_timeout:
+                logger.debug('FileUtils session to %s (%s) idle, reopening',
+                             server, protocol)
+                self._close(session)
+                session = None
+            if session is None:
+                session = self._new_session(testbed, protocol, port)
+                self._sessions[key] = session
+        return key, session
+
+    def get(self, testbed, server=None, protocol=None, port=None):
+        """ Return the FileUtils session of the server and protocol, for a
+            caller using it for a long time, e.g. a whole clean stage. The
+            session must not be closed by the caller.
+        """
+        return self._get(testbed, server, protocol, port)[1].fu
+
+    @contextlib.contextmanager
+    def session(self, testbed, server=None, protocol=None, port=None):
+        """ Context manager yielding the FileUtils session of the server and
+            protocol, opened on first use.
+
+            Parameters
+            ----------
+                testbed: `Testbed`
+                  Testbed holding the servers
+                server: `str`
+                  Server name or address
+                protocol: `str`
+                  Transfer protocol
+                port: `int`
+                  Server port of the ssh based protocols, default to the
+                  protocol default port
+
+            Yields
+            ------
+                `FileUtils`
+        """
+        key, session = self._get(testbed, server, protocol, port)
+        fu = _PooledFileUtils(
+            self, key, session,
+            lambda: self._new_session(testbed, protocol, port))
+        # operations on one session are serialized
+        with session.lock:
+            try:
+                yield fu
+            except CONNECTION_ERRORS:
+                self.discard(key, fu.session)
+                raise
+            else:
+                if fu.replaced:
+                    with self._lock:
+                        if key in self._sessions:
+                            self._close(fu.replaced)
+                        else:
+                            self._sessions[key] = fu.replaced
+            finally:
+                fu.session.last_used = time.monotonic()
+
+    def discard(self, key, session):
+        """ Close a session and remove it from the pool. """
+        with self._lock:
+            if self._sessions.get(key) is session:
+                del self._sessions[key]
+        self._close(session)
+
+    def close(self, testbed=None):
+        """ Close the sessions of `testbed`, or all of them. """
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._sessions = {}
+                return
+            keys = [key for key, session in self._sessions.items()
+                    if testbed is None or session.testbed is testbed]
+            sessions = [self._sessions.pop(key) for key in keys]
+        for session in sessions:
+            self._close(session)
+
+
+class ReachabilityCache(object):
+    """ Results of reachability checks, kept for `ttl` seconds. """
+
+    def __init__(self, ttl=300, maxsize=1024):
+        """
+            Parameters
+            ----------
+                ttl: `int`
+                  Seconds a result is reused. Default to 300
+                maxsize: `int`
+                  Number of results kept. Default to 1024
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, ip, device, vrf, func):
+        """ Return the result of `func(ip, device, vrf)`, reusing the one of
+            a previous call within the ttl.
+        """
+        key = (ip, device, vrf)
+        with self._lock:
+            entry = self._results.get(key)
+            if entry and time.monotonic() - entry[0] <= self.ttl:
+                self._results.move_to_end(key)
+                return entry[1]
+
+        result = func(ip, device, vrf)
+
+        with self._lock:
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+session_pool = FileUtilsSessionPool()
+reachability_cache = ReachabilityCache()
+
+atexit.register(session_pool.close)
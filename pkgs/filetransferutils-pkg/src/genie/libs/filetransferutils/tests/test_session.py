@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+import unittest
+from unittest.mock import Mock, patch
+
+from genie.libs.filetransferutils.session import (FileUtilsSessionPool,
+                                                  ReachabilityCache)
+
+
+@patch('genie.libs.filetransferutils.session.FileUtilsBase')
+class test_session_pool(unittest.TestCase):
+
+    def setUp(self):
+        self.testbed = Mock()
+        self.pool = FileUtilsSessionPool()
+        # FileUtils opened by the pool
+        self.opened = []
+
+    def open(self, testbed):
+        fu = Mock(children={'scp': Mock()})
+        self.opened.append(fu)
+        return fu
+
+    def test_session_reused(self, fu_class):
+        fu_class.side_effect = self.open
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp') as fu:
+            fu.copyfile()
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp') as fu:
+            fu.copyfile()
+        with self.pool.session(self.testbed, '1.1.1.1', 'scp') as fu:
+            fu.copyfile()
+        fu1, fu3 = self.opened
+        self.assertEqual(fu1.copyfile.call_count, 2)
+        self.assertEqual(fu3.copyfile.call_count, 1)
+        self.assertIs(self.pool.get(self.testbed, '1.1.1.1', 'sftp'), fu1)
+        fu1.close.assert_not_called()
+
+    def test_session_port(self, fu_class):
+        fu_class.side_effect = self.open
+        with self.pool.session(self.testbed, '1.1.1.1', 'scp', port=2222):
+            pass
+        with self.pool.session(self.testbed, '1.1.1.1', 'scp'):
+            pass
+        fu1, fu2 = self.opened
+        fu1.get_child.assert_called_once_with('scp')
+        self.assertEqual(fu1.children['scp'].SSH_DEFAULT_PORT, 2222)
+        # the session of the default port is left alone
+        fu2.get_child.assert_not_called()
+
+    def test_session_idle(self, fu_class):
+        fu_class.side_effect = self.open
+        self.pool.idle_timeout = 0
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp'):
+            pass
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp'):
+            pass
+        fu1, fu2 = self.opened
+        fu1.close.assert_called_once_with()
+        fu2.close.assert_not_called()
+
+    def test_session_connection_error(self, fu_class):
+        fu_class.side_effect = self.open
+        with self.assertRaises(EOFError):
+            with self.pool.session(self.testbed, '1.1.1.1', 'sftp'):
+                raise EOFError()
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp'):
+            pass
+        fu1, fu2 = self.opened
+        fu1.close.assert_called_once_with()
+
+    def test_session_dropped(self, fu_class):
+        fu_class.side_effect = self.open
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp') as fu:
+            fu.copyfile()
+        # the server dropped the session in between
+        self.opened[0].copyfile.side_effect = EOFError()
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp') as fu:
+            self.assertEqual(fu.copyfile(), self.opened[1].copyfile())
+        fu1, fu2 = self.opened
+        fu1.close.assert_called_once_with()
+        # the new session replaced the dropped one
+        self.assertIs(self.pool.get(self.testbed, '1.1.1.1', 'sftp'), fu2)
+
+    def test_session_new_connection_error(self, fu_class):
+        fu_class.side_effect = self.open
+        with self.assertRaises(EOFError):
+            with self.pool.session(self.testbed, '1.1.1.1', 'sftp') as fu:
+                self.opened[0].copyfile.side_effect = EOFError()
+                fu.copyfile()
+        # a new session is not retried
+        self.assertEqual(len(self.opened), 1)
+        self.opened[0].close.assert_called_once_with()
+
+    def test_session_other_error(self, fu_class):
+        fu_class.side_effect = self.open
+        with self.assertRaises(FileNotFoundError):
+            with self.pool.session(self.testbed, '1.1.1.1', 'sftp'):
+                raise FileNotFoundError()
+        with self.pool.session(self.testbed, '1.1.1.1', 'sftp'):
+            pass
+        self.assertEqual(len(self.opened), 1)
+
+    def test_close(self, fu_class):
+        fu_class.side_effect = self.open
+        fu = self.pool.get(self.testbed, '1.1.1.1', 'sftp')
+        self.pool.close(Mock())
+        fu.close.assert_not_called()
+        self.pool.close(self.testbed)
+        fu.close.assert_called_once_with()
+        self.assertIsNot(self.pool.get(self.testbed, '1.1.1.1', 'sftp'), fu)
+
+
+class test_reachability_cache(unittest.TestCase):
+
+    def test_check(self):
+        cache = ReachabilityCache()
+        func = Mock(return_value=True)
+        device = Mock()
+        self.assertTrue(cache.check('1.1.1.1', device, None, func))
+        self.assertTrue(cache.check('1.1.1.1', device, None, func))
+        func.assert_called_once_with('1.1.1.1', device, None)
+        cache.check('1.1.1.1', device, 'mgmt', func)
+        self.assertEqual(func.call_count, 2)
+
+    def test_check_ttl(self):
+        cache = ReachabilityCache(ttl=-1)
+        func = Mock(side_effect=[False, True])
+        device = Mock()
+        self.assertFalse(cache.check('1.1.1.1', device, None, func))
+        self.assertTrue(cache.check('1.1.1.1', device, None, func))
+
+    def test_check_maxsize(self):
+        cache = ReachabilityCache(maxsize=1)
+        func = Mock(return_value=True)
+        device = Mock()
+        cache.check('1.1.1.1', device, None, func)
+        cache.check('2.2.2.2', device, None, func)
+        cache.check('1.1.1.1', device, None, func)
+        self.assertEqual(func.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim: ft=python et sw=4
@@ -24,6 +24,7 @@ from genie import testbed
 from genie.utils import Dq
 from genie.harness.datafile.loader import TriggerdatafileLoader
 from genie.libs.health import health_yamls
+from genie.libs.sdk.libs.utils.recorder import CommandRecorder, get_recorder
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +94,8 @@ class HealthCheckPlugin(BasePlugin):
             health_devices = ['-health_devices']
             health_webex = ['-health_webex']  # deprecated
             health_notify_webex = ['-health_notify_webex']
+            health_record_commands = ['-health_record_commands']
+            health_record_interval = ['-health_record_interval']
         else:
             health_file = ['--health-file']
             health_sections = ['--health-sections']  # deprecated
@@ -112,6 +115,8 @@ class HealthCheckPlugin(BasePlugin):
             health_devices = ['--health-devices']
             health_webex = ['--health-webex']  # deprecated
             health_notify_webex = ['--health-notify-webex']
+            health_record_commands = ['--health-record-commands']
+            health_record_interval = ['--health-record-interval']
 
         pyats_health_grp.add_argument(*health_file,
                                       dest='health_file',
@@ -236,6 +241,22 @@ class HealthCheckPlugin(BasePlugin):
                                       action='store_true',
                                       help='Flag to send webex notification')
 
+        pyats_health_grp.add_argument(
+            *health_record_commands,
+            dest='health_record_commands',
+            default=None,
+            nargs='*',
+            help='Specify commands to record periodically in the background '
+                 'on the health devices during the whole job')
+
+        pyats_health_grp.add_argument(
+            *health_record_interval,
+            dest='health_record_interval',
+            default=None,
+            type=int,
+            help='Specify interval in seconds of the recorded commands. '
+                 'Default to 60')
+
         return parser
 
     def __init__(self, *args, **kwargs):
@@ -565,6 +586,17 @@ class HealthCheckPlugin(BasePlugin):
                     })
                 processors.setdefault('context', []).append(processor)
 
+        # record commands in the background until post_task
+        if self.runtime.args.health_record_commands:
+            recorder = CommandRecorder(directory=runtime.directory,
+                                       name='health')
+            for device in health_settings.get('devices') or tb.devices:
+                recorder.add(tb.devices[device],
+                             self.runtime.args.health_record_commands,
+                             interval=self.runtime.args.health_record_interval
+                             or 60)
+            recorder.start()
+
         # save `pyats_health.yaml` to runtime.directory for archive
         with open(
                 "{rundir}/pyats_health.yaml".format(
@@ -574,6 +606,13 @@ class HealthCheckPlugin(BasePlugin):
                       default_flow_style = False)
 
     def post_task(self, task):
+        # stop the command recorder started in pre_task
+        recorder = get_recorder('health')
+        if recorder is not None:
+            for device, path in recorder.stop().items():
+                logger.info('saved recorded commands of {device} to {path}'
+                            .format(device=device, path=path))
+
         # save to health_results.json
         if hasattr(runtime, 'health_results'):
             health_results = {
@@ -12,3 +12,9 @@ class Arp(Base):
                 'in_replies_pkts',
                 'out_requests_pkts',
                 'out_total']
+
+    # Tables which can be stored as ColumnarTable, see
+    # genie.libs.ops.utils.columnar
+    columnar_tables = [
+        ('info', 'interfaces', '*', 'ipv4', 'neighbors'),
+    ]
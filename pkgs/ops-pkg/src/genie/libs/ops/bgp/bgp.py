@@ -35,4 +35,15 @@ class Bgp(Base):
                'advertised',
                'prefixes',
                'routes',
-               'state_pfxrcd']
\ No newline at end of file
+               'state_pfxrcd']
+
+    # Tables which can be stored as ColumnarTable, see
+    # genie.libs.ops.utils.columnar
+    columnar_tables = [
+        ('table', 'instance', '*', 'vrf', '*', 'address_family', '*',
+         'prefixes'),
+    ] + [
+        ('routes_per_peer', 'instance', '*', 'vrf', '*', 'neighbor', '*',
+         'address_family', '*', routes)
+        for routes in ('advertised', 'received_routes', 'routes')
+    ]
\ No newline at end of file
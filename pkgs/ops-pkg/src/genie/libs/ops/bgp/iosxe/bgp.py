@@ -3,10 +3,14 @@ BGP Genie Ops Object for IOSXE - CLI.
 '''
 
 import re
+import logging
 
 
 # Super class
 from genie.libs.ops.bgp.bgp import Bgp as SuperBgp
+from genie.libs.ops.utils.output_cache import OpsOutputCache
+
+log = logging.getLogger(__name__)
 
 
 class Bgp(SuperBgp):
@@ -23,6 +27,20 @@ class Bgp(SuperBgp):
             item = m.groupdict()['afname']
         return item
 
+    def _prefetch(self, commands):
+        '''Fetch per-neighbor commands in one go when an Ops output cache
+        is active on the device. On failure the commands are sent one by
+        one when the leafs are made, as without the cache'''
+        cache = OpsOutputCache.get(self.device)
+        if cache is None:
+            return
+        try:
+            cache.prefetch([' '.join(cmd.split()) for cmd in commands])
+        except Exception as e:
+            log.warning('Could not prefetch BGP neighbor commands on {}, '
+                        'sending them one by one: {}'.format(
+                            self.device.name, e))
+
     def learn(self, vrf='', address_family='', neighbor=''):
         '''Learn BGP Ops'''
 
@@ -495,6 +513,10 @@ class Bgp(SuperBgp):
         if hasattr (self, 'info') and\
            'list_of_neighbors' in self.info:
 
+            self._prefetch(
+                'show bgp all neighbors {neighbor} policy'.format(neighbor=nbr)
+                for nbr in sorted(self.info['list_of_neighbors']))
+
             for nbr in sorted(self.info['list_of_neighbors']):
 
                 if vrf:
@@ -751,6 +773,12 @@ class Bgp(SuperBgp):
         if hasattr (self, 'routes_per_peer') and\
            'list_of_neighbors' in self.routes_per_peer:
 
+            self._prefetch(
+                cmd.format(nbr=nbr)
+                for nbr in sorted(self.routes_per_peer['list_of_neighbors'])
+                for cmd in (bgp_adv_route_class, bgp_route_class,
+                            bgp_rec_rout_class))
+
             for nbr in sorted(self.routes_per_peer['list_of_neighbors']):
                 if vrf:
 
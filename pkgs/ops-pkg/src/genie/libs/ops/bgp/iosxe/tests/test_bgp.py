@@ -8,6 +8,7 @@ from pyats.topology import Device
 # Genie
 from genie.libs.ops.bgp.iosxe.bgp import Bgp
 from genie.libs.ops.bgp.iosxe.tests.bgp_output import BgpOutput
+from genie.libs.ops.utils.output_cache import OpsOutputCache
 
 # iosxe show_bgp
 from genie.libs.parser.iosxe.show_bgp import ShowBgpAllSummary, ShowBgpAllClusterIds, \
@@ -66,6 +67,12 @@ outputs['show ip bgp all dampening parameters'] = ''
 
 def mapper(key):
     return outputs[key]
+
+
+def batch_mapper(key):
+    if isinstance(key, list):
+        return {k: outputs[k] for k in key}
+    return outputs[key]
  
 
 class test_bgp(unittest.TestCase):
@@ -169,6 +176,62 @@ class test_bgp(unittest.TestCase):
         self.assertEqual(bgp.routes_per_peer['instance']['default']['vrf']\
                 ['VRF1']['neighbor']['2.2.2.2']['remote_as'], 65000)
 
+    def test_output_cache(self):
+        self.maxDiff = None
+
+        # Return outputs above as inputs to parser when called
+        self.device.execute = Mock()
+        self.device.execute.side_effect = batch_mapper
+
+        # Learn the feature twice within the same cache window
+        with OpsOutputCache(self.device, ttl=60) as cache:
+            bgp = Bgp(device=self.device)
+            bgp.learn()
+            calls = self.device.execute.call_count
+            bgp2 = Bgp(device=self.device)
+            bgp2.learn()
+
+            # Per-neighbor commands were fetched in batches
+            batches = [c[0][0] for c in self.device.execute.call_args_list
+                       if isinstance(c[0][0], list)]
+            self.assertIn('show bgp all neighbors 2.2.2.2 policy', batches[0])
+            self.assertIn('show bgp all neighbors 2.2.2.2 routes', batches[1])
+
+        # Second learn was served from the cache
+        self.assertEqual(self.device.execute.call_count, calls)
+        self.assertGreater(cache.hits, 0)
+        self.assertIsNone(OpsOutputCache.get(self.device))
+
+        self.assertEqual(bgp.info, BgpOutput.bgp_info)
+        self.assertEqual(bgp2.info, BgpOutput.bgp_info)
+        self.assertDictEqual(bgp2.table, BgpOutput.bgp_table)
+        self.assertDictEqual(bgp2.routes_per_peer,
+                             BgpOutput.bgp_routes_per_peer)
+
+    def test_output_cache_prefetch_failure(self):
+        self.maxDiff = None
+
+        def failing_batch_mapper(key):
+            if isinstance(key, list):
+                raise Exception('Invalid input detected')
+            return outputs[key]
+
+        self.device.execute = Mock()
+        self.device.execute.side_effect = failing_batch_mapper
+
+        # The commands are sent one by one when the batch fails, and the
+        # concurrent fanout is batched as the device is not a pool
+        with OpsOutputCache(self.device, ttl=60, fanout='concurrent'):
+            bgp = Bgp(device=self.device)
+            bgp.learn()
+
+        self.device.execute.assert_any_call(
+            'show bgp all neighbors 2.2.2.2 policy')
+        self.assertEqual(bgp.info, BgpOutput.bgp_info)
+        self.assertDictEqual(bgp.table, BgpOutput.bgp_table)
+        self.assertDictEqual(bgp.routes_per_peer,
+                             BgpOutput.bgp_routes_per_peer)
+
 
 if __name__ == '__main__':
     unittest.main()
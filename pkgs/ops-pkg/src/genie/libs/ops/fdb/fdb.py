@@ -1,4 +1,10 @@
 from genie.ops.base import Base
 
 class Fdb(Base):
-    exclude = []
\ No newline at end of file
+    exclude = []
+
+    # Tables which can be stored as ColumnarTable, see
+    # genie.libs.ops.utils.columnar
+    columnar_tables = [
+        ('info', 'mac_table', 'vlans', '*', 'mac_addresses'),
+    ]
\ No newline at end of file
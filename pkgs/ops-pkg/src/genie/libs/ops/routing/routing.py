@@ -3,4 +3,10 @@ from genie.ops.base import Base
 
 
 class Routing(Base):
-    exclude = ['updated']
\ No newline at end of file
+    exclude = ['updated']
+
+    # Tables which can be stored as ColumnarTable, see
+    # genie.libs.ops.utils.columnar
+    columnar_tables = [
+        ('info', 'vrf', '*', 'address_family', '*', 'routes'),
+    ]
\ No newline at end of file
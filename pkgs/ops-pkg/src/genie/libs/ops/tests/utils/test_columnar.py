@@ -0,0 +1,121 @@
+# Python
+import pickle
+import unittest
+from copy import deepcopy
+
+# Genie
+from genie.libs.ops.utils.columnar import (ColumnarTable, columnarize,
+                                           decolumnarize)
+
+
+def create_routes(count):
+    return {'10.0.{}.0/24'.format(i): {
+        'route': '10.0.{}.0/24'.format(i),
+        'active': True,
+        'source_protocol': 'ospf' if i % 2 else 'bgp',
+        'metric': i % 10,
+        'next_hop': {'next_hop_list': {1: {'index': 1,
+                                           'next_hop': '192.168.0.1'}}}}
+        for i in range(count)}
+
+
+class test_columnar_table(unittest.TestCase):
+
+    def setUp(self):
+        self.routes = create_routes(100)
+        self.table = ColumnarTable(self.routes)
+
+    def test_rows(self):
+        self.assertEqual(len(self.table), 100)
+        self.assertEqual(self.table['10.0.3.0/24'],
+                         self.routes['10.0.3.0/24'])
+        self.assertEqual(self.table.to_dict(), self.routes)
+        self.assertEqual(dict(self.table), self.routes)
+        self.assertIn(('next_hop', 'next_hop_list', 1, 'next_hop'),
+                      self.table.columns())
+
+    def test_values_types(self):
+        row = {'int': 1, 'float': 1.0, 'bool': True, 'list': [1, 2],
+               'empty': {}, 'none': None}
+        table = ColumnarTable({'a': row, 'b': 'not a dict'})
+        self.assertEqual(table['a'], row)
+        self.assertIs(type(table['a']['bool']), bool)
+        self.assertIs(type(table['a']['float']), float)
+        self.assertEqual(table['b'], 'not a dict')
+
+    def test_set_delete(self):
+        self.table['10.0.3.0/24'] = {'route': '10.0.3.0/24'}
+        self.assertEqual(self.table['10.0.3.0/24'], {'route': '10.0.3.0/24'})
+        del self.table['10.0.4.0/24']
+        self.assertNotIn('10.0.4.0/24', self.table)
+        self.assertEqual(len(self.table), 99)
+        with self.assertRaises(KeyError):
+            self.table['10.0.4.0/24']
+
+        self.table.compact()
+        self.assertEqual(len(self.table._keys), 99)
+        self.assertEqual(self.table['10.0.5.0/24'],
+                         self.routes['10.0.5.0/24'])
+
+    def test_diff(self):
+        self.assertEqual(self.table.diff(ColumnarTable(self.routes)),
+                         {'added': [], 'removed': [], 'modified': {}})
+        self.assertEqual(self.table, ColumnarTable(self.routes))
+
+        routes = deepcopy(self.routes)
+        routes['10.0.1.0/24']['metric'] = 50
+        del routes['10.0.2.0/24']['active']
+        del routes['10.0.3.0/24']
+        routes['10.1.0.0/16'] = {'route': '10.1.0.0/16'}
+        diff = self.table.diff(routes)
+        self.assertEqual(diff['added'], ['10.1.0.0/16'])
+        self.assertEqual(diff['removed'], ['10.0.3.0/24'])
+        self.assertEqual(diff['modified'], {
+            '10.0.1.0/24': {('metric',): (1, 50)},
+            '10.0.2.0/24': {('active',): (True, None)}})
+        self.assertNotEqual(self.table, ColumnarTable(routes))
+
+        diff = self.table.diff(routes, exclude=['metric'])
+        self.assertEqual(list(diff['modified']), ['10.0.2.0/24'])
+
+    def test_pickle(self):
+        del self.table['10.0.4.0/24']
+        table = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(table, self.table)
+        self.assertEqual(table['10.0.5.0/24'], self.routes['10.0.5.0/24'])
+        table['10.0.4.0/24'] = self.routes['10.0.4.0/24']
+        self.assertEqual(table['10.0.4.0/24'], self.routes['10.0.4.0/24'])
+        self.assertEqual(deepcopy(self.table), self.table)
+
+
+class test_columnarize(unittest.TestCase):
+
+    def test_columnarize(self):
+        class Routing(object):
+            columnar_tables = [('info', 'vrf', '*', 'address_family', '*',
+                                'routes')]
+
+        routing = Routing()
+        routing.info = {'vrf': {
+            'default': {'address_family': {
+                'ipv4': {'routes': create_routes(20)},
+                'ipv6': {'routes': create_routes(5)}}},
+            'red': {'address_family': {
+                'ipv4': {'routes': create_routes(20)}}}}}
+        expected = deepcopy(routing.info)
+
+        self.assertEqual(columnarize(routing, min_rows=10), 2)
+        vrfs = routing.info['vrf']
+        self.assertIsInstance(
+            vrfs['red']['address_family']['ipv4']['routes'], ColumnarTable)
+        self.assertIsInstance(
+            vrfs['default']['address_family']['ipv6']['routes'], dict)
+
+        decolumnarize(routing)
+        self.assertEqual(routing.info, expected)
+        self.assertIsInstance(
+            vrfs['red']['address_family']['ipv4']['routes'], dict)
+
+
+if __name__ == '__main__':
+    unittest.main()
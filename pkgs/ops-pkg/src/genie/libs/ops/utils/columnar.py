@@ -0,0 +1,328 @@
+'''Columnar storage of the large tables of Ops objects.
+
+Ops objects keep every route, prefix, MAC or ARP entry of their tables as a
+dict of dicts, which costs several Python objects for each attribute of each
+row. `ColumnarTable` keeps such a table as one column per attribute path
+instead: row keys are interned, and each column is an `array` of codes into
+the distinct values of the column. Memory, pickling and diffing then scale
+with the number of rows rather than with the number of Python objects.
+
+The table is a mapping of row key to row, the row dicts being rebuilt on
+access (so a changed row must be set back into the table):
+
+    >>> from genie.libs.ops.utils.columnar import columnarize, decolumnarize
+    >>> routing = device.learn('routing')
+    >>> columnarize(routing)
+    >>> routes = routing.info['vrf']['default']['address_family']['ipv4']['routes']
+    >>> routes['10.0.0.0/8']['source_protocol']
+    'bgp'
+    >>> routes.diff(previous_routes, exclude=['updated'])
+    {'added': [...], 'removed': [...], 'modified': {...}}
+
+`decolumnarize` converts the tables back to dicts, e.g. before a `Diff` of the
+whole Ops object or saving it as JSON.
+'''
+
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+# Code of the rows which do not have a value in a column
+MISSING = -1
+# Code of the rows whose value cannot be dictionary encoded (not hashable)
+OBJECT = -2
+
+# Ops tables are converted only from this number of rows
+MIN_ROWS = 1000
+
+_missing = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _flatten(value, path=()):
+    '''(path, leaf) of a row, empty dicts being leaves'''
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            yield from _flatten(item, path + (_intern(key),))
+    else:
+        yield path, value
+
+
+class _Column(object):
+    '''Values of one attribute path of the rows, dictionary encoded'''
+
+    __slots__ = ('codes', 'values', 'lookup', 'objects')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values = []
+        # (type, value) -> code, so that 1, 1.0 and True are kept apart
+        self.lookup = {}
+        # row -> value of the rows with the OBJECT code
+        self.objects = {}
+
+    def get(self, row):
+        if row >= len(self.codes):
+            return _missing
+        code = self.codes[row]
+        if code >= 0:
+            return self.values[code]
+        if code == OBJECT:
+            return self.objects[row]
+        return _missing
+
+    def set(self, row, value):
+        try:
+            key = (type(value), value)
+            code = self.lookup.get(key)
+            if code is None:
+                code = self.lookup[key] = len(self.values)
+                self.values.append(_intern(value))
+        except TypeError:
+            code = OBJECT
+            self.objects[row] = value
+        else:
+            self.objects.pop(row, None)
+        length = len(self.codes)
+        if row == length:
+            self.codes.append(code)
+            return
+        if row > length:
+            self.codes.extend([MISSING] * (row - length))
+            self.codes.append(code)
+            return
+        self.codes[row] = code
+
+    def clear(self, row):
+        if row < len(self.codes):
+            self.codes[row] = MISSING
+            self.objects.pop(row, None)
+
+    def __eq__(self, other):
+        return (self.codes == other.codes and self.values == other.values
+                and self.objects == other.objects)
+
+    def __getstate__(self):
+        return self.codes, self.values, self.objects
+
+    def __setstate__(self, state):
+        self.codes, self.values, self.objects = state
+        self.lookup = {(type(value), value): code
+                       for code, value in enumerate(self.values)}
+
+
+class ColumnarTable(MutableMapping):
+    '''Table of rows (nested dicts) stored as one column per attribute path.
+
+    Args:
+        rows (`dict`): Initial rows, {row key: row}
+    '''
+
+    def __init__(self, rows=None):
+        # Row key of each row, _missing for deleted rows
+        self._keys = []
+        # row key -> row
+        self._rows = {}
+        # attribute path -> _Column
+        self._columns = {}
+        if rows:
+            self.update(rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def __getitem__(self, key):
+        return self._get_row(self._rows[key])
+
+    def _get_row(self, row):
+        value = {}
+        for path, column in self._columns.items():
+            leaf = column.get(row)
+            if leaf is _missing:
+                continue
+            if not path:
+                # the row is not a dict
+                return leaf
+            parent = value
+            for key in path[:-1]:
+                parent = parent.setdefault(key, {})
+            parent[path[-1]] = leaf
+        return value
+
+    def __setitem__(self, key, value):
+        key = _intern(key)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = len(self._keys)
+            self._keys.append(key)
+        else:
+            for column in self._columns.values():
+                column.clear(row)
+
+        for path, leaf in _flatten(value):
+            column = self._columns.get(path)
+            if column is None:
+                column = self._columns[path] = _Column()
+            column.set(row, leaf)
+
+    def __delitem__(self, key):
+        row = self._rows.pop(key)
+        self._keys[row] = _missing
+        for column in self._columns.values():
+            column.clear(row)
+
+    def __eq__(self, other):
+        if isinstance(other, ColumnarTable):
+            if len(self) != len(other):
+                return False
+            return not any(self.diff(other).values())
+        return super().__eq__(other)
+
+    def __repr__(self):
+        return '{}({} rows, {} columns)'.format(
+            type(self).__name__, len(self), len(self._columns))
+
+    def columns(self):
+        '''Attribute paths of the rows'''
+        return list(self._columns)
+
+    def to_dict(self):
+        '''The table as a dict of rows'''
+        return {key: self._get_row(row) for key, row in self._rows.items()}
+
+    def compact(self):
+        '''Drop the storage of the deleted rows'''
+        if len(self._keys) == len(self._rows):
+            return
+        rows = self.to_dict()
+        self._keys = []
+        self._rows = {}
+        self._columns = {}
+        self.update(rows)
+
+    def diff(self, other, exclude=None):
+        '''Differences of this table with another one.
+
+        Columns holding the same codes for rows in the same order are compared
+        as arrays, the others value by value on the rows of both tables.
+
+        Args:
+            other (`ColumnarTable` or `dict`): Table to compare with
+            exclude (`list`): Attribute names to ignore, like Ops `exclude`
+
+        Returns:
+            `dict`: {'added': keys only in other,
+                     'removed': keys only in self,
+                     'modified': {key: {path: (value, other value)}}}
+                    missing values being None
+        '''
+        if not isinstance(other, ColumnarTable):
+            other = ColumnarTable(other)
+        exclude = set(exclude or [])
+
+        added = [key for key in other._rows if key not in self._rows]
+        removed = [key for key in self._rows if key not in other._rows]
+        common = [(key, row, other._rows[key])
+                  for key, row in self._rows.items() if key in other._rows]
+        same_order = self._keys == other._keys
+
+        modified = {}
+        empty = _Column()
+        for path in list(self._columns) + [path for path in other._columns
+                                           if path not in self._columns]:
+            if exclude.intersection(path):
+                continue
+            column = self._columns.get(path, empty)
+            other_column = other._columns.get(path, empty)
+            if same_order and column == other_column:
+                continue
+            for key, row, other_row in common:
+                value = column.get(row)
+                other_value = other_column.get(other_row)
+                if value is _missing and other_value is _missing:
+                    continue
+                if value is _missing or other_value is _missing or \
+                        type(value) is not type(other_value) or \
+                        value != other_value:
+                    modified.setdefault(key, {})[path] = (
+                        None if value is _missing else value,
+                        None if other_value is _missing else other_value)
+
+        return {'added': added, 'removed': removed, 'modified': modified}
+
+    def __getstate__(self):
+        self.compact()
+        return self._keys, self._columns
+
+    def __setstate__(self, state):
+        self._keys, self._columns = state
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+
+def _tables(data, path):
+    '''(parent, key) of the dicts at `path` of nested dicts, '*' matching
+    every key'''
+    if not path or not isinstance(data, Mapping):
+        return
+    keys = list(data) if path[0] == '*' else [path[0]]
+    for key in keys:
+        if key not in data:
+            continue
+        if len(path) == 1:
+            yield data, key
+        else:
+            yield from _tables(data[key], path[1:])
+
+
+def columnarize(ops, tables=None, min_rows=MIN_ROWS):
+    '''Store the large tables of an Ops object as `ColumnarTable`.
+
+    Args:
+        ops (`obj`): Learned Ops object
+        tables (`list`): Paths of the tables, the first item being the Ops
+            attribute and '*' matching every key. Defaults to the
+            `columnar_tables` of the Ops object
+        min_rows (`int`): Tables with fewer rows are kept as dicts
+
+    Returns:
+        `int`: Number of tables converted
+    '''
+    if tables is None:
+        tables = getattr(ops, 'columnar_tables', [])
+    converted = 0
+    for path in tables:
+        data = getattr(ops, path[0], None)
+        for parent, key in _tables(data, path[1:]):
+            table = parent[key]
+            if isinstance(table, dict) and len(table) >= min_rows:
+                parent[key] = ColumnarTable(table)
+                converted += 1
+    return converted
+
+
+def decolumnarize(data):
+    '''Convert back the `ColumnarTable` of an Ops object or of nested dicts.
+
+    Returns:
+        `data`, with dicts in place of the tables
+    '''
+    if isinstance(data, ColumnarTable):
+        return data.to_dict()
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, (dict, ColumnarTable)):
+                data[key] = decolumnarize(value)
+        return data
+    for name, value in vars(data).items():
+        if isinstance(value, (dict, ColumnarTable)):
+            setattr(data, name, decolumnarize(value))
+    return data
@@ -0,0 +1,187 @@
+'''Per-device command output cache shared by Ops objects.
+
+Ops features learned in the same window (bgp, routing, vrf, interface, ...)
+often run the same `show` commands. While an `OpsOutputCache` is active on a
+device, the raw output of every `show` command executed on it is kept for
+`ttl` seconds and returned to any Ops object (or parser) asking for the same
+command again.
+
+Example::
+
+    >>> from genie.libs.ops.utils.output_cache import OpsOutputCache
+    >>> with OpsOutputCache(device, ttl=60):
+    ...     bgp = device.learn('bgp')
+    ...     routing = device.learn('routing')
+
+Ops learners with per-neighbor command fan-out (e.g. iosxe Bgp) use
+`prefetch` to fetch those commands up front, either as a single batched
+`execute` call (`fanout='batch'`, default) or concurrently from threads
+(`fanout='concurrent'`). Commands are only sent concurrently when the device
+connection is a connection pool, other connections are a single session
+which would interleave the outputs, so they are batched instead.
+'''
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Genie
+from genie.libs.sdk.libs.utils.connection import is_connection_pool
+
+log = logging.getLogger(__name__)
+
+
+class OpsOutputCache(object):
+    '''TTL-scoped cache of raw command outputs for one device.'''
+
+    # Attribute of the device holding the active cache
+    DEVICE_ATTR = '_ops_output_cache'
+
+    def __init__(self, device, ttl=30, fanout='batch', cacheable=None):
+        '''
+        Args:
+            device (`obj`): Device object
+            ttl (`int`): Seconds an output stays valid. Default to 30
+            fanout (`str`): How `prefetch` runs commands, 'batch' (one
+                execute call with all commands) or 'concurrent' (one thread
+                per pool worker, batched when the device connection is not
+                a connection pool). Default to 'batch'
+            cacheable (`callable`): Predicate deciding whether a command's
+                output may be cached. Default to commands starting with 'show'
+        '''
+        if fanout not in ('batch', 'concurrent'):
+            raise ValueError("fanout must be 'batch' or 'concurrent', "
+                             "not {!r}".format(fanout))
+        self.device = device
+        self.ttl = ttl
+        self.fanout = fanout
+        self.cacheable = cacheable or self._is_show_command
+        self.hits = 0
+        self.misses = 0
+        self._outputs = {}
+        self._lock = threading.Lock()
+        self._execute = None
+        self._patched = False
+
+    @staticmethod
+    def _is_show_command(command):
+        return command.strip().startswith('show')
+
+    @classmethod
+    def get(cls, device):
+        '''Return the cache active on `device`, or None.'''
+        return getattr(device, cls.DEVICE_ATTR, None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        '''Activate the cache: executions on the device go through it.'''
+        if self.get(self.device) is not None:
+            raise RuntimeError('An Ops output cache is already active on '
+                               'device {}'.format(self.device.name))
+        # Keep what was set on the instance (e.g. a mock) to restore it
+        self._patched = 'execute' in vars(self.device)
+        self._execute = self.device.execute
+        self.device.execute = self.execute
+        setattr(self.device, self.DEVICE_ATTR, self)
+        return self
+
+    def stop(self):
+        '''Deactivate the cache and drop all outputs.'''
+        if self._patched:
+            self.device.execute = self._execute
+        else:
+            try:
+                del self.device.execute
+            except AttributeError:
+                pass
+        if self.get(self.device) is self:
+            delattr(self.device, self.DEVICE_ATTR)
+        log.debug('Ops output cache on {}: {} hits, {} misses'.format(
+            self.device.name, self.hits, self.misses))
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._outputs.clear()
+
+    def lookup(self, command):
+        '''Return the cached output of `command`, or None if expired or not
+        cached.'''
+        with self._lock:
+            try:
+                timestamp, output = self._outputs[command]
+            except KeyError:
+                return None
+            if time.monotonic() - timestamp > self.ttl:
+                del self._outputs[command]
+                return None
+            return output
+
+    def store(self, command, output):
+        if isinstance(command, str) and self.cacheable(command):
+            with self._lock:
+                self._outputs[command] = (time.monotonic(), output)
+
+    def execute(self, command, *args, **kwargs):
+        '''Drop-in replacement of `device.execute`.'''
+        if not isinstance(command, str) or not self.cacheable(command):
+            return self._execute(command, *args, **kwargs)
+
+        output = self.lookup(command)
+        if output is not None:
+            self.hits += 1
+            return output
+
+        self.misses += 1
+        output = self._execute(command, *args, **kwargs)
+        self.store(command, output)
+        return output
+
+    def prefetch(self, commands):
+        '''Execute the commands not already cached, according to `fanout`,
+        and cache their outputs.
+
+        Args:
+            commands (`list`): Commands to execute
+
+        Returns:
+            `list` of commands that were executed
+        '''
+        missing = []
+        for command in commands:
+            if command not in missing and self.lookup(command) is None:
+                missing.append(command)
+        if not missing:
+            return missing
+
+        fanout = self.fanout
+        if fanout == 'concurrent' and not is_connection_pool(self.device):
+            log.warning('The connection to {} is not a connection pool, '
+                        'batching the commands'.format(self.device.name))
+            fanout = 'batch'
+
+        log.debug('Prefetching {} commands on {} ({})'.format(
+            len(missing), self.device.name, fanout))
+        if fanout == 'concurrent' and len(missing) > 1:
+            alias = getattr(self.device, 'default_connection_alias',
+                            'default')
+            workers = getattr(getattr(self.device, alias), 'size', None)
+            with ThreadPoolExecutor(
+                    max_workers=min(len(missing), workers or len(missing))) \
+                    as executor:
+                outputs = dict(zip(missing,
+                                   executor.map(self._execute, missing)))
+        else:
+            outputs = self._execute(missing)
+            if not isinstance(outputs, dict):
+                # Single command returns the output itself
+                outputs = {missing[0]: outputs}
+        for command, output in outputs.items():
+            self.store(command, output)
+        return missing
@@ -1,8 +1,10 @@
 import re
 import os
 import logging
+import json
 import importlib
 from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 from collections import namedtuple
 
 from robot.api.deco import keyword
@@ -27,6 +29,9 @@ from genie.harness.datafile.loader import TriggerdatafileLoader,\
 
 log = logging.getLogger(__name__)
 
+# Index of the shards of a profile saved as a directory
+PROFILE_INDEX = 'profile.json'
+
 
 class GenieRobotException(Exception):
     pass
@@ -535,37 +540,82 @@ class GenieRobot(object):
 
     def _profile_the_system(self, feature, device, context, name, alias):
         '''Profile system as per the provided features on the devices
-        '''
-        profiled = {}
-
-        for dev in device.split(';'):
-
-            for fet in feature.split(';'):
 
-                if fet not in profiled:
-                    profiled[fet] = {}
-                if dev not in profiled[fet]:
-                    profiled[fet][dev] = {}
+        Devices are profiled concurrently; the features of one device are
+        learnt one after the other over its connection. The profile is saved
+        as shards when `name` is a directory, or ends with '/', as a pickle
+        file when `name` is a file of an existing directory, otherwise as a
+        variable.
+        '''
+        # a device is profiled once, even if listed twice
+        devices = list(dict.fromkeys(device.split(';')))
+        features = feature.split(';')
 
+        def _profile_device(dev):
+            learnt = {}
+            for fet in features:
                 if fet == 'config':
                     log.info("Start learning device configuration")
-                    profiled[fet][dev] = self._profile_config(dev)
+                    learnt[fet] = self._profile_config(dev)
                 else:
                     log.info("Start learning feature {f}".format(f=fet))
-                    learnt_feature = self.genie_ops_on_device_alias_context(
+                    learnt[fet] = self.genie_ops_on_device_alias_context(
                         feature=fet.strip(), alias=None, device=dev)
+            return learnt
 
-                    profiled[fet][dev] = learnt_feature
-
+        with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+            results = list(executor.map(_profile_device, devices))
 
-        if os.path.isdir(os.path.dirname(name)):
+        profiled = {}
+        for dev, learnt in zip(devices, results):
+            for fet, value in learnt.items():
+                profiled.setdefault(fet, {})[dev] = value
+
+        if os.path.isdir(name) or name.endswith('/'):
+            # the user provided a directory to save the profile shards
+            self._save_profile(profiled, name)
+            log.info('Saved system profile in directory: %s' % name)
+        elif os.path.isdir(os.path.dirname(name)):
             # the user provided a file to save as pickle
-            pickle_file = pickle(profiled, pts_name = name)
+            pickle_file = pickle(profiled, pts_name=name)
             log.info('Saved system profile as file: %s' % pickle_file)
         else:
             self.testscript.parameters[name] = profiled
             log.info('Saved system profile as variable %s' % name)
 
+    def _save_profile(self, profiled, name):
+        '''Save a profile as one pickle file per feature and device, listed
+        in an index, so comparisons only load the devices they need.
+        '''
+        os.makedirs(name, exist_ok=True)
+        index = {}
+        for fet, devices in profiled.items():
+            fet_dir = os.path.join(name, re.sub(r'\W', '_', fet))
+            os.makedirs(fet_dir, exist_ok=True)
+            for dev, value in devices.items():
+                shard = pickle(value, pts_name=os.path.join(
+                    fet_dir, re.sub(r'\W', '_', dev)))
+                index.setdefault(fet, {})[dev] = os.path.relpath(shard, name)
+
+        with open(os.path.join(name, PROFILE_INDEX), 'w') as f:
+            json.dump(index, f, indent=2)
+
+    def _load_profile(self, pts, devices):
+        '''Load the features of the given devices from a profile directory,
+        a profile file or a profile variable.
+        '''
+        index_file = os.path.join(pts, PROFILE_INDEX)
+        if os.path.isfile(index_file):
+            with open(index_file) as f:
+                index = json.load(f)
+            # Only load the shards of the specified devices
+            return {fet: {dev: unpickle(os.path.join(pts, shard))
+                          for dev, shard in shards.items() if dev in devices}
+                    for fet, shards in index.items()}
+        if os.path.isfile(pts):
+            return unpickle(pts)
+        return self.testscript.parameters[pts]
+
     def _profile_config(self, device):
         device_handle = self._search_device(device)
         config = Config(device_handle.execute('show running-config'))
@@ -577,17 +627,8 @@ class GenieRobot(object):
     def compare_profile(self, pts, pts_compare, devices):
         '''Compare system profiles taken as snapshots during the run'''
 
-        if os.path.isfile(pts):
-            compare1 = unpickle(pts)
-        else:
-            compare1 = self.testscript.parameters[pts]
-
-        if os.path.isfile(pts_compare):
-            compare2 = unpickle(pts_compare)
-        else:
-            compare2 = self.testscript.parameters[pts_compare]
-
-
+        compare1 = self._load_profile(pts, devices)
+        compare2 = self._load_profile(pts_compare, devices)
 
         exclude_list = [
             'device', 'maker', 'diff_ignore', 'callables',
@@ -1,3 +1,5 @@
+import threading
+
 from genie.conf.base import API
 from robot.libraries.BuiltIn import BuiltIn
 
@@ -6,17 +8,78 @@ log = logging.getLogger(__name__)
 
 DOC_LINK = 'https://pubhub.devnetcloud.com/media/genie-feature-browser/docs/#/apis/'
 
+PYATS_LIBRARIES = ('pyats.robot.pyATSRobot', 'ats.robot.pyATSRobot')
+
+
+class ApiRegistry:
+    '''API index shared by all the GenieRobotApis instances of the process.
+
+    Building `API()` indexes every API function, which is too slow to do for
+    each test case. The index is built on first use, and the function
+    resolved for an API name and a device abstraction is kept.
+    '''
+
+    def __init__(self):
+        self._api = None
+        self._lock = threading.Lock()
+        # (name, os, platform, model) -> function
+        self._functions = {}
+
+    @property
+    def api(self):
+        if self._api is None:
+            with self._lock:
+                if self._api is None:
+                    self._api = API()
+        return self._api
+
+    def keyword_names(self):
+        return self.api.function_data.keys()
+
+    def get_function(self, name, device=None):
+        if device is None:
+            key = (name, None, None, None)
+        else:
+            key = (name, getattr(device, 'os', None),
+                   getattr(device, 'platform', None),
+                   getattr(device, 'model', None))
+        try:
+            return self._functions[key]
+        except KeyError:
+            pass
+
+        if device is None:
+            function = self.api.get_api(name)
+        else:
+            function = self.api.get_api(name, device)
+        self._functions[key] = function
+        return function
+
+    def clear(self):
+        with self._lock:
+            self._api = None
+            self._functions.clear()
+
+
+registry = ApiRegistry()
+
 
 class GenieRobotApis:
 
     ROBOT_LIBRARY_SCOPE = "TEST CASE"
 
+    # pyATS library name found by the first keyword call
+    _pyats_library = None
+
     def __init__(self):
         self.builtin = BuiltIn()
-        self.api = API()
+
+    @property
+    def api(self):
+        return registry.api
 
     def get_keyword_names(self):
-        return self.api.function_data.keys()
+        return registry.keyword_names()
 
     def get_keyword_documentation(self, kw):
         if kw == '__intro__':
@@ -26,28 +89,35 @@ class GenieRobotApis:
         
         ''', DOC_LINK, kw])
 
-    def run_keyword(self, name, args, kwargs):
-        try:
+    def _get_pyats_library(self):
+        cls = type(self)
+        if cls._pyats_library is not None:
+            return self.builtin.get_library_instance(cls._pyats_library)
+
+        for name in PYATS_LIBRARIES:
             try:
-                self.builtin.get_library_instance('pyats.robot.pyATSRobot')
-                ats_pyats = 'pyats.robot.pyATSRobot'
+                library = self.builtin.get_library_instance(name)
             except RuntimeError:
-                self.builtin.get_library_instance('ats.robot.pyATSRobot')
-                ats_pyats = 'ats.robot.pyATSRobot'
-            except RuntimeError:
-                # No pyATS
-                pass
+                continue
+            cls._pyats_library = name
+            return library
+        # No pyATS
+        raise RuntimeError('No pyATS library found')
 
-            self.testbed = self.builtin.get_library_instance(ats_pyats).testbed
+    def run_keyword(self, name, args, kwargs):
+        try:
+            self.testbed = self._get_pyats_library().testbed
             device_name = kwargs.get('device')
+            api_name = name.strip().replace(' ', '_')
 
             # if function takes device, pass device, if no then dont pass
             if device_name:
                 device_handler = self._search_device(device_name)
                 kwargs.pop('device', None)
-                return self.api.get_api(name.strip().replace(' ', '_'), device_handler)(device_handler, *args, **kwargs)
+                return registry.get_function(api_name, device_handler)(
+                    device_handler, *args, **kwargs)
             else:
-                return self.api.get_api(name.strip().replace(' ', '_'))(*args, **kwargs)
+                return registry.get_function(api_name)(*args, **kwargs)
         except RuntimeError:
             # No GenieRobot
             log.error('No testbed is found, did you import "genie.libs.robot.GenieRobot"?')
@@ -3,6 +3,7 @@ import shutil
 import tempfile
 import unittest
 import subprocess
+from unittest.mock import Mock, patch
 
 
 class TestGenieRobot(unittest.TestCase):
@@ -53,3 +54,56 @@ class TestGenieRobot(unittest.TestCase):
         from robot.libdoc import LibraryDocumentation
         lib = LibraryDocumentation('genie.libs.robot.GenieRobot')
         assert len(lib.keywords)
+
+
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        from genie.libs.robot.GenieRobot import GenieRobot
+        self.directory = tempfile.mkdtemp(prefix='profile')
+        self.addCleanup(shutil.rmtree, self.directory)
+        # outside of a robot run, the library is not bound to pyATS
+        self.robot = GenieRobot()
+        self.robot._genie_testscript = Mock(parameters={})
+        patcher = patch.object(
+            GenieRobot, 'genie_ops_on_device_alias_context',
+            side_effect=lambda feature, alias, device: {feature: device})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def profile(self, name):
+        self.robot.profile_system('bgp;ospf', 'R1;R2', name)
+
+    def test_profile_directory(self):
+        name = os.path.join(self.directory, 'pre') + '/'
+        self.profile(name)
+
+        self.assertTrue(os.path.isfile(os.path.join(name, 'profile.json')))
+        self.assertEqual(self.robot._load_profile(name, 'R1;R2'),
+                         {'bgp': {'R1': {'bgp': 'R1'}, 'R2': {'bgp': 'R2'}},
+                          'ospf': {'R1': {'ospf': 'R1'},
+                                   'R2': {'ospf': 'R2'}}})
+        # only the shards of the requested devices are loaded
+        self.assertEqual(self.robot._load_profile(name, 'R2'),
+                         {'bgp': {'R2': {'bgp': 'R2'}},
+                          'ospf': {'R2': {'ospf': 'R2'}}})
+
+    def test_profile_file(self):
+        name = os.path.join(self.directory, 'pre')
+        self.profile(name)
+
+        # a single pickle file
+        pickle_file, = os.listdir(self.directory)
+        pickle_file = os.path.join(self.directory, pickle_file)
+        self.assertTrue(os.path.isfile(pickle_file))
+        self.assertEqual(self.robot._load_profile(pickle_file, 'R1'),
+                         {'bgp': {'R1': {'bgp': 'R1'}, 'R2': {'bgp': 'R2'}},
+                          'ospf': {'R1': {'ospf': 'R1'},
+                                   'R2': {'ospf': 'R2'}}})
+
+    def test_profile_variable(self):
+        self.profile('pre')
+        self.assertEqual(self.robot._load_profile('pre', 'R1'),
+                         self.robot.testscript.parameters['pre'])
+        self.assertEqual(self.robot.testscript.parameters['pre']['bgp'],
+                         {'R1': {'bgp': 'R1'}, 'R2': {'bgp': 'R2'}})
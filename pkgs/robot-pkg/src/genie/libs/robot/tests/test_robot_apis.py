@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from genie.libs.robot import GenieRobotApis as robot_apis
+
+
+class TestGenieRobotApis(unittest.TestCase):
+
+    def setUp(self):
+        robot_apis.registry.clear()
+        self.addCleanup(robot_apis.registry.clear)
+        self.addCleanup(patch.stopall)
+        self.api_class = patch.object(robot_apis, 'API').start()
+        self.api = self.api_class.return_value
+
+        builtin = patch.object(robot_apis, 'BuiltIn').start()
+        self.device = Mock(os='iosxe', platform='cat9k', model=None)
+        builtin.return_value.get_library_instance.return_value.testbed.\
+            devices = {'R1': self.device}
+
+    def test_registry_shared(self):
+        self.api.function_data = {'get_platform_type': {}}
+        libraries = [robot_apis.GenieRobotApis() for _ in range(3)]
+        for library in libraries:
+            self.assertEqual(list(library.get_keyword_names()),
+                             ['get_platform_type'])
+        self.api_class.assert_called_once_with()
+
+    def test_run_keyword_function_cached(self):
+        function = self.api.get_api.return_value
+        for _ in range(3):
+            library = robot_apis.GenieRobotApis()
+            library.run_keyword('get platform type', [], {'device': 'R1'})
+        self.api.get_api.assert_called_once_with('get_platform_type',
+                                                 self.device)
+        self.assertEqual(function.call_count, 3)
+        function.assert_called_with(self.device)
+
+        other = Mock(os='nxos', platform=None, model=None)
+        library.testbed.devices['R2'] = other
+        library.run_keyword('get platform type', [], {'device': 'R2'})
+        self.api.get_api.assert_called_with('get_platform_type', other)
+        self.assertEqual(self.api.get_api.call_count, 2)
+
+    def test_run_keyword_without_device(self):
+        library = robot_apis.GenieRobotApis()
+        library.run_keyword('get_list_items', [[1, 2]], {})
+        self.api.get_api.assert_called_once_with('get_list_items')
+        self.api.get_api.return_value.assert_called_once_with([1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
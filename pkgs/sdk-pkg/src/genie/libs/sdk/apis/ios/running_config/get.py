@@ -55,7 +55,7 @@ def get_running_config_dict(device, option=None):
             "on device {device}".format(device=device.name)
         )
 
-    config_dict = get_config_dict(out)
+    config_dict = get_config_dict(out, device=device, command=cmd)
     return config_dict
 
 
@@ -9,6 +9,7 @@ from pyats.easypy import runtime
 from genie.metaparser.util.exceptions import (SchemaEmptyParserError,
                                               InvalidCommandError)
 from genie.libs.parser.iosxe.show_logging import ShowLogging
+from genie.libs.sdk.libs.utils.dq_index import PathIndex
 
 # Logger
 log = logging.getLogger(__name__)
@@ -66,6 +67,8 @@ def health_cpu(device,
         return None
 
     if processes:
+        # index the output once for all the processes
+        parsed_q = PathIndex(parsed).q
         for ps_item in processes:
             # To get process id based on check_key
             # {
@@ -75,7 +78,7 @@ def health_cpu(device,
             #       "process": "Chunk Manager",
             #       (snip)
             #       "five_sec_cpu": 0.0,
-            indexes = parsed.q.contains_key_value(
+            indexes = parsed_q.contains_key_value(
                 'process', ps_item, value_regex=True).get_values('sort')
             for index in indexes:
                 cpu_load_dict.update({
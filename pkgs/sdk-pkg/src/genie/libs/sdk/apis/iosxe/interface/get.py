@@ -11,6 +11,7 @@ from ipaddress import IPv4Network, IPv4Address
 from unicon.core.errors import SubCommandFailure
 
 # pyATS
+from pyats.async_ import pcall
 from pyats.easypy import runtime
 from pyats.utils.objects import find, R
 from pyats.datastructures.logic import Not
@@ -817,77 +818,126 @@ def get_interface_address_mask_running_config(device, interface, address_family=
             return ip_address, mask
 
 
-def get_interface_packet_output_rate(device, interface, seconds=60, field='out_pkts'):
-    """ Get rate from out_pkts by taking average across the defined seconds
+def get_interface_packet_rates(device, interfaces=None, seconds=60,
+                               fields=('in_pkts', 'out_pkts'), devices=None):
+    """ Get packet rates of interfaces, from two 'show interfaces' snapshots
+        taken at the same time on every device
 
         Args:
             device ('obj'): Device object
-            interface ('str'): Interface name
-            seconds ('int'): Seconds to wait between show commands
-            field ('str'): Used for get_interface_packet_input_rate
+            interfaces ('list'): Interface names, all the interfaces if None
+            seconds ('int'): Seconds to wait between the two snapshots
+            fields ('list'): Counter fields to compute rates for
+            devices ('list'): Names of the devices to sample along with
+                              device, default to device only
 
         Returns:
-            Traffic rate
+            Rate table, None for a rate that could not be computed:
+            {
+                device name: {
+                    interface: {
+                        field: rate,
+                    },
+                },
+            }
 
-            if any error return None
-            - to separate rate 0.0 and None value
+            Devices whose output could not be parsed have an empty table.
 
         Raises:
             None
     """
 
     if seconds <= 0:
-        return
+        return {}
 
-    try:
+    device_list = [device] + [device.testbed.devices[dev]
+                              for dev in dict.fromkeys(devices or [])
+                              if dev != device.name]
 
-        before_time = int(time.time())
-        output_before = device.execute(
-            "show interfaces {intf}".format(intf=interface)
-        )
+    # One interface is sampled on its own, otherwise take the full output
+    if interfaces and len(interfaces) == 1:
+        command = "show interfaces {intf}".format(intf=interfaces[0])
+    else:
+        command = "show interfaces"
 
-        log.info("Waiting {secs} seconds".format(secs=seconds))
-        time.sleep(seconds)
+    def _snapshot(device, command):
+        return int(time.time()), device.execute(command)
 
-        after_time = int(time.time())
-        output_after = device.execute(
-            "show interfaces {intf}".format(intf=interface)
-        )
+    def _snapshots():
+        if len(device_list) == 1:
+            return [_snapshot(device=device_list[0], command=command)]
+        return pcall(_snapshot,
+                     ckwargs={'command': command},
+                     ikwargs=[{'device': dev} for dev in device_list])
 
-        parsed_output_before = device.parse(
-            "show interfaces {intf}".format(intf=interface),
-            output=output_before,
-        )
-        parsed_output_after = device.parse(
-            "show interfaces {intf}".format(intf=interface),
-            output=output_after,
-        )
+    snapshots_before = _snapshots()
+
+    log.info("Waiting {secs} seconds".format(secs=seconds))
+    time.sleep(seconds)
+
+    snapshots_after = _snapshots()
+
+    table = {}
+    for dev, (before_time, output_before), (after_time, output_after) in \
+            zip(device_list, snapshots_before, snapshots_after):
+        table[dev.name] = dev_table = {}
+        try:
+            parsed_output_before = dev.parse(command, output=output_before)
+            parsed_output_after = dev.parse(command, output=output_after)
+        except (SchemaEmptyParserError, ValueError):
+            log.error("Could not parse '{cmd}' on {dev}".format(
+                cmd=command, dev=dev.name))
+            continue
 
         delta_time = after_time - before_time
+        for interface in (interfaces or parsed_output_after):
+            dev_table[interface] = rates = {}
+            name = interface
+            if name not in parsed_output_after:
+                name = Common.convert_intf_name(interface)
+            counters_before = parsed_output_before.get(name, {}).get('counters', {})
+            counters_after = parsed_output_after.get(name, {}).get('counters', {})
+            for field in fields:
+                counter_before = counters_before.get(field)
+                counter_after = counters_after.get(field)
+                if counter_before is None or counter_after is None \
+                        or not delta_time:
+                    rates[field] = None
+                    continue
+                rates[field] = round(
+                    (counter_after - counter_before) / delta_time, 2)
 
-        counter_before = get_interface_packet_counter(
-            device=device,
-            interface=interface,
-            counter_field=field,
-            output=parsed_output_before,
-        )
-        if counter_before is None:
-            return
+    return table
 
-        counter_after = get_interface_packet_counter(
-            device=device,
-            interface=interface,
-            counter_field=field,
-            output=parsed_output_after,
-        )
-        if counter_after is None:
-            return
 
-        rate = round((counter_after - counter_before) / delta_time, 2)
+def get_interface_packet_output_rate(device, interface, seconds=60, field='out_pkts'):
+    """ Get rate from out_pkts by taking average across the defined seconds
 
-    except SchemaEmptyParserError as e:
+        Args:
+            device ('obj'): Device object
+            interface ('str'): Interface name
+            seconds ('int'): Seconds to wait between show commands
+            field ('str'): Used for get_interface_packet_input_rate
+
+        Returns:
+            Traffic rate
+
+            if any error return None
+            - to separate rate 0.0 and None value
+
+        Raises:
+            None
+    """
+
+    if seconds <= 0:
         return
-    except ValueError as e:
+
+    table = get_interface_packet_rates(device=device,
+                                       interfaces=[interface],
+                                       seconds=seconds,
+                                       fields=[field])
+    rate = table.get(device.name, {}).get(interface, {}).get(field)
+    if rate is None:
         return
 
     if 'out_pkts' in field:
@@ -975,12 +1025,15 @@ def get_interface_netmask(ip_address):
             return e[0]
 
 
-def get_interface_port_channel_members(device, interface):
+def get_interface_port_channel_members(device, interface, bulk=False, max_age=10):
     """ Get interface members
 
         Args:
             device ('obj'): Device object
             interface ('str'): interface to search member for
+            bulk ('bool'): Use the parsed 'show interfaces' of all the
+                           interfaces, see get_interfaces_parsed_output
+            max_age ('int'): Seconds a previous bulk parse is reused
 
         Returns:
             interface members
@@ -988,29 +1041,88 @@ def get_interface_port_channel_members(device, interface):
         Raises:
             None
     """
-    try:
-        out = device.parse("show interfaces {}".format(interface))
-    except SchemaEmptyParserError:
-        return
+    if bulk:
+        out = get_interfaces_parsed_output(device, max_age=max_age)
+    else:
+        try:
+            out = device.parse("show interfaces {}".format(interface))
+        except SchemaEmptyParserError:
+            return
 
     try:
         return out[interface]["port_channel"]["port_channel_member_intfs"]
     except KeyError:
         return
 
-def get_interface_information(device, interface_list):
+# Attribute of the device holding its last parsed 'show interfaces'
+_SHOW_INTERFACES_CACHE = '_show_interfaces_cache'
+
+
+def get_interfaces_parsed_output(device, max_age=10):
+    """ Get parsed 'show interfaces' for all the interfaces, reused by the
+        bulk interface getters for max_age seconds
+
+        Args:
+            device ('obj'): Device object
+            max_age ('int'): Seconds a previous parse of the device is reused,
+                             0 to always parse. Default to 10
+        Returns:
+            Parsed output, {} if empty
+    """
+    cached = getattr(device, _SHOW_INTERFACES_CACHE, None)
+    if cached and time.monotonic() - cached[0] <= max_age:
+        return cached[1]
+
+    try:
+        out = device.parse('show interfaces')
+    except SchemaEmptyParserError:
+        out = {}
+    setattr(device, _SHOW_INTERFACES_CACHE, (time.monotonic(), out))
+    return out
+
+
+def _get_bulk_interface_output(device, interface, max_age):
+    """ Get the 'show interfaces <interface>' part of the bulk output,
+        None if the interface is not found
+    """
+    out = get_interfaces_parsed_output(device, max_age=max_age)
+    return _find_interface_output(out, interface)
+
+
+def _find_interface_output(out, interface):
+    """ Get the 'show interfaces <interface>' part of a parsed
+        'show interfaces', None if the interface is not found
+    """
+    for name in (interface, Common.convert_intf_name(interface)):
+        if name in out:
+            return {name: out[name]}
+
+
+def get_interface_information(device, interface_list, bulk=False, max_age=10):
     """ Get interface information from device for a list of interfaces
 
         Args:
             List['string']: Interfaces to query information on
             device ('obj'): Device object
+            bulk ('bool'): Parse 'show interfaces' once for all the
+                           interfaces instead of once per interface
+            max_age ('int'): Seconds a previous bulk parse is reused
         Returns:
             List containing Dictionaries for sucesses
     """
     results = {}
     empty_ints = []
 
+    if bulk:
+        out = get_interfaces_parsed_output(device, max_age=max_age)
+
     for interface in interface_list:
+        if bulk:
+            data = _find_interface_output(out, interface)
+            if data is None:
+                empty_ints.append(interface)
+            results[interface] = data
+            continue
         try:
             data = device.parse('show interfaces ' + interface)
         except SchemaEmptyParserError:
@@ -1022,22 +1134,31 @@ def get_interface_information(device, interface_list):
 
     return results
 
-def get_interface_ipv4_address(device, interface):
+def get_interface_ipv4_address(device, interface, bulk=False, max_age=10):
     """Get the ip address for an interface on target device
 
         Args:
             interface ('string'): interface to get address for
             device: ('obj'): Device Object
+            bulk ('bool'): Use the parsed 'show interfaces' of all the
+                           interfaces, see get_interfaces_parsed_output
+            max_age ('int'): Seconds a previous bulk parse is reused
         Returns:
             None
             String with interface ip address
     """
 
-    try:
-        data = device.parse('show interfaces ' + interface)
-    except SchemaEmptyParserError as e:
-        log.error('No interface information found for {}: {}'.format(interface, e))
-        return None
+    if bulk:
+        data = _get_bulk_interface_output(device, interface, max_age)
+        if data is None:
+            log.error('No interface information found for {}'.format(interface))
+            return None
+    else:
+        try:
+            data = device.parse('show interfaces ' + interface)
+        except SchemaEmptyParserError as e:
+            log.error('No interface information found for {}: {}'.format(interface, e))
+            return None
 
     interface = Common.convert_intf_name(interface)
 
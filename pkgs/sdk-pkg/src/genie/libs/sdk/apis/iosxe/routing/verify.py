@@ -13,6 +13,7 @@ from pyats.utils.objects import find, R
 from genie.libs.sdk.apis.iosxe.routing import util as util
 from genie.utils.timeout import Timeout
 from genie.libs.sdk.libs.utils.normalize import GroupKeys
+from genie.libs.sdk.libs.utils.poller import wait_for_parsed
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 
 # BGP
@@ -775,27 +776,21 @@ def verify_route_known_via(device, route, known_via, ipv6=False, max_time=90, ch
             '(.*{}.*)'.format(known_via),
         ]
     )
-    timeout = Timeout(max_time, check_interval)
+    if ipv6:
+        command = 'show ipv6 route {}'.format(route)
+    else:
+        command = 'show ip route {}'.format(route)
 
-    while timeout.iterate():
-        out = None
-        try:
-            if ipv6:
-                out = device.parse('show ipv6 route {}'.format(route))
-            else:
-                out = device.parse('show ip route {}'.format(route))
-        except Exception:
-            timeout.sleep()
-            continue
+    def _route_known_via(out):
         if not out:
             log.info('Could not get information about show ip route {}'.format(route))
-            timeout.sleep()
-            continue        
-        found = find([out], reqs, filter_=False, all_keys=True)
-        if found:
-            return True
-        timeout.sleep()
-    return False
+            return False
+        return bool(find([out], reqs, filter_=False, all_keys=True))
+
+    # Polls through the command poller of the device when one is active
+    return wait_for_parsed(device, command, _route_known_via,
+                           max_time=max_time, check_interval=check_interval,
+                           ignore=(Exception,))
 
 def verify_cef_labels(device, route, expected_first_label, expected_last_label=None, max_time=90, 
     check_interval=10):
@@ -13,6 +13,7 @@ from genie.utils import Dq
 # Genie
 from genie.utils.timeout import Timeout
 from genie.libs.sdk.libs.utils.normalize import GroupKeys
+from genie.libs.sdk.libs.utils.poller import wait_for_parsed
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 
 # BGP
@@ -313,48 +314,37 @@ def verify_routing_ip_exist(device,
             None
 
     """
-    
-    timeout = Timeout(max_time, check_interval)
-    while timeout.iterate():
-        out = None
-        try:
-            if extensive:
-                if exact:
-                    out = device.parse(
-                        'show route extensive {destination_address} exact'.
-                        format(destination_address=destination_address))
-                else:
-                    out = device.parse(
-                        'show route extensive {destination_address}'.format(
-                            destination_address=destination_address))
-            elif extensive_protocol:
-                out = device.parse(
-                    'show route protocol {protocol} extensive'.format(protocol=protocol))
 
-            elif protocol:
-                if protocol_type and command_address:
-                    out = device.parse(
-                        'show route {protocol_type}-protocol {protocol} {command_address}'.
-                        format(protocol_type=protocol_type,
-                               protocol=protocol,
-                               command_address=command_address))
-                else:
-                    out = device.parse(
-                        'show route protocol {protocol}'.format(protocol=protocol))
-            else:
-                out = device.parse('show route')
+    if extensive:
+        if exact:
+            command = 'show route extensive {destination_address} exact'.\
+                format(destination_address=destination_address)
+        else:
+            command = 'show route extensive {destination_address}'.format(
+                destination_address=destination_address)
+    elif extensive_protocol:
+        command = 'show route protocol {protocol} extensive'.format(
+            protocol=protocol)
+    elif protocol:
+        if protocol_type and command_address:
+            command = 'show route {protocol_type}-protocol {protocol} {command_address}'.\
+                format(protocol_type=protocol_type,
+                       protocol=protocol,
+                       command_address=command_address)
+        else:
+            command = 'show route protocol {protocol}'.format(protocol=protocol)
+    else:
+        command = 'show route'
 
-        except SchemaEmptyParserError:
-            timeout.sleep()
-            continue
+    def _routing_ip_exist(out):
         rt_list = Dq(out).get_values("rt")
-        
+
         for rt_dict in rt_list:
             rt_destination_ = Dq(rt_dict).get_values("rt-destination", 0)
 
             if not rt_destination_ or not rt_destination_.startswith(str(destination_address)):
                 continue
-            
+
             if metric:
                 destination_metric = Dq(rt_dict).get_values("metric", [0])
                 if destination_metric != str(metric):
@@ -364,11 +354,13 @@ def verify_routing_ip_exist(device,
                 via_ = Dq(rt_dict).get_values("via", 0)
                 if not via_.startswith(known_via):
                     continue
-            
+
             return True
-        timeout.sleep()
+        return False
 
-    return False
+    # Polls through the command poller of the device when one is active
+    return wait_for_parsed(device, command, _routing_ip_exist,
+                           max_time=max_time, check_interval=check_interval)
 
 
 def verify_default_route_protocol(device,
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 from pyats.topology import loader
 from genie.libs.sdk.apis.iosxe.interface.get import get_interface_information
 
@@ -105,3 +106,17 @@ class TestGetInterfaceInformation(unittest.TestCase):
                                            'txload': '1/255',
                                            'type': 'CSR vNIC'}}}
         self.assertEqual(result, expected_output)
+
+    def test_get_interface_information_bulk(self):
+        with patch.object(self.device, 'parse',
+                          wraps=self.device.parse) as parse:
+            result = get_interface_information(
+                self.device, ['GigabitEthernet1', 'Gi1', 'GigabitEthernet2'],
+                bulk=True, max_age=0)
+        # 'show interfaces' is parsed once for all the interfaces
+        parse.assert_called_once_with('show interfaces')
+        expected_output = get_interface_information(
+            self.device, ['GigabitEthernet1'])['GigabitEthernet1']
+        self.assertEqual(result['GigabitEthernet1'], expected_output)
+        self.assertEqual(result['Gi1'], expected_output)
+        self.assertIsNone(result['GigabitEthernet2'])
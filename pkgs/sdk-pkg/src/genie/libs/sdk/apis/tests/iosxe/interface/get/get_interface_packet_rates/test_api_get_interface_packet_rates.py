@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+from genie.libs.sdk.apis.iosxe.interface.get import (
+    get_interface_packet_rates,
+    get_interface_packet_output_rate)
+
+
+class TestGetInterfacePacketRates(unittest.TestCase):
+
+    outputs = {
+        'before': {
+            'GigabitEthernet1': {'counters': {'in_pkts': 100, 'out_pkts': 200}},
+            'GigabitEthernet2': {'counters': {'in_pkts': 0, 'out_pkts': 0}},
+        },
+        'after': {
+            'GigabitEthernet1': {'counters': {'in_pkts': 700, 'out_pkts': 1400}},
+            'GigabitEthernet2': {'counters': {'in_pkts': 60}},
+        },
+    }
+
+    def setUp(self):
+        self.device = Mock()
+        self.device.name = 'R1_xe'
+        self.device.execute = Mock(side_effect=['before', 'after'])
+        self.device.parse = Mock(
+            side_effect=lambda command, output: self.outputs[output])
+
+    @patch('genie.libs.sdk.apis.iosxe.interface.get.time')
+    def test_get_interface_packet_rates(self, mock_time):
+        mock_time.time.side_effect = [1000, 1060]
+        result = get_interface_packet_rates(self.device, seconds=60)
+        expected_output = {
+            'R1_xe': {
+                'GigabitEthernet1': {'in_pkts': 10.0, 'out_pkts': 20.0},
+                'GigabitEthernet2': {'in_pkts': 1.0, 'out_pkts': None},
+            }
+        }
+        self.assertEqual(result, expected_output)
+        self.device.execute.assert_called_with('show interfaces')
+        self.assertEqual(self.device.execute.call_count, 2)
+        mock_time.sleep.assert_called_once_with(60)
+
+    @patch('genie.libs.sdk.apis.iosxe.interface.get.pcall',
+           side_effect=lambda func, ckwargs, ikwargs: [
+               func(**ckwargs, **kwargs) for kwargs in ikwargs])
+    @patch('genie.libs.sdk.apis.iosxe.interface.get.time')
+    def test_get_interface_packet_rates_devices(self, mock_time, mock_pcall):
+        mock_time.time.side_effect = [1000, 1000, 1060, 1060]
+        other = Mock()
+        other.name = 'R2_xe'
+        other.execute = Mock(side_effect=['before', 'after'])
+        other.parse = self.device.parse
+        self.device.testbed.devices = {'R1_xe': self.device, 'R2_xe': other}
+
+        result = get_interface_packet_rates(
+            self.device, interfaces=['GigabitEthernet1'], seconds=60,
+            devices=['R2_xe', 'R1_xe'])
+        # device is sampled along with devices, once
+        self.assertEqual(result, {
+            'R1_xe': {'GigabitEthernet1': {'in_pkts': 10.0, 'out_pkts': 20.0}},
+            'R2_xe': {'GigabitEthernet1': {'in_pkts': 10.0, 'out_pkts': 20.0}},
+        })
+        self.assertEqual(self.device.execute.call_count, 2)
+        self.assertEqual(other.execute.call_count, 2)
+        self.assertEqual(mock_pcall.call_count, 2)
+
+    @patch('genie.libs.sdk.apis.iosxe.interface.get.time')
+    def test_get_interface_packet_rates_empty(self, mock_time):
+        mock_time.time.side_effect = [1000, 1060]
+        self.device.parse = Mock(side_effect=SchemaEmptyParserError(''))
+        result = get_interface_packet_rates(self.device, seconds=60)
+        self.assertEqual(result, {'R1_xe': {}})
+
+    @patch('genie.libs.sdk.apis.iosxe.interface.get.time')
+    def test_get_interface_packet_output_rate(self, mock_time):
+        mock_time.time.side_effect = [1000, 1060]
+        result = get_interface_packet_output_rate(
+            self.device, 'GigabitEthernet1', seconds=60)
+        self.assertEqual(result, 20.0)
+        self.device.execute.assert_called_with(
+            'show interfaces GigabitEthernet1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import Mock
+
+from genie.utils.diff import Diff
+from genie.utils.config import Config
+from genie.libs.sdk.apis.utils import get_config_dict
+from genie.libs.sdk.libs.utils.config_tree import (ConfigTreeCache,
+                                                   diff_config_dicts,
+                                                   split_config_sections)
+
+
+class TestConfigTree(unittest.TestCase):
+
+    config = '''\
+hostname R1
+!
+interface GigabitEthernet1
+ ip address 10.1.1.1 255.255.255.0
+ no shutdown
+!
+interface GigabitEthernet2
+ shutdown
+!
+router ospf 1
+ router-id 1.1.1.1
+ network 10.1.1.0 0.0.0.255 area 0
+!
+end'''
+
+    def setUp(self):
+        self.device = Mock()
+        self.cache = ConfigTreeCache.get(self.device)
+
+    def test_split_config_sections(self):
+        sections = split_config_sections(self.config)
+        self.assertEqual(len(sections), 9)
+        self.assertEqual(sections[2], 'interface GigabitEthernet1\n'
+                                      ' ip address 10.1.1.1 255.255.255.0\n'
+                                      ' no shutdown')
+
+    def test_tree(self):
+        cfg = Config(self.config)
+        cfg.tree()
+        tree = self.cache.tree(self.config)
+        self.assertEqual(tree.config, cfg.config)
+        self.assertIs(ConfigTreeCache.get(self.device), self.cache)
+        self.assertEqual(tree.sections('interface'),
+                         ['interface GigabitEthernet1',
+                          'interface GigabitEthernet2'])
+        self.assertEqual(tree.find(r'2$', keyword='interface'),
+                         ['interface GigabitEthernet2'])
+        self.assertIn('router-id 1.1.1.1', tree.section('router ospf 1'))
+
+    def test_tree_reparse_changed_sections(self):
+        self.cache.tree(self.config)
+        parsed = self.cache.parsed
+        self.cache.tree(self.config.replace('GigabitEthernet2\n shutdown',
+                                            'GigabitEthernet2\n no shutdown'))
+        self.assertEqual(self.cache.parsed, parsed + 1)
+
+    def test_refresh_diff(self):
+        before, previous = self.cache.refresh('show run', self.config)
+        self.assertIsNone(previous)
+        new_config = self.config.replace('router-id 1.1.1.1',
+                                         'router-id 2.2.2.2')
+        after, previous = self.cache.refresh('show run', new_config)
+        self.assertIs(previous, before)
+
+        diff = previous.diff(after)
+        full_diff = Diff(before.config, after.config)
+        full_diff.findDiff()
+        self.assertEqual(str(diff), str(full_diff))
+        self.assertIn('router-id 2.2.2.2', str(diff))
+
+    def test_diff_config_dicts_equal(self):
+        tree = self.cache.tree(self.config)
+        self.assertEqual(str(diff_config_dicts(tree.config, tree.config)), '')
+
+    def test_get_config_dict_copy(self):
+        cmd = 'show running-config'
+        config_dict = get_config_dict(self.config, device=self.device,
+                                      command=cmd)
+        config_dict['router ospf 1'].clear()
+        del config_dict['hostname R1']
+
+        # the cache is left untouched
+        tree = self.cache.latest[cmd]
+        self.assertIn('hostname R1', tree.config)
+        self.assertIn('router-id 1.1.1.1', tree.config['router ospf 1'])
+        self.assertEqual(get_config_dict(self.config, device=self.device),
+                         tree.config)
+
+    def test_get_config_dict_shared(self):
+        config_dict = get_config_dict(self.config, device=self.device,
+                                      command='show running-config',
+                                      shared=True)
+        self.assertIs(config_dict['router ospf 1'],
+                      self.cache.tree(self.config).config['router ospf 1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import Mock, patch
+
+from unicon.core.errors import SubCommandFailure
+
+from genie.libs.sdk.libs.abstracted_libs import processors
+from genie.libs.sdk.libs.abstracted_libs.processors import \
+    pre_execute_command
+
+
+class Devices(dict):
+    '''testbed devices, without aliases'''
+
+    aliases = []
+
+    @property
+    def names(self):
+        return list(self)
+
+
+def create_device(name, execute=None):
+    device = Mock()
+    device.name = name
+    device.is_connected.return_value = True
+    device.api.slugify = lambda cmd: cmd.replace(' ', '_')
+    device.execute = Mock(side_effect=execute or (
+        lambda cmd, **kwargs: '{} output of {}'.format(name, cmd)))
+    return device
+
+
+class TestExecuteCommand(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        patcher = patch.object(processors, 'runtime')
+        patcher.start().directory = self.directory
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(processors, 'connect_device')
+        self.connect_device = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(processors.time, 'sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.testbed = Mock()
+        self.testbed.devices = Devices(R1=create_device('R1'),
+                                       R2=create_device('R2'))
+        self.section = Mock(uid='test', result=None)
+        self.section.parent.uid = 'job'
+        self.section.parameters = {'testbed': self.testbed}
+        self.devices = {name: {'cmds': [{'cmd': 'show version'},
+                                        {'cmd': 'show clock'}]}
+                        for name in ('R1', 'R2')}
+
+    def read_zip(self):
+        names = os.listdir(self.directory)
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].endswith('.zip'))
+        with zipfile.ZipFile(os.path.join(self.directory, names[0])) as f:
+            return {name: f.read(name).decode() for name in f.namelist()}
+
+    def test_per_command_zip(self):
+        pre_execute_command(self.section, self.devices,
+                            save_to_file='per_command', zipped_folder=True)
+
+        files = self.read_zip()
+        self.assertEqual(sorted(files), [
+            'R1_show_clock.txt', 'R1_show_version.txt',
+            'R2_show_clock.txt', 'R2_show_version.txt'])
+        self.assertIn("R1: executing command 'show clock'",
+                      files['R1_show_clock.txt'])
+        self.assertIn('R1 output of show clock', files['R1_show_clock.txt'])
+        self.section.failed.assert_not_called()
+        self.section.errored.assert_not_called()
+
+    def test_per_device_zip(self):
+        pre_execute_command(self.section, self.devices,
+                            save_to_file='per_device', zipped_folder=True)
+
+        files = self.read_zip()
+        self.assertEqual(sorted(files), ['R1.txt', 'R2.txt'])
+        output = files['R2.txt']
+        self.assertLess(output.index('R2 output of show version'),
+                        output.index('R2 output of show clock'))
+        self.assertNotIn('R1', output)
+
+    def test_per_device_folder(self):
+        pre_execute_command(self.section, self.devices,
+                            save_to_file='per_device', zipped_folder=False)
+
+        folder, = os.listdir(self.directory)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.directory, folder))),
+            ['R1.txt', 'R2.txt'])
+
+    def test_max_retry(self):
+        def execute(cmd, **kwargs):
+            raise SubCommandFailure('timeout')
+        self.testbed.devices['R2'] = create_device('R2', execute)
+
+        pre_execute_command(self.section, self.devices, max_retry=2,
+                            sleep_time=10)
+
+        # R1 is not stopped by R2 failing
+        self.assertEqual(self.testbed.devices['R1'].execute.call_count, 2)
+        self.assertEqual(self.testbed.devices['R2'].execute.call_count, 3)
+        self.assertEqual(self.connect_device.call_count, 3)
+        self.section.failed.assert_called_once_with(
+            'Reached max number of 2 retries, command execution have failed')
+        self.section.errored.assert_not_called()
+
+    def test_unexpected_error(self):
+        def execute(cmd, **kwargs):
+            raise ValueError('unexpected')
+        self.testbed.devices['R2'] = create_device('R2', execute)
+
+        pre_execute_command(self.section, self.devices)
+
+        self.section.errored.assert_called_once_with(
+            'Failed to execute commands on R2: unexpected')
+        self.section.failed.assert_not_called()
+        self.assertEqual(self.testbed.devices['R2'].execute.call_count, 1)
+
+    def test_sleep_time(self):
+        pre_execute_command(self.section, self.devices, sleep_time=10)
+        self.sleep.assert_called_once_with(10)
+
+    def test_sleep_time_not_executed(self):
+        self.section.result = 'passed'
+        for cmds in self.devices.values():
+            for cmd in cmds['cmds']:
+                cmd['condition'] = ['failed']
+
+        pre_execute_command(self.section, self.devices, sleep_time=10)
+
+        self.sleep.assert_not_called()
+        self.testbed.devices['R1'].execute.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import re
+import unittest
+from collections import OrderedDict
+from unittest.mock import Mock, patch
+
+from pyats.utils.objects import R
+
+from genie.libs.sdk.libs.utils.mapping import Mapping
+from genie.libs.sdk.libs.utils.normalize import (GroupKeys, RequirementPath,
+                                                 compile_req_regex)
+
+# find output of the requirement below
+SOURCE = [
+    ('up', ['info', 'vrf', 'default', 'neighbor', '1.1.1.1', 'ipv4', 'state']),
+    ('down', ['info', 'vrf', 'default', 'neighbor', '2.2.2.2', 'ipv6',
+              'state']),
+    ('up', ['info', 'vrf', 'blue', 'neighbor', '3.3.3.3', 'ipv4', 'state']),
+    ('up', ['info', 'vrf', 'blue', 'neighbor', '1.1.1.1', 'ipv4', 'state']),
+]
+
+# Expected outputs are the ones of the group_keys implementation compiling
+# the requirement regexes for every found path
+
+
+class TestGroupKeys(unittest.TestCase):
+
+    def setUp(self):
+        self.req = ['info', 'vrf', '(?P<vrf>.*)', 'neighbor',
+                    R('(?P<neighbor>.*)'), '(?P<af>ipv[46])', 'state']
+
+    def test_group_keys(self):
+        self.assertEqual(
+            GroupKeys.group_keys(source=SOURCE, reqs=[self.req], ret_num={}),
+            [{'vrf': 'default', 'neighbor': '1.1.1.1', 'af': 'ipv4'},
+             {'vrf': 'default', 'neighbor': '2.2.2.2', 'af': 'ipv6'},
+             {'vrf': 'blue', 'neighbor': '3.3.3.3', 'af': 'ipv4'},
+             {'vrf': 'blue', 'neighbor': '1.1.1.1', 'af': 'ipv4'}])
+
+    def test_group_keys_ret_num(self):
+        self.assertEqual(
+            GroupKeys.group_keys(source=SOURCE, reqs=[self.req],
+                                 ret_num={'vrf': 1}),
+            [{'vrf': 'default', 'neighbor': '1.1.1.1', 'af': 'ipv4'},
+             {'vrf': 'default', 'neighbor': '2.2.2.2', 'af': 'ipv6'}])
+
+    def test_group_keys_all_keys(self):
+        mtu_req = ['info', 'vrf', '(?P<vrf>.*)', 'mtu']
+        mtu = [(1500, ['info', 'vrf', 'default', 'mtu']),
+               (1400, ['info', 'vrf', 'blue', 'mtu'])]
+        self.assertEqual(
+            GroupKeys.group_keys(source=[SOURCE, mtu],
+                                 reqs=[self.req, mtu_req], ret_num={},
+                                 all_keys=True),
+            [{'vrf': 'blue', 'neighbor': '1.1.1.1', 'af': 'ipv4'},
+             {'vrf': 'blue', 'neighbor': '3.3.3.3', 'af': 'ipv4'},
+             {'vrf': 'default', 'neighbor': '1.1.1.1', 'af': 'ipv4'},
+             {'vrf': 'default', 'neighbor': '2.2.2.2', 'af': 'ipv6'}])
+
+        # Only the vrf found by both requirements is kept
+        self.assertEqual(
+            GroupKeys.group_keys(source=[SOURCE, mtu[:1]],
+                                 reqs=[self.req, mtu_req], ret_num={},
+                                 all_keys=True),
+            [{'vrf': 'default', 'neighbor': '1.1.1.1', 'af': 'ipv4'},
+             {'vrf': 'default', 'neighbor': '2.2.2.2', 'af': 'ipv6'}])
+
+    def test_group_keys_invalid_regex(self):
+        with self.assertRaises(ValueError):
+            GroupKeys.group_keys(source=[(1, ['info', 'a'])],
+                                 reqs=[['info', '(?P<name>[']], ret_num={})
+
+    def test_group_keys_regex_without_group(self):
+        operator = Mock(spec=R, value='(?P<name>.*)',
+                        regex=re.compile('.*'))
+        with self.assertRaises(IndexError):
+            GroupKeys.group_keys(source=[(1, ['info', 'a'])],
+                                 reqs=[['info', operator]], ret_num={})
+
+
+class TestRequirementPath(unittest.TestCase):
+
+    def test_compile_req_regex(self):
+        self.assertEqual(compile_req_regex.cache_info().maxsize, 128)
+        com, var = compile_req_regex('(?P<vrf>.*)')
+        self.assertEqual(var, 'vrf')
+        self.assertIs(compile_req_regex('(?P<vrf>.*)')[0], com)
+
+    def test_compile_lru(self):
+        reqs = [['info', '(?P<key{}>.*)'.format(i)] for i in range(129)]
+        with patch.object(RequirementPath, '_compiled', OrderedDict()):
+            first = RequirementPath.compile(reqs[0])
+            for req in reqs[1:128]:
+                RequirementPath.compile(req)
+            self.assertIs(RequirementPath.compile(reqs[0]), first)
+            second = RequirementPath.compile(reqs[1])
+
+            # The least recently used requirement path is dropped
+            RequirementPath.compile(reqs[128])
+            self.assertEqual(len(RequirementPath._compiled), 128)
+            self.assertIs(RequirementPath.compile(reqs[0]), first)
+            self.assertIsNot(RequirementPath.compile(reqs[2]), second)
+
+    def test_match_keys_memo(self):
+        path = RequirementPath.compile(['info', '(?P<vrf>.*)', '(?P<id>\\d+)'])
+        memo = {}
+        self.assertEqual(path.match_keys(['info', 'default', 10], memo),
+                         {'vrf': 'default', 'id': 10})
+        self.assertEqual(path.match_keys(['info', 'default', 20], memo),
+                         {'vrf': 'default', 'id': 20})
+        self.assertEqual(len(memo), 3)
+
+
+class TestPopulatePath(unittest.TestCase):
+
+    def setUp(self):
+        self.mapping = Mock(keys={})
+        self.device = Mock()
+        self.device.name = 'PE1'
+        self.path = [['info', '{uut}', 'vrf', '(?P<vrf>default|blue)',
+                      'neighbor', '(?P<neighbor>.*)']]
+
+    def test_populate_path(self):
+        keys = [{'vrf': 'default', 'neighbor': '1.1.1.1'},
+                {'vrf': 'blue'},
+                {'vrf': 'red'}]
+        self.assertEqual(
+            Mapping._populate_path(self.mapping, self.path, self.device,
+                                   keys),
+            [['info', 'PE1', 'vrf', 'blue', 'neighbor', '(?P<neighbor>.*)'],
+             ['info', 'PE1', 'vrf', 'default', 'neighbor', '1.1.1.1']])
+
+    def test_populate_path_device_only(self):
+        self.assertEqual(
+            Mapping._populate_path(self.mapping, self.path, self.device,
+                                   [{'vrf': 'default'}], device_only=True),
+            [['info', 'PE1', 'vrf', '(?P<vrf>default|blue)', 'neighbor',
+              '(?P<neighbor>.*)']])
+
+    def test_populate_path_invalid_regex(self):
+        with self.assertRaises(ValueError):
+            Mapping._populate_path(self.mapping, [['info', '(?P<vrf>[']],
+                                   self.device, [{'vrf': 'default'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
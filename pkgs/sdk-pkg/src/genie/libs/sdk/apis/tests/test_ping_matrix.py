@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from genie.libs.sdk.libs.abstracted_libs import processors
+from genie.libs.sdk.libs.abstracted_libs.processors import (PingMatrix,
+                                                            ping_devices)
+
+# af -> {device name: (route, ip)}
+ROUTES = {
+    'ipv4': {'R1': ('10.0.0.0/24', '10.0.0.1'),
+             'R2': ('10.0.0.0/24', '10.0.0.2')},
+    'ipv6': {'R1': ('2001:db8::/64', '2001:db8::1'),
+             'R2': ('2001:db8::/64', '2001:db8::2')},
+}
+
+
+def create_device(name, results=None):
+    device = Mock()
+    device.name = name
+    # ping results, True is a successful ping
+    results = iter(results or [])
+    device.ping = Mock(side_effect=lambda **kwargs: 'Success rate is {} '
+                       'percent (5/5)'.format(100 if next(results, True)
+                                              else 0))
+    return device
+
+
+def create_item(src, dest, proto='ip', max_time=1):
+    return {'src': src, 'dest': dest, 'ping': {'proto': proto},
+            'timeout_max_time': max_time, 'timeout_interval': 0.01,
+            'peer_num': 1, 'exp_succ_perc': 100}
+
+
+class TestPingMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.learns = []
+        self.calls = []
+
+        def learn_routing(device, af, paths, ops_container=None,
+                          ret_container=None, routing_ops=None):
+            self.calls.append((device.name, af, routing_ops))
+            if routing_ops is None:
+                self.learns.append(device.name)
+                ops_container[device.name] = 'routing ' + device.name
+            route, ip = ROUTES[af][device.name]
+            ret_container.setdefault(route, {}).setdefault(ip, {}).update(
+                {device.name: {'route': route, 'vrf': 'default'}})
+
+        lookup = Mock()
+        lookup.sdk.libs.abstracted_libs.processors.learn_routing = \
+            learn_routing
+        patcher = patch.object(processors, 'LazyLookup')
+        patcher.start().from_device.return_value = lookup
+        self.addCleanup(patcher.stop)
+
+        self.testbed = Mock()
+        self.testbed.devices = {'R1': create_device('R1'),
+                                'R2': create_device('R2')}
+
+    def test_learn_once_per_device(self):
+        matrix = PingMatrix(self.testbed, [
+            create_item('R1', 'R2'),
+            create_item('R1', 'R2', proto='ipv6'),
+            create_item('R2', 'R1'),
+        ])
+        self.assertEqual(matrix.run(), [])
+
+        # Routing is learned once per device, both address families are
+        # taken from it
+        self.assertEqual(sorted(self.learns), ['R1', 'R2'])
+        self.assertIn(('R1', 'ipv6', 'routing R1'), self.calls)
+        self.assertEqual(matrix.learned, {'R1': {'ipv4', 'ipv6'},
+                                          'R2': {'ipv4', 'ipv6'}})
+        self.testbed.devices['R1'].ping.assert_any_call(
+            proto='ipv6', addr='2001:db8::2')
+        self.testbed.devices['R2'].ping.assert_called_once_with(
+            proto='ip', addr='10.0.0.1')
+
+    def test_retry_failed_pairs(self):
+        self.testbed.devices['R2'] = create_device('R2', [False, True])
+        matrix = PingMatrix(self.testbed, [create_item('R1', 'R2'),
+                                           create_item('R2', 'R1')])
+        self.assertEqual(matrix.run(), [])
+
+        # Only the failed pair is pinged again, without learning again
+        self.assertEqual(self.testbed.devices['R1'].ping.call_count, 1)
+        self.assertEqual(self.testbed.devices['R2'].ping.call_count, 2)
+        self.assertEqual(sorted(self.learns), ['R1', 'R2'])
+
+    def test_ping_devices_passx(self):
+        section = Mock()
+        section.parameters = {'testbed': self.testbed}
+        self.testbed.devices['R2'] = create_device('R2', [False] * 1000)
+
+        ping_devices(section, [create_item('R1', 'R2'),
+                               create_item('R2', 'R1', max_time=0.1)])
+
+        section.passx.assert_called_once_with(
+            'PING PRE POST PROCESSOR FAILED, SKIPPED THE TRIGGER')
+        self.assertEqual(self.testbed.devices['R1'].ping.call_count, 1)
+        self.assertGreater(self.testbed.devices['R2'].ping.call_count, 1)
+
+    def test_ping_devices_passed(self):
+        section = Mock()
+        section.parameters = {'testbed': self.testbed}
+        ping_devices(section, [create_item('R1', 'R2')])
+        section.passx.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
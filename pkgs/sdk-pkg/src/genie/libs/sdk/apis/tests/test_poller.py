@@ -0,0 +1,123 @@
+import time
+import unittest
+import threading
+from unittest.mock import Mock
+
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+from genie.libs.sdk.libs.utils.poller import (CommandPoller,
+                                              parse_command,
+                                              wait_for_parsed)
+
+
+class TestCommandPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.device = Mock(spec=['name', 'parse'])
+        self.device.name = 'aDevice'
+
+    def test_parse_shared_within_freshness(self):
+        self.device.parse = Mock(side_effect=[{'a': 1}, {'a': 2}])
+        with CommandPoller(self.device, freshness=60) as poller:
+            self.assertEqual(parse_command(self.device, 'show a'), {'a': 1})
+            self.assertEqual(parse_command(self.device, 'show a'), {'a': 1})
+            self.assertEqual(poller.parse('show a', freshness=0), {'a': 2})
+        self.assertEqual(poller.round_trips, 2)
+        self.assertEqual(poller.hits, 1)
+        self.assertIsNone(CommandPoller.get(self.device))
+
+    def test_parse_concurrent_callers(self):
+        def parse(command):
+            time.sleep(0.2)
+            return {'a': 1}
+        self.device.parse = Mock(side_effect=parse)
+        results = []
+        with CommandPoller(self.device, freshness=60):
+            threads = [threading.Thread(
+                target=lambda: results.append(
+                    parse_command(self.device, 'show a')))
+                for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results, [{'a': 1}] * 5)
+        self.device.parse.assert_called_once_with('show a')
+
+    def test_parse_copies(self):
+        self.device.parse = Mock(return_value={'a': {'b': 1}})
+        with CommandPoller(self.device, freshness=60):
+            output = parse_command(self.device, 'show a')
+            output['a']['b'] = 2
+            self.assertEqual(parse_command(self.device, 'show a'),
+                             {'a': {'b': 1}})
+        self.device.parse.assert_called_once_with('show a')
+
+    def test_parse_different_commands_serialized(self):
+        running = []
+        overlaps = []
+
+        def parse(command):
+            running.append(command)
+            if len(running) > 1:
+                overlaps.append(list(running))
+            time.sleep(0.05)
+            running.remove(command)
+            return {'command': command}
+        self.device.parse = Mock(side_effect=parse)
+        results = []
+        with CommandPoller(self.device, freshness=60):
+            threads = [threading.Thread(
+                target=lambda i=i: results.append(
+                    parse_command(self.device, 'show route {}'.format(i))))
+                for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(overlaps, [])
+        self.assertEqual(len(results), 4)
+        self.assertEqual(self.device.parse.call_count, 4)
+
+    def test_parse_empty_shared(self):
+        self.device.parse = Mock(side_effect=SchemaEmptyParserError(''))
+        with CommandPoller(self.device, freshness=60):
+            for _ in range(2):
+                with self.assertRaises(SchemaEmptyParserError):
+                    parse_command(self.device, 'show a')
+        self.device.parse.assert_called_once_with('show a')
+
+    def test_already_active(self):
+        with CommandPoller(self.device):
+            with self.assertRaises(RuntimeError):
+                CommandPoller(self.device).start()
+
+    def test_wait_for(self):
+        self.device.parse = Mock(side_effect=[SchemaEmptyParserError(''),
+                                              {'a': 1}, {'a': 2}])
+        with CommandPoller(self.device, freshness=0):
+            result = wait_for_parsed(self.device, 'show a',
+                                     lambda out: out['a'] == 2,
+                                     max_time=5, check_interval=0.01)
+        self.assertTrue(result)
+        self.assertEqual(self.device.parse.call_count, 3)
+
+    def test_wait_for_backoff(self):
+        self.device.parse = Mock(return_value={'a': 1})
+        with CommandPoller(self.device, freshness=0, backoff=2) as poller:
+            result = poller.wait_for('show a', lambda out: False,
+                                     max_time=0.5, check_interval=0.1)
+        self.assertFalse(result)
+        # 0.1, 0.2, 0.3 (max_interval) instead of 5 fixed sleeps
+        self.assertLess(self.device.parse.call_count, 5)
+
+    def test_wait_for_without_poller(self):
+        self.device.parse = Mock(side_effect=[{'a': 1}, {'a': 2}])
+        result = wait_for_parsed(self.device, 'show a',
+                                 lambda out: out['a'] == 2,
+                                 max_time=5, check_interval=0.01)
+        self.assertTrue(result)
+        self.assertEqual(self.device.parse.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
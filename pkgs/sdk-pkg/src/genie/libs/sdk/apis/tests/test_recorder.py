@@ -0,0 +1,74 @@
+import gzip
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from genie.libs.sdk.libs.utils.recorder import CommandRecorder, get_recorder
+
+
+class TestCommandRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.devices = []
+        for name in ['R1', 'R2']:
+            device = Mock(spec=['name', 'execute'])
+            device.name = name
+            device.execute = Mock(return_value='{} output'.format(name))
+            self.devices.append(device)
+
+    def test_record(self):
+        recorder = CommandRecorder(self.directory, alias=None)
+        for device in self.devices:
+            recorder.add(device, ['show a', 'show b'], interval=0.05)
+        recorder.start()
+        self.assertIs(get_recorder(), recorder)
+        time.sleep(0.3)
+        files = recorder.stop()
+
+        self.assertIsNone(get_recorder())
+        self.assertFalse(recorder.running)
+        self.assertEqual(sorted(files), ['R1', 'R2'])
+        for device in self.devices:
+            with gzip.open(files[device.name], 'rt') as f:
+                output = f.read()
+            self.assertIn('{} "show a"'.format(device.name), output)
+            self.assertIn('{} "show b"'.format(device.name), output)
+            self.assertIn('{} output'.format(device.name), output)
+            self.assertGreater(device.execute.call_count, 2)
+
+    def test_record_append(self):
+        for _ in range(2):
+            recorder = CommandRecorder(self.directory, alias=None)
+            recorder.add(self.devices[0], 'show a', interval=60)
+            recorder.start()
+            time.sleep(0.1)
+            path = recorder.stop()['R1']
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(f.read().count('"show a"'), 2)
+
+    def test_record_error(self):
+        self.devices[0].execute.side_effect = Exception('timeout')
+        recorder = CommandRecorder(self.directory, alias=None)
+        recorder.add(self.devices[0], ['show a'], interval=60)
+        recorder.start()
+        time.sleep(0.1)
+        path = recorder.stop()['R1']
+        with gzip.open(path, 'rt') as f:
+            self.assertIn('Failed to execute command: timeout', f.read())
+
+    def test_already_running(self):
+        recorder = CommandRecorder(self.directory, alias=None)
+        recorder.start()
+        self.addCleanup(recorder.stop)
+        with self.assertRaises(RuntimeError):
+            CommandRecorder(self.directory, alias=None).start()
+        with self.assertRaises(RuntimeError):
+            recorder.add(self.devices[0], ['show a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import struct
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from genie.libs.sdk.libs.utils.tcpdump import (PcapRecord, PcapRotatingWriter,
+                                               PcapStreamDecoder, TcpDump)
+
+
+def create_pcap(packets, byte_order='<', nanoseconds=False, linktype=1):
+    '''pcap bytes of (seconds, fraction, data) packets'''
+    magic = 0xa1b23c4d if nanoseconds else 0xa1b2c3d4
+    pcap = struct.pack(byte_order + 'IHHiIII', magic, 2, 4, 0, 0, 65535,
+                       linktype)
+    for seconds, fraction, data in packets:
+        pcap += struct.pack(byte_order + 'IIII', seconds, fraction,
+                            len(data), len(data)) + data
+    return pcap
+
+
+def od(data):
+    '''data as printed by od -An -v -tx1'''
+    return ''.join(' ' + ' '.join('{:02x}'.format(byte)
+                                  for byte in data[i:i + 16]) + '\n'
+                   for i in range(0, len(data), 16))
+
+
+PACKETS = [(100, 500000, b'first packet'),
+           (101, 250000, b'second packet, a bit longer than the first'),
+           (102, 0, b'')]
+
+
+class TestPcapStreamDecoder(unittest.TestCase):
+
+    def decode(self, pcap, size):
+        decoder = PcapStreamDecoder()
+        records = []
+        for i in range(0, len(pcap), size):
+            records.extend(decoder.feed(pcap[i:i + size]))
+        return decoder, records
+
+    def test_partial_chunks(self):
+        pcap = create_pcap(PACKETS)
+        for size in (1, 7, 16, 24, len(pcap)):
+            decoder, records = self.decode(pcap, size)
+            self.assertEqual(records, [
+                PcapRecord(100.5, 12, b'first packet'),
+                PcapRecord(101.25, 42, PACKETS[1][2]),
+                PcapRecord(102, 0, b'')])
+            self.assertEqual(decoder.linktype, 1)
+
+    def test_byte_orders(self):
+        for byte_order in ('<', '>'):
+            pcap = create_pcap(PACKETS, byte_order=byte_order, linktype=113)
+            decoder, records = self.decode(pcap, 5)
+            self.assertEqual([r.data for r in records],
+                             [data for _, _, data in PACKETS])
+            self.assertEqual(decoder.linktype, 113)
+            # packed records are the ones of the stream
+            self.assertEqual(decoder.header + b''.join(
+                decoder.pack(record) for record in records), pcap)
+
+    def test_nanoseconds(self):
+        pcap = create_pcap([(100, 250000000, b'data')], nanoseconds=True)
+        decoder, records = self.decode(pcap, 3)
+        self.assertEqual(records, [PcapRecord(100.25, 4, b'data')])
+
+    def test_not_pcap(self):
+        with self.assertRaises(ValueError):
+            PcapStreamDecoder().feed(b'\x00' * 24)
+
+
+class TestPcapRotatingWriter(unittest.TestCase):
+
+    def test_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'capture.pcap')
+            writer = PcapRotatingWriter(path, b'H' * 4, max_bytes=10,
+                                        backup_count=3)
+            for data in (b'aaaa', b'bbbb', b'cccc', b'dddd', b'eeeeeeeeeeee'):
+                writer.write(data)
+            writer.close()
+
+            self.assertEqual(sorted(os.listdir(directory)),
+                             ['capture.1.pcap', 'capture.2.pcap',
+                              'capture.pcap'])
+
+            def read(name):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    return f.read()
+            # each file starts with the header, an oversized record gets
+            # its own file
+            self.assertEqual(read('capture.pcap'), b'HHHHeeeeeeeeeeee')
+            self.assertEqual(read('capture.1.pcap'), b'HHHHdddd')
+            self.assertEqual(read('capture.2.pcap'), b'HHHHcccc')
+
+    def test_no_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'capture.pcap')
+            writer = PcapRotatingWriter(path, b'H')
+            for _ in range(100):
+                writer.write(b'data')
+            writer.close()
+            self.assertEqual(os.path.getsize(path), 401)
+
+
+class TestTcpDumpStream(unittest.TestCase):
+
+    def create_device(self, outputs):
+        device = Mock()
+        outputs = iter(outputs)
+        buffer = []
+
+        def receive(pattern, timeout):
+            output = next(outputs, '')
+            buffer[:] = [output]
+            return bool(output)
+
+        device.receive = Mock(side_effect=receive)
+        device.receive_buffer = Mock(side_effect=lambda: buffer[0])
+        return device
+
+    def test_stream(self):
+        text = od(create_pcap(PACKETS))
+        # lines split across reads, with the echoed command
+        outputs = ['tcpdump -i any -U -w - | od -An -v -tx1\n',
+                   text[:30], text[30:100], text[100:]]
+        device = self.create_device(outputs)
+
+        with tempfile.TemporaryDirectory() as directory:
+            tcpdump = TcpDump(device, pcap_file='/tmp/capture.pcap',
+                              local_dir=directory)
+            records = tcpdump.stream('tcpdump -i any', duration=5,
+                                     max_packets=3, read_timeout=0)
+            with open(os.path.join(directory, 'capture.pcap'), 'rb') as f:
+                self.assertEqual(f.read(), create_pcap(PACKETS))
+
+        self.assertEqual([r.data for r in records],
+                         [data for _, _, data in PACKETS])
+        self.assertEqual(tcpdump.packet_count, 3)
+        device.send.assert_any_call(
+            'tcpdump -i any -U -w - | od -An -v -tx1\n')
+        device.send.assert_called_with('\x03')
+
+    def test_stream_predicate_and_ring(self):
+        packets = [(100 + i, 0, 'packet {}'.format(i).encode())
+                   for i in range(10)]
+        device = self.create_device([od(create_pcap(packets))])
+
+        tcpdump = TcpDump(device)
+        records = tcpdump.stream(
+            'tcpdump -i any', duration=5, ring_size=3, read_timeout=0,
+            predicates=[lambda record: record.data == b'packet 6'])
+
+        self.assertEqual([r.data for r in records],
+                         [b'packet 4', b'packet 5', b'packet 6'])
+        self.assertEqual(tcpdump.packet_count, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from genie.libs.sdk.libs.utils.common import UpdateLearntDatabase
+
+
+class Ops(object):
+    '''Ops learning the given info, only the given attributes when any'''
+
+    learned = {'vrf': {'default': {'x': 10, 'y': 10},
+                       'blue': {'x': 20}},
+               'table': {'t': 2}}
+    # learns with attributes raising this exception
+    partial_error = None
+    # attributes of the objects created
+    created = []
+
+    def __init__(self, device, attributes=None):
+        self.device = device
+        self.attributes = attributes
+        self.created.append(attributes)
+
+    def learn(self):
+        if self.attributes and self.partial_error:
+            raise self.partial_error
+        self.info = {'vrf': {name: dict(vrf) for name, vrf in
+                             self.learned['vrf'].items()},
+                     'table': dict(self.learned['table'])}
+
+
+class TestUpdateLearntDatabase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('genie.libs.sdk.libs.utils.common.Lookup')
+        self.abstract = patcher.start().from_device.return_value
+        self.addCleanup(patcher.stop)
+
+        Ops.created = []
+        self.device = Mock(alias='uut')
+        self.device.name = 'R1'
+        self.pts = Ops(self.device)
+        self.pts.info = {'vrf': {'default': {'x': 1, 'y': 1, 'z': 1},
+                                 'red': {'x': 3}},
+                         'table': {'t': 1}}
+        self.obj = Mock()
+        self.obj.parent.parameters = {'pts': {'bgp': {'uut': self.pts}}}
+        self.update = UpdateLearntDatabase(self.obj, self.device,
+                                           update_feature_list=['bgp'])
+
+    def stored(self):
+        return self.obj.parent.parameters['pts']['bgp']['uut']
+
+    def test_split_attribute(self):
+        self.assertEqual(UpdateLearntDatabase._split_attribute('info'),
+                         ['info'])
+        self.assertEqual(
+            UpdateLearntDatabase._split_attribute('info[vrf][(.*)][x]'),
+            ['info', 'vrf', '(.*)', 'x'])
+
+    def test_merge_nested_path(self):
+        module = Ops(self.device)
+        module.learn()
+        self.update._merge_pts(self.pts, module, 'info[vrf][default][x]')
+        self.assertEqual(self.pts.info['vrf'],
+                         {'default': {'x': 10, 'y': 1, 'z': 1},
+                          'red': {'x': 3}})
+        self.assertEqual(self.pts.info['table'], {'t': 1})
+
+    def test_merge_regex_path(self):
+        module = Ops(self.device)
+        module.learn()
+        self.update._merge_pts(self.pts, module, 'info[vrf][(.*)][x]')
+        # red is no longer learned, blue is new, the other keys are kept
+        self.assertEqual(self.pts.info['vrf'],
+                         {'default': {'x': 10, 'y': 1, 'z': 1},
+                          'blue': {'x': 20}})
+
+    def test_merge_removed_keys(self):
+        module = Ops(self.device)
+        module.learn()
+        self.update._merge_pts(self.pts, module, 'info[vrf][default]')
+        self.assertEqual(self.pts.info['vrf']['default'], {'x': 10, 'y': 10})
+        self.update._merge_pts(self.pts, module, 'info[vrf][red]')
+        self.assertNotIn('red', self.pts.info['vrf'])
+        # attribute no longer learned
+        del module.info
+        self.update._merge_pts(self.pts, module, 'info')
+        self.assertFalse(hasattr(self.pts, 'info'))
+
+    def test_update_pts_attributes(self):
+        Ops.created = []
+        self.update.update_pts(
+            update_attributes={'bgp': ['info[vrf][(.*)][x]']})
+        self.assertEqual(Ops.created, [['info[vrf][(.*)][x]']])
+        # the stored object is updated in place from a partial learn
+        self.assertIs(self.stored(), self.pts)
+        self.assertEqual(self.pts.info['vrf']['default'],
+                         {'x': 10, 'y': 1, 'z': 1})
+        self.assertNotIn('red', self.pts.info['vrf'])
+
+    def test_update_pts_partial_learn_failure(self):
+        Ops.created = []
+        with patch.object(Ops, 'partial_error', KeyError('vrf')):
+            self.update.update_pts(
+                update_attributes={'bgp': ['info[vrf][default]']})
+        # the partial learn falls back to a full learn
+        self.assertEqual(Ops.created, [['info[vrf][default]'], None])
+        self.assertEqual(self.pts.info['vrf'],
+                         {'default': {'x': 10, 'y': 10}, 'red': {'x': 3}})
+
+    def test_update_pts_feature_not_in_attributes(self):
+        self.update.update_pts(update_attributes={'ospf': ['info']})
+        # the whole feature is learned and replaces the stored object
+        stored = self.stored()
+        self.assertIsNot(stored, self.pts)
+        self.assertIsNone(stored.attributes)
+        self.assertEqual(stored.info['vrf'], Ops.learned['vrf'])
+
+    def test_shared_verification_command(self):
+        parser = self.abstract.parser.show_bgp.ShowBgp
+        parser.return_value.parse.return_value = {'bgp': {'id': 1}}
+        self.obj.parent.verifications = {
+            'Verify_Bgp': {'cmd': {'class': 'show_bgp.ShowBgp'},
+                           'parameters': {'vrf': 'default'}},
+            'Verify_Bgp_Copy': {'cmd': {'class': 'show_bgp.ShowBgp'},
+                                'parameters': {'vrf': 'default'}},
+            'Verify_Bgp_Blue': {'cmd': {'class': 'show_bgp.ShowBgp'},
+                                'parameters': {'vrf': 'blue'}},
+        }
+
+        output = self.update._get_command_output('Verify_Bgp')
+        output['bgp']['id'] = 2
+        shared = self.update._get_command_output('Verify_Bgp_Copy')
+        # the command is sent once, each verification has its own output
+        parser.return_value.parse.assert_called_once_with(vrf='default')
+        self.assertEqual(shared, {'bgp': {'id': 1}})
+
+        self.update._get_command_output('Verify_Bgp_Blue')
+        parser.return_value.parse.assert_called_with(vrf='blue')
+        self.assertEqual(parser.return_value.parse.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
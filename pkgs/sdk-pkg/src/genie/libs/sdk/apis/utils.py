@@ -39,10 +39,14 @@ from genie.utils.timeout import Timeout
 from genie.conf.base import Device
 from genie.utils import Dq
 from genie.libs.sdk.libs.utils.normalize import merge_dict
+from genie.libs.sdk.libs.utils.config_tree import (ConfigTreeCache,
+                                                   diff_config_dicts)
+from genie.libs.sdk.libs.utils.recorder import CommandRecorder, get_recorder
 from genie.libs.sdk.powercycler import powercyclers
 from genie.libs.sdk.powercycler.base import PowerCycler
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 from genie.libs.filetransferutils import FileServer
+from genie.libs.filetransferutils.session import session_pool
 
 # unicon
 from unicon.eal.dialogs import Dialog, Statement
@@ -222,14 +226,30 @@ def get_unconfig_line(config_dict, line):
     return unconfig
 
 
-def get_config_dict(config):
+def get_config_dict(config, device=None, command=None, shared=False):
     """ Cast config to Configuration dict
 
         Args:
             config ('str'): config string
+            device ('obj'): Device the config comes from. When given, only
+                            the sections not seen before on the device are
+                            parsed. Default to None
+            command ('str'): Command the config was fetched with, to diff
+                             it with the next fetch. Default to None
+            shared ('bool'): Return the dict shared with the device config
+                             tree cache instead of a copy, for a caller
+                             which does not modify it. Default to False
         Returns:
             Configuration dict
     """
+    if device is not None:
+        cache = ConfigTreeCache.get(device)
+        if command:
+            config_dict = cache.refresh(command, config)[0].config
+        else:
+            config_dict = cache.tree(config).config
+        return config_dict if shared else copy.deepcopy(config_dict)
+
     cfg = Config(config)
     cfg.tree()
     return cfg.config
@@ -250,10 +270,7 @@ def compare_config_dicts(a, b, exclude=None):
     if exclude:
         excludes.extend(exclude)
 
-    diff = Diff(a, b, exclude=excludes)
-    diff.findDiff()
-
-    return str(diff)
+    return str(diff_config_dicts(a, b, exclude=excludes))
 
 
 def copy_pcap_file(testbed, filename, command=None):
@@ -387,7 +404,8 @@ def copy_to_server(testbed,
             local_path ('str'): File to copy, including path
             remote_path ('str'): Where to save the file, including file name
             timeout('int'): timeout value in seconds, default 300
-            fu_session ('obj'): existing FileUtils object to reuse
+            fu_session ('obj'): existing FileUtils object to reuse.
+                                Default to the shared session of the server
             quiet ('bool'): quiet mode -- does not print copy progress
         Returns:
             None
@@ -407,7 +425,7 @@ def copy_to_server(testbed,
                         **kwargs)
 
     else:
-        with FileUtils(testbed=testbed) as fu:
+        with session_pool.session(testbed, server, protocol) as fu:
             _copy_to_server(protocol,
                             server,
                             local_path,
@@ -1203,7 +1221,8 @@ def get_file_size_from_server(device,
         path ('str'): file path on server to check
         protocol ('srt'): protocol used to check file size
         timeout ('int'): check size timeout in seconds
-        fu_session ('obj'): existing FileUtils object to reuse
+        fu_session ('obj'): existing FileUtils object to reuse.
+                            Default to the shared session of the server
     Returns:
          integer representation of file size in bytes
     """
@@ -1213,7 +1232,7 @@ def get_file_size_from_server(device,
                                           protocol,
                                           timeout=timeout,
                                           fu_session=fu_session)
-    with FileUtils(testbed=device.testbed) as fu:
+    with session_pool.session(device.testbed, server, protocol) as fu:
         return _get_file_size_from_server(server,
                                           path,
                                           protocol,
@@ -1381,6 +1400,8 @@ def delete_file_on_server(testbed,
         path ('str'): file path on server
         protocol ('str'): protocol used for deletion, defaults to sftp
         timeout ('int'):  connection timeout
+        fu_session ('obj'): existing FileUtils object to reuse.
+                            Default to the shared session of the server
     Returns:
         None
     """
@@ -1390,7 +1411,7 @@ def delete_file_on_server(testbed,
                                       protocol=protocol,
                                       timeout=timeout,
                                       fu_session=fu_session)
-    with FileUtils(testbed=testbed) as fu:
+    with session_pool.session(testbed, server, protocol) as fu:
         return _delete_file_on_server(server,
                                       path,
                                       protocol=protocol,
@@ -1534,11 +1555,8 @@ def compared_with_running_config(device, config):
             Diff
     """
     current = device.api.get_running_config_dict()
-    diff = Diff(current, config)
-
-    diff.findDiff()
 
-    return diff
+    return diff_config_dicts(current, config)
 
 
 def diff_configuration(device, config1, config2):
@@ -1551,16 +1569,47 @@ def diff_configuration(device, config1, config2):
         Returns:
             Diff
     """
-    configObject1 = Config(config1)
-    configObject2 = Config(config2)
-    configObject1.tree()
-    configObject2.tree()
+    cache = ConfigTreeCache.get(device)
 
-    diff = Diff(configObject1.config, configObject2.config)
+    return cache.tree(config1).diff(cache.tree(config2))
 
-    diff.findDiff()
 
-    return diff
+def get_running_config_tree(device, command='show running-config'):
+    """ Get the configuration tree of the running-config, indexed by
+        top-level keyword. Only the sections which changed since the
+        previous call are parsed.
+        Args:
+            command ('str'): Command to get the running-config.
+                             Default to 'show running-config'
+        Raise:
+            SubCommandFailure
+        Returns:
+            ConfigTree
+    """
+    output = device.execute(command)
+
+    return ConfigTreeCache.get(device).refresh(command, output)[0]
+
+
+def get_running_config_changes(device, command='show running-config',
+                               exclude=None):
+    """ Show difference between the running-config and the one fetched
+        by the previous call, diffing only the sections which changed
+        Args:
+            command ('str'): Command to get the running-config.
+                             Default to 'show running-config'
+            exclude ('list'): List of items to ignore. Supports Regex.
+        Raise:
+            SubCommandFailure
+        Returns:
+            Diff, or None if the running-config was not fetched before
+    """
+    output = device.execute(command)
+    current, previous = ConfigTreeCache.get(device).refresh(command, output)
+    if previous is None:
+        return None
+
+    return previous.diff(current, exclude=exclude)
 
 
 def dynamic_diff_parameterized_running_config(device,
@@ -2203,6 +2252,68 @@ def repeat_command_save_output(device, command, command_interval,
     return path
 
 
+def start_command_recorder(device, commands, interval=60, devices=None,
+                           name='default', directory=None, alias='recorder'):
+    """
+        Start recording {commands} every {interval} seconds on the device, and
+        on {devices}, in the background. Outputs are appended to a compressed
+        file per device while they are collected.
+
+        Args:
+            device ('obj'): Device object
+            commands ('list'): Commands to record
+            interval ('int'): Seconds between two runs of each command.
+                              Default to 60
+            devices ('list'): Names of other testbed devices to record the
+                              commands on. Default to None
+            name ('str'): Name of the recorder, to stop it later.
+                          Default to 'default'
+            directory ('str'): Directory of the output files. Default to the
+                               runtime directory
+            alias ('str'): Alias of the connection opened to run the commands,
+                           None to use the default connection.
+                           Default to 'recorder'
+
+        Raises:
+            RuntimeError: A recorder with the same name is already running
+
+        Returns:
+            List of devices the commands are recorded on
+    """
+    recorder = CommandRecorder(directory=directory or runtime.directory,
+                               name=name, alias=alias)
+    recorder.add(device, commands, interval=interval)
+    for device_name in devices or []:
+        recorder.add(device.testbed.devices[device_name], commands,
+                     interval=interval)
+    recorder.start()
+
+    return [device.name] + list(devices or [])
+
+
+def stop_command_recorder(device, name='default'):
+    """
+        Stop the background command recorder {name}
+
+        Args:
+            device ('obj'): Device object
+            name ('str'): Name of the recorder. Default to 'default'
+
+        Raises:
+            None
+
+        Returns:
+            Dict of device name to output file, empty if no recorder was
+            running
+    """
+    recorder = get_recorder(name)
+    if recorder is None:
+        log.warning("No command recorder named '{}' is running".format(name))
+        return {}
+
+    return recorder.stop()
+
+
 def send_email(from_email,
                to_email,
                subject='',
@@ -91,7 +91,8 @@ def learn_routing(device,
                   address_family,
                   paths,
                   ops_container=None,
-                  ret_container=None):
+                  ret_container=None,
+                  routing_ops=None):
     '''Dynamic learn routing information by using the paths that specified,
     and store the data into dictionary.
 
@@ -105,6 +106,9 @@ def learn_routing(device,
                                 in case multiple learning
         ret_container (`dict`) : Container to store the learned routes
                                  to let parent update on it
+        routing_ops (`obj`): Routing ops already learned on the device, to
+                             get the routes of another address family
+                             without learning it again
 
     Returns:
         None. Instead of returned values, it will store the learned
@@ -130,14 +134,15 @@ def learn_routing(device,
     if ret_container is None:
         ret_container = {}
     log.info(banner(f"learn routing info on device {device.name}"))
-    # get ip and vrf
-    routing_ops = ops.routing.iosxe.routing.Routing(device)
-
-    # learn the routing ops
-    try:
-        routing_ops.learn()
-    except Exception as e:
-        raise Exception(f'cannot learn routing ops: {e}')
+    if routing_ops is None:
+        # get ip and vrf
+        routing_ops = ops.routing.iosxe.routing.Routing(device)
+
+        # learn the routing ops
+        try:
+            routing_ops.learn()
+        except Exception as e:
+            raise Exception(f'cannot learn routing ops: {e}')
 
     ops_container[device.name] = routing_ops
 
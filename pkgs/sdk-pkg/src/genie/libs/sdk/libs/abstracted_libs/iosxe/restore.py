@@ -15,6 +15,7 @@ from genie.metaparser.util.exceptions import SchemaEmptyParserError
 
 # Genie
 from genie.utils.diff import Diff, Config
+from genie.libs.sdk.libs.utils.config_tree import ConfigTreeCache
 
 # Logger
 log = logging.getLogger(__name__)
@@ -222,22 +223,20 @@ class Restore(object):
                     else:
                         exclude.extend(compare_exclude)
 
+                # Only the sections which differ from the ones seen before
+                # on the device are parsed
+                cache = ConfigTreeCache.get(device)
+
                 # show run
                 show_run_output = device.execute('show running-config')
-                show_run_config = Config(show_run_output)
-                show_run_config.tree()
+                show_run_config = cache.tree(show_run_output)
 
                 # location:<filename> contents
                 more_file = device.execute('more {}'.format(self.to_url))
-                more_file_config = Config(more_file)
-                more_file_config.tree()
+                more_file_config = cache.tree(more_file)
 
                 # Diff 'show run' and config replace file contents
-                diff = Diff(
-                    show_run_config.config,
-                    more_file_config.config,
-                    exclude=exclude)
-                diff.findDiff()
+                diff = show_run_config.diff(more_file_config, exclude=exclude)
 
                 # Check for differences
                 if len(diff.diffs):
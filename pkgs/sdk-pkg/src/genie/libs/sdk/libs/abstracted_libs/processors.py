@@ -8,6 +8,9 @@ import copy
 import logging
 import shutil
 import zipfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # pyats
 from pyats.async_ import pcall
@@ -27,9 +30,6 @@ except ImportError:
 # # import pcall
 # from pyats.async import pcall
 
-# Abstract
-from genie.abstract import Lookup
-
 # Genie
 from genie.harness.exceptions import GenieTgnError
 from genie.harness.utils import connect_device
@@ -45,10 +45,12 @@ from genie.libs import ops
 from genie.libs import sdk
 from genie.libs import parser
 from genie.libs.sdk.libs.utils.normalize import GroupKeys
+from genie.libs.sdk.libs.utils.abstract_index import LazyLookup
 from genie.utils import Dq
 
 # 3rd party
 import requests
+from prettytable import PrettyTable as ptable
 
 log = logging.getLogger(__name__)
 
@@ -174,7 +176,7 @@ def learn_free_interfaces(section, configs):
         if os.path.isfile(configs):
             configs = yaml.safe_load(open(configs))
         elif isinstance(configs, str):
-            module = Lookup.from_device(uut)
+            module = LazyLookup.from_device(uut)
             path = configs.split('.')
             for item in path:
                 module = getattr(module, item)
@@ -183,7 +185,7 @@ def learn_free_interfaces(section, configs):
             section.skipped('The configs type {} is not supported'
                             .format(type(configs)))
 
-        lookup = Lookup.from_device(uut)
+        lookup = LazyLookup.from_device(uut)
         # learn the lldp neighbors
         if not hasattr(uut, 'lldp_mapping'):
             log.info(banner('Learn LLDP Neighbors'))
@@ -300,7 +302,7 @@ def load_config_precessor(section, configs, unconfig=False, sleep=None):
         if os.path.isfile(configs):
             configs = yaml.safe_load(open(configs))
         elif isinstance(configs, str):
-            module = Lookup.from_device(uut)
+            module = LazyLookup.from_device(uut)
             path = configs.split('.')
             for item in path:
                 module = getattr(module, item)
@@ -400,17 +402,262 @@ def load_config_precessor(section, configs, unconfig=False, sleep=None):
         time.sleep(sleep) if sleep else None
 
 
-def ping_devices(section, ping_parameters, expect_result='passed'):
+def _routing_paths(af):
+    '''Ops paths of the connected routes of an address family'''
+    return [['info', 'vrf', '(?P<vrf>.*)', 'address_family',
+             af, 'routes', '(?P<route>.*)',
+             'source_protocol', 'connected'],
+            ['info', 'vrf', '(?P<vrf>.*)', 'address_family',
+             af, 'routes', '(?P<route>.*)', 'next_hop',
+             'outgoing_interface', '(?P<intf>.*)',
+             'outgoing_interface', '(?P<intf>.*)']]
+
+
+class PingMatrix(object):
+    '''Ping matrix used by the ping_devices processor.
+
+    The routing information of a device is learned once, for all the address
+    families of the pairs it is part of. The pairs of different
+    source devices are pinged concurrently, the pairs of one source device
+    one after the other. Only the pairs which failed are pinged again on the
+    next iteration, until their own timeout expires.
+
+    Args:
+        testbed (`obj`): Testbed object
+        ping_parameters (`list`): list of ping needed parameters, as given to
+                                  the ping_devices processor
+        expect_result (`str`): 'passed' if the pings are expected to succeed
+        max_workers (`int`): Maximum number of devices handled at the same
+                             time. Default to one per device
+    '''
+
+    def __init__(self, testbed, ping_parameters, expect_result='passed',
+                 max_workers=None):
+        self.testbed = testbed
+        self.expect_result = expect_result
+        self.max_workers = max_workers
+
+        # device name -> learned routing ops
+        self.routing_opses = {}
+        # device name -> address families whose peers are learned
+        self.learned = {}
+        # af -> {route: {ip: {device name: keys}}}
+        self.peers = {}
+
+        self.pairs = []
+        for item in ping_parameters:
+            self.pairs.append({
+                'item': item,
+                'src': testbed.devices[item['src']],
+                'dest': testbed.devices[item['dest']],
+                'af': 'ipv4' if item['ping']['proto'] == 'ip' else 'ipv6',
+                'timeout': Timeout(max_time=item['timeout_max_time'],
+                                   interval=item['timeout_interval']),
+                'passed': False})
+
+    def _workers(self, jobs):
+        return max(1, min(len(jobs), self.max_workers or len(jobs)))
+
+    def _learn_device(self, device, afs, routing_ops=None):
+        '''Learn the routing ops of the device, unless given, and get the
+        peers of each address family from it'''
+        lookup = LazyLookup.from_device(device)
+        opses = {}
+        peers = {}
+        for af in afs:
+            af_peers = peers[af] = {}
+            lookup.sdk.libs.abstracted_libs.processors.learn_routing(
+                device, af, _routing_paths(af), ops_container=opses,
+                ret_container=af_peers, routing_ops=routing_ops)
+            routing_ops = opses.get(device.name, routing_ops)
+        return routing_ops, peers
+
+    def learn(self, pairs):
+        '''Learn the routing information of the devices of the pairs, which
+        is not learned yet. Each device is learned once, for all the address
+        families it is needed for, and the devices are learned concurrently.
+
+        Returns:
+            `set`: names of the devices which could not be learned
+        '''
+        jobs = {}
+        for pair in pairs:
+            for dev in (pair['src'], pair['dest']):
+                if pair['af'] not in self.learned.get(dev.name, ()):
+                    job = jobs.setdefault(dev.name, (dev, []))
+                    if pair['af'] not in job[1]:
+                        job[1].append(pair['af'])
+        if not jobs:
+            return set()
+
+        failed = set()
+        with ThreadPoolExecutor(max_workers=self._workers(jobs)) as executor:
+            futures = {name: executor.submit(self._learn_device, dev, afs,
+                                             self.routing_opses.get(name))
+                       for name, (dev, afs) in jobs.items()}
+            for name, future in futures.items():
+                try:
+                    routing_ops, peers = future.result()
+                except Exception as e:
+                    log.warning(
+                        'Cannot learn routing information on {d}\n{e}'.format(
+                            d=name, e=e))
+                    failed.add(name)
+                    continue
+                self.routing_opses[name] = routing_ops
+                for af, af_peers in peers.items():
+                    self.learned.setdefault(name, set()).add(af)
+                    all_peers = self.peers.setdefault(af, {})
+                    for route, ips in af_peers.items():
+                        for ip, devices in ips.items():
+                            all_peers.setdefault(route, {}).\
+                                setdefault(ip, {}).update(devices)
+        return failed
+
+    def forget(self, pair):
+        '''Learn again the devices of the pair on the next iteration'''
+        for dev in (pair['src'], pair['dest']):
+            self.routing_opses.pop(dev.name, None)
+            self.learned.pop(dev.name, None)
+
+    def routes(self, af):
+        '''Routes shared by exactly two addresses'''
+        return {route: ips for route, ips in self.peers.get(af, {}).items()
+                if len(ips) == 2}
+
+    def ping_values(self, pair, routes):
+        '''Addresses, and vrf, of the peers of the source device'''
+        src = pair['src']
+        ping_values = []
+        for key in list(routes.keys())[:pair['item']['peer_num']]:
+            for route, devices in routes[key].items():
+                if src.name in devices:
+                    peer_route = [ip for ip in routes[key] if ip != route][0]
+                    if devices[src.name]['vrf'] == 'default':
+                        ping_values.append(
+                            {'addr': peer_route.split('/')[0]})
+                    else:
+                        ping_values.append({
+                            'addr': peer_route.split('/')[0],
+                            'command': 'ping vrf {}'.format(
+                                devices[src.name]['vrf'])})
+                    break
+        return ping_values
+
+    def ping(self, pair, routes):
+        '''Ping the first peer of the source device of the pair'''
+        src = pair['src']
+        item = pair['item']
+        ping_values = self.ping_values(pair, routes)
+        if not ping_values:
+            log.info('No peer address to ping from {}'.format(src.name))
+            return True
+
+        ping_args = dict(item['ping'], **ping_values[0])
+        log.info(banner('Ping with args {a} on {d}'.format(a=ping_args,
+                                                          d=src.name)))
+        try:
+            out = src.ping(**ping_args)
+        except SubCommandFailure as e:
+            if 'pass' in self.expect_result:
+                log.warning('ping failed\n{}, try again.'.format(e))
+                return False
+            log.info('ping failed as expected')
+            return True
+
+        ret = re.search(r'Success +rate +is +(\d+) +percent', out)
+        perc = ret.groups()[0] if ret else None
+        if perc == str(item['exp_succ_perc']):
+            log.info('ping successed with {}% percent'.format(
+                item['exp_succ_perc']))
+            return True
+        log.warning('ping failed. Expected percent: {e} But got: {r}'.format(
+            e=item['exp_succ_perc'], r=perc))
+        return False
+
+    def _ping_source(self, pairs):
+        # pairs of one source device, pinged one after the other
+        results = []
+        for pair in pairs:
+            routes = self.routes(pair['af'])
+            if not routes:
+                log.warning('No peer routes learned for {s} and {d}, '
+                            'Try again'.format(s=pair['src'].name,
+                                               d=pair['dest'].name))
+                self.forget(pair)
+                results.append(False)
+                continue
+            results.append(self.ping(pair, routes))
+        return results
+
+    def iterate(self, pairs):
+        '''Learn and ping the pairs once
+
+        Returns:
+            `list`: pairs which failed
+        '''
+        failed_learn = self.learn(pairs)
+
+        by_source = {}
+        failed = []
+        for pair in pairs:
+            if {pair['src'].name, pair['dest'].name} & failed_learn:
+                failed.append(pair)
+            else:
+                by_source.setdefault(pair['src'].name, []).append(pair)
+
+        if by_source:
+            log.info('Get the routing group information as {}'.format(
+                self.peers))
+            with ThreadPoolExecutor(
+                    max_workers=self._workers(by_source)) as executor:
+                futures = [(source_pairs,
+                            executor.submit(self._ping_source, source_pairs))
+                           for source_pairs in by_source.values()]
+                for source_pairs, future in futures:
+                    for pair, passed in zip(source_pairs, future.result()):
+                        pair['passed'] = passed
+                        if not passed:
+                            failed.append(pair)
+        return failed
+
+    def run(self):
+        '''Ping all the pairs, retrying the failed ones until their timeout
+        expires.
+
+        Returns:
+            `list`: pairs which did not pass
+        '''
+        pending = [pair for pair in self.pairs if pair['timeout'].iterate()]
+        while pending:
+            failed = self.iterate(pending)
+            if failed:
+                # wait for the failed pair with the shortest interval
+                min(failed, key=lambda pair: pair['item']['timeout_interval'])\
+                    ['timeout'].sleep()
+            pending = [pair for pair in failed if pair['timeout'].iterate()]
+        return [pair for pair in self.pairs if not pair['passed']]
+
+
+def ping_devices(section, ping_parameters, expect_result='passed',
+                 max_workers=None):
     '''PING prepostprocessor. Will ping two ends ip addresses
     from given devices ( learned by alias )
 
     Can be controlled via sections parameters which is provided by the
     triggers/verification datafile
 
+    The routing information of each device is learned once, and the pings of
+    different source devices run concurrently. See `PingMatrix`.
+
     Args:
       Mandatory:
         section (`obj`): Aetest Subsection object.
         ping_parameters (`list`) : list of ping needed parameters
+      Optional:
+        expect_result (`str`): 'passed' if the pings are expected to succeed
+        max_workers (`int`): Maximum number of devices pinging at the same
+                             time. Default to one per device
 
     Returns:
         AETEST results
@@ -431,136 +678,16 @@ def ping_devices(section, ping_parameters, expect_result='passed'):
     # get testbed object
     testbed = section.parameters.get('testbed', {})
 
-    # store the learned routing ops
-    routing_opses = {}
-    peers = {}
-
-    # ping roll up result
-    ping_pass = True
-    relearn = False
-
-    for item in ping_parameters:
-        src = testbed.devices[item['src']]
-        dest = testbed.devices[item['dest']]
-        log.info(banner(
-            "Get sorce device {s} and destnation device {d}"
-            .format(s=src.name, d=dest.name)))
-        lookup = Lookup.from_device(src)
-
-        # create timeout for looping the ping
-        timeout = Timeout(max_time=item['timeout_max_time'],
-                          interval=item['timeout_interval'])
-
-        # determine af
-        af = 'ipv4' if item['ping']['proto'] == 'ip' else 'ipv6'
+    matrix = PingMatrix(testbed, ping_parameters,
+                        expect_result=expect_result, max_workers=max_workers)
+    failed = matrix.run()
 
-        # routing path for getting desired routes
-        paths = [['info', 'vrf', '(?P<vrf>.*)', 'address_family',
-                  af, 'routes', '(?P<route>.*)',
-                  'source_protocol', 'connected'],
-                 ['info', 'vrf', '(?P<vrf>.*)', 'address_family',
-                  af, 'routes', '(?P<route>.*)', 'next_hop',
-                  'outgoing_interface', '(?P<intf>.*)',
-                  'outgoing_interface', '(?P<intf>.*)']]
-
-        while timeout.iterate():
-            for dev in [src, dest]:
-                if dev.name not in routing_opses or relearn:
-
-                    # learn the routing ops
-                    try:
-                        ret = lookup.sdk.libs.abstracted_libs.processors.learn_routing(
-                            dev, af, paths, ops_container=routing_opses, ret_container=peers)
-                    except Exception as e:
-                        log.warning(
-                            'Cannot learn routing information on {d}\n{e}' .format(
-                                d=dev.name, e=e))
-                        relearn = True
-                        ping_pass = False
-                        timeout.sleep()
-                        continue
-
-            # trim the ones not a peer
-            trim_item = []
-            for group in peers:
-                if len(peers[group].keys()) != 2:
-                    trim_item.append(group)
-            for group in trim_item:
-                peers.pop(group)
-
-            if not peers:
-                log.warning('No peer routes learned, Try again')
-                relearn = True
-                ping_pass = False
-                timeout.sleep()
-                continue
-            else:
-                # has the routes, no need relearn it again
-                relearn = False
-
-            log.info('Get the routing group information as {}'.format(peers))
-
-            ping_values = []
-
-            # select ip and vrf to ping
-            for key in list(peers.keys())[:item['peer_num']]:
-                routes = list(peers[key].keys())
-                for route in peers[key]:
-                    if src.name in peers[key][route]:
-                        # ping during peer devices
-                        routes.remove(route)
-                        peer_route = routes[0]
-                        if peers[key][route][src.name]['vrf'] == 'default':
-                            ping_values.append(
-                                {'addr': peer_route.split('/')[0]})
-                        else:
-                            ping_values.append({'addr': peer_route.split(
-                                '/')[0], 'command': 'ping vrf {}'.format(peers[key][route][src.name]['vrf'])})
-                        break
-
-            for ping_item in ping_values:
-                item['ping'].update(ping_item)
-                log.info(
-                    banner(
-                        'Ping with args {a} on {d}'.format(
-                            a=item['ping'],
-                            d=src.name)))
-                try:
-                    out = src.ping(**item['ping'])
-                except SubCommandFailure as e:
-                    if 'pass' in expect_result:
-                        log.warning('ping failed\n{}, try again.'.format(e))
-                        ping_pass = False
-                        break
-                    else:
-                        log.info('ping failed as expected')
-                        ping_pass = True
-                        break
-
-                ret = re.search(r'Success +rate +is +(\d+) +percent', out)
-                perc = ret.groups()[0]
-                if perc == str(item['exp_succ_perc']):
-                    log.info(
-                        'ping successed with {}% percent'.format(
-                            item['exp_succ_perc']))
-                    ping_pass = True
-                    break
-                else:
-                    log.warning(
-                        'ping failed. Expected percent: {e} But got: {r}' .format(
-                            e=item['exp_succ_perc'], r=perc))
-                    ping_pass = False
-                    break
-
-            if ping_pass:
-                break
-            else:
-                timeout.sleep()
-                continue
-
-        if not ping_pass:
-            section.passx(
-                'PING PRE POST PROCESSOR FAILED, SKIPPED THE TRIGGER')
+    if failed:
+        log.warning('Ping failed between {}'.format(', '.join(
+            '{s} and {d}'.format(s=pair['src'].name, d=pair['dest'].name)
+            for pair in failed)))
+        section.passx(
+            'PING PRE POST PROCESSOR FAILED, SKIPPED THE TRIGGER')
 
 
 def debug_dumper(section, commands):
@@ -642,7 +769,7 @@ def traceroute_loopback(section, traceroute_args, action='traceroute'):
         log.info(banner(
             "Get source device {s} and destination device {d}"
             .format(s=src.name, d=dest.name)))
-        lookup = Lookup.from_device(src)
+        lookup = LazyLookup.from_device(src)
 
         # determine af
         af = 'ipv6' if item['protocol'] == 'ipv6' else 'ipv4'
@@ -949,7 +1076,7 @@ def get_uut_neighbor(section, **kwargs):
                 uut.name)
 
         # learning ops routing ops
-        lookup = Lookup.from_device(uut)
+        lookup = LazyLookup.from_device(uut)
         route_ret = lookup.ops.routing.routing.Routing(uut, attributes=[
             'info[vrf][(.*)][address_family][(.*)][routes][(.*)][source_protocol]',
             'info[vrf][(.*)][address_family][(.*)][routes][(.*)][active]'])
@@ -1118,7 +1245,7 @@ def restore_running_configuration(section,
         Internal function _restore_running_configuration for pcall 
         '''
         # Abstract
-        lookup = Lookup.from_device(device, packages={'sdk': sdk})
+        lookup = LazyLookup.from_device(device, packages={'sdk': sdk})
         restore = lookup.sdk.libs.abstracted_libs.restore.Restore()
 
         if hasattr(section, 'trigger_config'):
@@ -1198,7 +1325,7 @@ def save_running_configuration(section, devices=None, copy_to_standby=False, no_
         '''
 
         # Abstract
-        lookup = Lookup.from_device(device, packages={'sdk': sdk})
+        lookup = LazyLookup.from_device(device, packages={'sdk': sdk})
         restore = lookup.sdk.libs.abstracted_libs.restore.Restore()
 
         # Get default directory
@@ -1275,7 +1402,7 @@ def clear_logging(section, devices=None):
     for dev in devices:
         device = section.parameters['testbed'].devices[dev]
         # Abstract
-        lookup = Lookup.from_device(device, packages={'sdk': sdk})
+        lookup = LazyLookup.from_device(device, packages={'sdk': sdk})
         clear_log = lookup.sdk.libs.abstracted_libs.clear_logging.ClearLogging()
 
         # Clear logging on device
@@ -1293,37 +1420,199 @@ def clear_logging(section, devices=None):
 # ==============================================================================
 
 
-def pre_execute_command(section,
-                        devices=None,
-                        sleep_time=0,
-                        max_retry=1,
-                        save_to_file='',
-                        zipped_folder=''):
+class _CommandOutputArchive(object):
+    '''Outputs saved by the execute_command processors.
+
+    The outputs are written as text files in a folder, or, when the folder
+    would only be zipped and removed, streamed straight into the zip file.
+    Each device writes its own files, the zip file is written by one device
+    at a time. A zip entry cannot be appended to, so the outputs of a
+    per_device file are spooled to a temporary file until the device is
+    done.
     '''
-    Execute commands as processors. This can be run only with specified condition and the log can be archived with text file or zip file.
 
-    Can be controlled via sections parameters which is provided by the datafile
+    def __init__(self, folder_name, save_to_file, stream=False):
+        self.folder_name = folder_name
+        self.save_to_file = save_to_file
+        self.stream = stream
+        # local path -> file name, for the files written in the folder
+        self.file_list = {}
+        self._zip = None
+        # file name -> temporary file, for the per_device files streamed
+        self._spools = {}
+        self._lock = threading.Lock()
+
+    @property
+    def zip_name(self):
+        return self.folder_name + '.zip'
+
+    def open(self):
+        if self.stream:
+            self._zip = zipfile.ZipFile(self.zip_name, 'w',
+                                        zipfile.ZIP_DEFLATED)
+        else:
+            os.mkdir(self.folder_name)
 
-    Args:
-        section (`obj`) : Aetest Subsection object.
-        device (`obj`) : Device object.
-        sleep_time (`int`) : sleep after all commands (unit: seconds)
-        max_retry (`int`) : Retry issuing command in case any error (max_retry 1 by default)
-        save_to_file (`str`) : Set either one of below modes when show output needs to be saved as file. folder for the processor is generated and store files in the folder. (Disabled by default)
-                                 per_device : file generated per device
-                                 per_command : file generated per command
-        zipped_folder (`bool`) : Set if archive folder needs to be zipped.
-                                 If True, zip file generated and removed the folder with files. 
+    def file_name(self, dev, device, exec_cmd):
+        if self.save_to_file == 'per_device':
+            return dev + '.txt'
+        return dev + '_' + device.api.slugify(exec_cmd) + '.txt'
 
-    Returns:
-        AETEST results
+    def write(self, file_name, output):
+        '''Write the output in the folder, appended to the device file in
+        per_device mode
+        '''
+        local_path = self.folder_name + '/' + file_name
+        mode = 'a' if self.save_to_file == 'per_device' else 'w'
+        with open(local_path, mode) as f:
+            f.write(output)
+        with self._lock:
+            self.file_list[local_path] = file_name
+        log.info("File {file} saved to folder {folder}".format(
+            file=file_name, folder=self.folder_name))
+
+    def add(self, file_name, output):
+        '''Stream an output into the zip file, or into the temporary file
+        of its device in per_device mode
+        '''
+        if self.save_to_file == 'per_device':
+            with self._lock:
+                spool = self._spools.get(file_name)
+                if spool is None:
+                    spool = self._spools[file_name] = \
+                        tempfile.TemporaryFile()
+            # a device file is only written by the thread of the device
+            spool.write(output.encode())
+            return
+        with self._lock:
+            self._zip.writestr(file_name, output)
+        log.info("File {file} saved to zip file {zip}".format(
+            file=file_name, zip=self.zip_name))
+
+    def done(self, dev):
+        '''Move the per_device file of a device into the zip file'''
+        if self.save_to_file != 'per_device':
+            return
+        file_name = self.file_name(dev, None, None)
+        with self._lock:
+            spool = self._spools.pop(file_name, None)
+            if spool is None:
+                return
+            with spool:
+                spool.seek(0)
+                with self._zip.open(file_name, 'w') as entry:
+                    shutil.copyfileobj(spool, entry)
+        log.info("File {file} saved to zip file {zip}".format(
+            file=file_name, zip=self.zip_name))
+
+    def close(self):
+        for spool in self._spools.values():
+            spool.close()
+        self._spools.clear()
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+def _execute_device_commands(section, dev, device, cmds, max_retry, archive,
+                             timings):
+    '''Execute the commands of a device one after the other.
 
-    Raises:
-        None
+    Returns:
+        (`bool`, `str`): whether a command was executed, and the command
+                         which reached the max number of retries, if any
     '''
-    # Init
-    log.info(banner("processor: 'execute_command'"))
+    executed = False
+    try:
+        for cmd in cmds:
+            if cmd.get('condition') and section.result not in list(
+                    map(TestResult.from_str, cmd['condition'])):
+                continue
+            exec_cmd = cmd.get('cmd', '')
+            pattern = cmd.get('pattern', '')
+            answer = cmd.get('answer', '')
+            cmd_sleep = cmd.get('sleep', 0)
+            cmd_timeout = cmd.get('timeout', 60)
+
+            start = time.time()
+            for attempt in range(1, max_retry + 2):
+                try:
+                    # handle prompt if pattern and answer is in the
+                    # datafile
+                    if pattern:
+                        if isinstance(pattern, str):
+                            pattern = [pattern]
+                        statement_list = []
+                        for p in pattern:
+                            statement_list.append(
+                                Statement(
+                                    pattern=p,
+                                    action='sendline({})'.format(answer),
+                                    loop_continue=True,
+                                    continue_timer=False))
+                        dialog = Dialog(statement_list)
+                        output = device.execute(exec_cmd,
+                                                reply=dialog,
+                                                timeout=cmd_timeout)
+                    else:
+                        output = device.execute(exec_cmd,
+                                                timeout=cmd_timeout)
+                except SubCommandFailure as e:
+                    log.error(
+                        'Failed to execute "{cmd}" on device {d}: {e}'.
+                        format(cmd=exec_cmd, d=device.name, e=str(e)))
+                    device.destroy()
+                    log.info('Trying to recover after execution failure')
+                    connect_device(device)
+                else:
+                    log.info(
+                        "Successfully executed command '{cmd}' device {d}".
+                        format(cmd=exec_cmd, d=device.name))
+                    # sleep if any command is successfully executed
+                    executed = True
+                    break
+            # didn't break loop, which means command execution is failed
+            else:
+                timings.append((dev, exec_cmd, attempt, time.time() - start,
+                                'Failed'))
+                return executed, exec_cmd
+
+            timings.append((dev, exec_cmd, attempt, time.time() - start,
+                            'Passed'))
+
+            # save output to file as per device or command
+            if archive:
+                output = '+' * 10 + ' ' + datetime.datetime.now().strftime(
+                    '%Y-%m-%d %H:%M:%S.%f'
+                ) + ': ' + dev + ': executing command \'' + exec_cmd + \
+                    '\' ' + '+' * 10 + '\n' + output + '\n'
+                file_name = archive.file_name(dev, device, exec_cmd)
+                if archive.stream:
+                    archive.add(file_name, output)
+                else:
+                    archive.write(file_name, output)
+
+            # if sleep is under the command, sleep after execution
+            if cmd_sleep:
+                log.info("Sleeping for {sleep_time} seconds".format(
+                    sleep_time=cmd_sleep))
+                time.sleep(cmd_sleep)
+    finally:
+        if archive and archive.stream:
+            archive.done(dev)
+
+    return executed, None
+
+
+def _execute_command_processor(section, processor, devices, sleep_time,
+                               max_retry, save_to_file, zipped_folder,
+                               server_to_store=None, max_workers=None):
+    '''Execute the commands of the pre/post_execute_command processors.
 
+    Devices run concurrently, and the commands of one device one after the
+    other. The outputs are zipped without an intermediate folder, unless
+    they have to be copied to a server first.
+    '''
     # sanitize arguments
     if save_to_file and save_to_file not in ['per_device', 'per_command']:
         section.errored(
@@ -1335,34 +1624,7 @@ def pre_execute_command(section,
     elif save_to_file and not isinstance(zipped_folder, bool):
         section.errored("`zipped_folder` must be True or False in datafile")
 
-    # prepare save location
-    if save_to_file:
-        file_list = {}
-        now = datetime.datetime.now()
-        timestamp_format = '%Y%m%d_%H%M%S'
-        folder_log = '_'.join(
-            [section.parent.uid, section.uid,
-             'pre_execute_command', now.strftime(timestamp_format)])
-        folder_name = runtime.directory + '/' + folder_log
-        try:
-            os.mkdir(folder_name)
-            log.info(
-                "Folder `{folder}` is created for `save_to_file` with mode {mode}"
-                .format(folder=folder_name, mode=save_to_file))
-        except Exception:
-            section.errored(
-                "Failed to create folder `{folder_name}` for `save_to_file`".
-                format(folder_name=folder_name))
-        if zipped_folder:
-            try:
-                zip = zipfile.ZipFile(folder_name + '.zip', 'w',
-                                      zipfile.ZIP_DEFLATED)
-            except Exception:
-                section.errored(
-                    "Failed to create zip file: {file} for `save_to_file`".
-                    format(file=folder_name + '.zip'))
-
-    sleep_if_cmd_executed = False
+    jobs = []
     for dev in devices:
         if dev == 'uut':
             device = section.parameters['uut']
@@ -1378,127 +1640,179 @@ def pre_execute_command(section,
         # if device not in TB or not connected, then skip
         if not device or not device.is_connected():
             continue
-        # execute list of commands given in yaml
-        for cmd in devices[dev].get('cmds', []):
-            if not cmd.get('condition') or section.result in list(
-                    map(TestResult.from_str, cmd['condition'])):
-                exec_cmd = cmd.get('cmd', '')
-                pattern = cmd.get('pattern', '')
-                answer = cmd.get('answer', '')
-                cmd_sleep = cmd.get('sleep', 0)
-                cmd_timeout = cmd.get('timeout', 60)
+        cmds = devices[dev].get('cmds', [])
+        if cmds:
+            jobs.append((dev, device, cmds))
 
-                for _ in range(max_retry + 1):
-                    try:
-                        # handle prompt if pattern and answer is in the
-                        # datafile
-                        if pattern:
-                            if isinstance(pattern, str):
-                                pattern = [pattern]
-                            statement_list = []
-                            for p in pattern:
-                                statement_list.append(
-                                    Statement(
-                                        pattern=p,
-                                        action='sendline({})'.format(answer),
-                                        loop_continue=True,
-                                        continue_timer=False))
-                            dialog = Dialog(statement_list)
-                            output = device.execute(exec_cmd,
-                                                    reply=dialog,
-                                                    timeout=cmd_timeout)
-                        else:
-                            output = device.execute(exec_cmd,
-                                                    timeout=cmd_timeout)
-                        # save output to file as per device or command
-                        if save_to_file == 'per_device':
-                            file_name = folder_name + '/' + dev
-                            save_file_name = file_name.split('/')[-1] + '.txt'
-                            with open(file_name + '.txt', 'a') as f:
-                                output = '+' * 10 + ' ' + datetime.datetime.now(
-                                ).strftime(
-                                    '%Y-%m-%d %H:%M:%S.%f'
-                                ) + ': ' + dev + ': executing command \'' + exec_cmd + '\' ' + '+' * 10 + '\n' + output + '\n'
-                                f.write(output)
-                                log.info(
-                                    "File {file} saved to folder {folder}".
-                                    format(file=save_file_name,
-                                           folder=folder_name))
-                            if zipped_folder:
-                                file_list.update({file_name+'.txt': save_file_name})
-                        elif save_to_file == 'per_command':
-                            file_name = folder_name + '/' + dev
-                            file_name = file_name + '_' + device.api.slugify(
-                                exec_cmd)
-                            save_file_name = file_name.split('/')[-1] + '.txt'
-                            with open(file_name + '.txt', 'w') as f:
-                                output = '+' * 10 + ' ' + datetime.datetime.now(
-                                ).strftime(
-                                    '%Y-%m-%d %H:%M:%S.%f'
-                                ) + ': ' + dev + ': executing command \'' + exec_cmd + '\' ' + '+' * 10 + '\n' + output + '\n'
-                                f.write(output)
-                                log.info(
-                                    "File {file} saved to folder {folder}".
-                                    format(file=save_file_name,
-                                           folder=folder_name))
-                            if zipped_folder:
-                                file_list.update({file_name+'.txt': save_file_name})
-                    except SubCommandFailure as e:
-                        log.error(
-                            'Failed to execute "{cmd}" on device {d}: {e}'.
-                            format(cmd=exec_cmd, d=device.name, e=str(e)))
-                        device.destroy()
-                        log.info('Trying to recover after execution failure')
-                        connect_device(device)
-                    else:
-                        log.info(
-                            "Successfully executed command '{cmd}' device {d}".
-                            format(cmd=exec_cmd, d=device.name))
-                        # sleep if any command is successfully executed
-                        sleep_if_cmd_executed = True
-                        break
-                # didn't break loop, which means command execution is failed
-                else:
-                    section.failed('Reached max number of {} retries, command '
-                                   'execution have failed'.format(max_retry))
-                # if sleep is under the command, sleep after execution
-                if cmd_sleep:
-                    log.info("Sleeping for {sleep_time} seconds".format(
-                        sleep_time=cmd_sleep))
-                    time.sleep(cmd_sleep)
-
-    if zipped_folder:
-        for fname, sname in file_list.items():
+    # prepare save location
+    archive = None
+    if save_to_file:
+        now = datetime.datetime.now()
+        timestamp_format = '%Y%m%d_%H%M%S'
+        folder_log = '_'.join(
+            [section.parent.uid, section.uid,
+             processor, now.strftime(timestamp_format)])
+        folder_name = runtime.directory + '/' + folder_log
+        archive = _CommandOutputArchive(
+            folder_name, save_to_file,
+            stream=bool(zipped_folder) and not server_to_store)
+        try:
+            archive.open()
+        except Exception:
+            if archive.stream:
+                section.errored(
+                    "Failed to create zip file: {file} for `save_to_file`".
+                    format(file=archive.zip_name))
+            section.errored(
+                "Failed to create folder `{folder_name}` for `save_to_file`".
+                format(folder_name=folder_name))
+        if archive.stream:
+            log.info(
+                "Zip file `{zip}` is created for `save_to_file` with mode {mode}"
+                .format(zip=archive.zip_name, mode=save_to_file))
+        else:
+            log.info(
+                "Folder `{folder}` is created for `save_to_file` with mode {mode}"
+                .format(folder=folder_name, mode=save_to_file))
+
+    # (device, command, attempts, seconds, result)
+    timings = []
+    results = []
+    # devices which raised an unexpected exception
+    errors = []
+    if jobs:
+        with ThreadPoolExecutor(
+                max_workers=max_workers or len(jobs)) as executor:
+            futures = [executor.submit(_execute_device_commands, section, dev,
+                                       device, cmds, max_retry, archive,
+                                       timings)
+                       for dev, device, cmds in jobs]
+            for (dev, _, _), future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    log.exception('Failed to execute commands on device '
+                                  '{d}'.format(d=dev))
+                    errors.append('{d}: {e}'.format(d=dev, e=e))
+                    results.append((False, None))
+
+    if timings:
+        table = ptable(['device', 'command', 'attempts', 'time (s)',
+                        'result'])
+        order = [dev for dev, _, _ in jobs]
+        for dev, exec_cmd, attempts, elapsed, result in sorted(
+                timings, key=lambda timing: order.index(timing[0])):
+            table.add_row([dev, exec_cmd, attempts,
+                           '{:.2f}'.format(elapsed), result])
+        log.info(banner("processor: '{}' command timing".format(processor)))
+        log.info(table.get_string())
+
+    if archive and archive.stream:
+        try:
+            archive.close()
+            log.info("Zip file `{zip}` was created with mode {mode}".format(
+                zip=archive.zip_name, mode=save_to_file))
+        except Exception:
+            section.errored("Failed to close zip file: {file}".format(
+                file=archive.zip_name))
+
+    if server_to_store:
+        _store_in_server_func(section, server_to_store,
+                              archive.file_list if archive else {},
+                              list(devices.keys()))
+
+    if archive and zipped_folder and not archive.stream:
+        try:
+            zip_file = zipfile.ZipFile(archive.zip_name, 'w',
+                                       zipfile.ZIP_DEFLATED)
+        except Exception:
+            section.errored(
+                "Failed to create zip file: {file} for `save_to_file`".
+                format(file=archive.zip_name))
+        for fname, sname in archive.file_list.items():
             try:
-                zip.write(fname ,sname)
+                zip_file.write(fname, sname)
             except Exception:
                 section.errored(
                     "Failed to add file `{file}` to zip file {zip}"
-                    .format(file=sname + '.txt',
-                            zip=folder_name + '.zip'))
+                    .format(file=sname, zip=archive.zip_name))
         try:
-            zip.close()
+            zip_file.close()
             log.info("Zip file `{zip}` was created with mode {mode}".format(
-                zip=folder_name + '.zip', mode=save_to_file))
+                zip=archive.zip_name, mode=save_to_file))
         except Exception:
-            section.errored("Failed to close zip file: {zip}".format(
-                file=folder_name + '.zip'))
+            section.errored("Failed to close zip file: {file}".format(
+                file=archive.zip_name))
         try:
-            shutil.rmtree(folder_name)
+            shutil.rmtree(archive.folder_name)
             log.info(
                 "Folder `{folder}` was deleted because the folder was zipped".
-                format(folder=folder_name))
+                format(folder=archive.folder_name))
         except Exception:
             section.errored(
                 "Failed to delete folder which was zipped. Folder: {folder}".
-                format(folder=folder_name))
+                format(folder=archive.folder_name))
 
-    if sleep_time and sleep_if_cmd_executed:
+    if errors:
+        section.errored('Failed to execute commands on {}'.format(
+            ', '.join(errors)))
+
+    failed = ['{d}: {c}'.format(d=dev, c=exec_cmd)
+              for (dev, _, _), (_, exec_cmd) in zip(jobs, results)
+              if exec_cmd]
+    if failed:
+        log.error('Command execution failed on {}'.format(', '.join(failed)))
+        section.failed('Reached max number of {} retries, command '
+                       'execution have failed'.format(max_retry))
+
+    if sleep_time and any(executed for executed, _ in results):
         log.info(
             "Sleeping for {sleep_time} seconds".format(sleep_time=sleep_time))
         time.sleep(sleep_time)
 
 
+def pre_execute_command(section,
+                        devices=None,
+                        sleep_time=0,
+                        max_retry=1,
+                        save_to_file='',
+                        zipped_folder='',
+                        max_workers=None):
+    '''
+    Execute commands as processors. This can be run only with specified condition and the log can be archived with text file or zip file.
+
+    Can be controlled via sections parameters which is provided by the datafile
+
+    Args:
+        section (`obj`) : Aetest Subsection object.
+        device (`obj`) : Device object.
+        sleep_time (`int`) : sleep after all commands (unit: seconds)
+        max_retry (`int`) : Retry issuing command in case any error (max_retry 1 by default)
+        save_to_file (`str`) : Set either one of below modes when show output needs to be saved as file. folder for the processor is generated and store files in the folder. (Disabled by default)
+                                 per_device : file generated per device
+                                 per_command : file generated per command
+        zipped_folder (`bool`) : Set if archive folder needs to be zipped.
+                                 If True, zip file generated and removed the folder with files. 
+        max_workers (`int`) : Maximum number of devices executing commands at the same time.
+                              Default to one per device
+
+    Returns:
+        AETEST results
+
+    Raises:
+        None
+    '''
+    # Init
+    log.info(banner("processor: 'execute_command'"))
+
+    _execute_command_processor(section, 'pre_execute_command', devices,
+                               sleep_time=sleep_time,
+                               max_retry=max_retry,
+                               save_to_file=save_to_file,
+                               zipped_folder=zipped_folder,
+                               max_workers=max_workers)
+
+
 def post_execute_command(section,
                          sleep_time=0,
                          max_retry=1,
@@ -1506,7 +1820,8 @@ def post_execute_command(section,
                          zipped_folder='',
                          valid_section_results=None,
                          devices=None,
-                         server_to_store=None):
+                         server_to_store=None,
+                         max_workers=None):
 
     '''
     Execute commands or APIs as processors. The CLI command output can be stored in
@@ -1535,6 +1850,13 @@ def post_execute_command(section,
                                                     The server should be specified in testbed>
                                  protocol: <protocol that'd be used, e.g. tftp, sftp, scp>
                                  remote_path: <the path to the directory in the server that log would be stored on>}
+        max_workers (`int`): Maximum number of devices executing commands at the same time.
+                             Default to one per device
+
+    CLI commands are executed on the devices concurrently, the commands of a device one after
+    the other. When the text files are zipped, they are written straight into the zip file.
+    The time taken by each command is logged in a table once all the devices are done.
+
     Example:
 
         processors:
@@ -1581,185 +1903,13 @@ def post_execute_command(section,
           cargs=(section,),
           iargs=[(dev, devices[dev]) for dev in devices])
 
-    # sanitize arguments
-    if save_to_file and save_to_file not in ['per_device', 'per_command']:
-        section.errored(
-            "`save_to_file` in datafile must be `per_device` or `per_command`")
-    if not save_to_file and isinstance(zipped_folder, bool):
-        log.warning(
-            "`zipped_folder` was ignored because `save_to_file` was not set in datafile"
-        )
-    elif save_to_file and not isinstance(zipped_folder, bool):
-        section.errored("`zipped_folder` must be True or False in datafile")
-
-    # prepare save location
-    if save_to_file:
-        file_list = {}
-        now = datetime.datetime.now()
-        timestamp_format = '%Y%m%d_%H%M%S'
-        folder_log = '_'.join(
-            [section.parent.uid, section.uid,
-             'post_execute_command', now.strftime(timestamp_format)])
-        folder_name = runtime.directory + '/' + folder_log
-        try:
-            os.mkdir(folder_name)
-            log.info(
-                "Folder `{folder}` is created for `save_to_file` with mode {mode}"
-                .format(folder=folder_name, mode=save_to_file))
-        except Exception:
-            section.errored(
-                "Failed to create folder `{folder_name}` for `save_to_file`".
-                format(folder_name=folder_name))
-        if zipped_folder:
-            try:
-                zip = zipfile.ZipFile(folder_name + '.zip', 'w',
-                                      zipfile.ZIP_DEFLATED)
-            except Exception:
-                section.errored(
-                    "Failed to create zip file: {file} for `save_to_file`".
-                    format(file=folder_name + '.zip'))
-
-    sleep_if_cmd_executed = False
-    for dev in devices:
-        if dev == 'uut':
-            device = section.parameters['uut']
-        else:
-            if dev in section.parameters[
-                    'testbed'].devices.names or dev in section.parameters[
-                        'testbed'].devices.aliases:
-                device = section.parameters['testbed'].devices[dev]
-            else:
-                section.errored(
-                    "Failed to find a device {device} in testbed yaml".format(
-                        device=dev))
-        # if device not in TB or not connected, then skip
-        if not device or not device.is_connected():
-            continue
-        # execute list of commands given in yaml
-        for cmd in devices[dev].get('cmds', []):
-            if not cmd.get('condition') or section.result in list(
-                    map(TestResult.from_str, cmd['condition'])):
-                exec_cmd = cmd.get('cmd', '')
-                pattern = cmd.get('pattern', '')
-                answer = cmd.get('answer', '')
-                cmd_sleep = cmd.get('sleep', 0)
-                cmd_timeout = cmd.get('timeout', 60)
-                for _ in range(max_retry + 1):
-                    try:
-                        # handle prompt if pattern and answer is in the
-                        # datafile
-                        if pattern:
-                            if isinstance(pattern, str):
-                                pattern = [pattern]
-                            statement_list = []
-                            for p in pattern:
-                                statement_list.append(
-                                    Statement(
-                                        pattern=p,
-                                        action='sendline({})'.format(answer),
-                                        loop_continue=True,
-                                        continue_timer=False))
-                            dialog = Dialog(statement_list)
-                            output = device.execute(exec_cmd,
-                                                    reply=dialog,
-                                                    timeout=cmd_timeout)
-                        else:
-                            output = device.execute(exec_cmd,
-                                                    timeout=cmd_timeout)
-
-                        # save output to file as per device or command
-                        if save_to_file == 'per_device':
-                            file_name = folder_name + '/' + dev
-                            save_file_name = file_name.split('/')[-1] + '.txt'
-                            with open(file_name + '.txt', 'a') as f:
-                                output = '+' * 10 + ' ' + datetime.datetime.now(
-                                ).strftime(
-                                    '%Y-%m-%d %H:%M:%S.%f'
-                                ) + ': ' + dev + ': executing command \'' + exec_cmd + '\' ' + '+' * 10 + '\n' + output + '\n'
-                                f.write(output)
-                                log.info(
-                                    "File {file} saved to folder {folder}".
-                                    format(file=save_file_name,
-                                            folder=folder_name))
-                            if zipped_folder:
-                                file_list.update({file_name+'.txt': save_file_name})
-                        elif save_to_file == 'per_command':
-                            file_name = folder_name + '/' + dev
-                            file_name = file_name + '_' + device.api.slugify(
-                                exec_cmd)
-                            save_file_name = file_name.split('/')[-1] + '.txt'
-                            with open(file_name + '.txt', 'w') as f:
-                                output = '+' * 10 + ' ' + datetime.datetime.now(
-                                ).strftime(
-                                    '%Y-%m-%d %H:%M:%S.%f'
-                                ) + ': ' + dev + ': executing command \'' + exec_cmd + '\' ' + '+' * 10 + '\n' + output + '\n'
-                                f.write(output)
-                                log.info(
-                                    "File {file} saved to folder {folder}".
-                                    format(file=save_file_name,
-                                            folder=folder_name))
-                            if zipped_folder or server_to_store:
-                                file_list.update({file_name+'.txt': save_file_name})
-
-                    except SubCommandFailure as e:
-                        log.error(
-                            'Failed to execute "{cmd}" on device {d}: {e}'.
-                            format(cmd=exec_cmd, d=device.name, e=str(e)))
-
-                        device.destroy()
-                        log.info('Trying to recover after execution failure')
-                        connect_device(device)
-                    else:
-                        log.info(
-                            "Successfully executed command '{cmd}' device {d}".
-                            format(cmd=exec_cmd, d=device.name))
-                        # sleep if any command is successfully executed
-                        sleep_if_cmd_executed = True
-                        break
-                # didn't break loop, which means command execution is failed
-                else:
-                    section.failed('Reached max number of {} retries, command '
-                                   'execution have failed'.format(max_retry))
-                # if sleep is under the command, sleep after execution
-                if cmd_sleep:
-                    log.info("Sleeping for {sleep_time} seconds".format(
-                        sleep_time=cmd_sleep))
-                    time.sleep(cmd_sleep)
-
-    if server_to_store:
-        _store_in_server_func(section, server_to_store,
-                              file_list, list(devices.keys()))
-
-    if zipped_folder:
-        for fname, sname in file_list.items():
-            try:
-                zip.write(fname, sname)
-            except Exception:
-                section.errored(
-                    "Failed to add file `{file}` to zip file {zip}"
-                    .format(file=sname + '.txt',
-                            zip=folder_name + '.zip'))
-        try:
-            zip.close()
-            log.info("Zip file `{zip}` was created with mode {mode}".format(
-                zip=folder_name + '.zip', mode=save_to_file))
-        except Exception:
-            section.errored("Failed to close zip file: {file}".format(
-                file=folder_name + '.zip'))
-        try:
-            shutil.rmtree(folder_name)
-            log.info(
-                "Folder `{folder}` was deleted because the folder was zipped".
-                format(folder=folder_name))
-        except Exception:
-            section.errored(
-                "Failed to delete folder which was zipped. Folder: {folder}".
-                format(folder=folder_name))
-
-    if sleep_time and sleep_if_cmd_executed:
-        log.info(
-            "Sleeping for {sleep_time} seconds".format(sleep_time=sleep_time))
-        time.sleep(sleep_time)
+    _execute_command_processor(section, 'post_execute_command', devices,
+                               sleep_time=sleep_time,
+                               max_retry=max_retry,
+                               save_to_file=save_to_file,
+                               zipped_folder=zipped_folder,
+                               server_to_store=server_to_store,
+                               max_workers=max_workers)
 
 
 def _store_in_server_func(section, server_to_store, file_list, devices):
@@ -2849,7 +2999,7 @@ def configure_replace(section, devices, timeout=60):
         try:
             file_name = None
             file_location = None
-            lookup = Lookup.from_device(device)
+            lookup = LazyLookup.from_device(device)
             if 'file_location' in dev:
                 file_location = dev['file_location']
             else:
@@ -0,0 +1,235 @@
+'''Lazy lookup of abstracted modules, driven by an index of the package files.
+
+`Lookup.from_device()` learns the abstraction packages it is given, which
+imports every module under every token (os, platform, model...) directory of
+the package before the first attribute is resolved. `AbstractIndex` walks the
+package directories once instead, without importing anything, and indexes each
+module by its name without the token directories and by its tokens:
+
+    genie.libs.sdk.libs.abstracted_libs.iosxe.restore
+        -> 'libs.abstracted_libs.restore', ('iosxe',)
+
+`LazyLookup` resolves attributes like `Lookup` does, from the module of the
+most specific tokens of the device down to the generic module, and only
+imports these modules.
+
+Example::
+
+    >>> from genie.libs.sdk.libs.utils.abstract_index import LazyLookup
+    >>> lookup = LazyLookup.from_device(device, packages={'sdk': sdk})
+    >>> restore = lookup.sdk.libs.abstracted_libs.restore.Restore()
+
+Attributes which cannot be found through the index are resolved by `Lookup`.
+'''
+
+# Python
+import os
+import logging
+import threading
+import importlib
+
+# Genie
+from genie.abstract import Lookup
+
+log = logging.getLogger(__name__)
+
+# Marker of the abstraction token packages in their __init__.py
+TOKEN_MARKER = 'declare_token'
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _is_token_package(directory):
+    try:
+        with open(os.path.join(directory, '__init__.py')) as f:
+            return TOKEN_MARKER in f.read()
+    except OSError:
+        return False
+
+
+def _match(module_tokens, tokens):
+    '''Positions of `module_tokens` in the device `tokens`, in order, or None
+    if the module is not for the device'''
+    positions = []
+    start = 0
+    for token in module_tokens:
+        try:
+            start = tokens.index(token, start)
+        except ValueError:
+            return None
+        positions.append(start)
+        start += 1
+    return positions
+
+
+class AbstractIndex(object):
+    '''Index of the modules of an abstraction package, by abstraction tokens.
+
+    Args:
+        package (`str`): Abstraction package name, e.g. 'genie.libs.sdk'
+    '''
+
+    def __init__(self, package):
+        self.package = package
+        # generic module name -> {tokens: module name}
+        self.modules = {}
+        self._resolved = {}
+
+        module = importlib.import_module(package)
+        for path in getattr(module, '__path__', []):
+            self._walk(path, (), (), (package,))
+
+    def _walk(self, directory, parts, tokens, names):
+        self._add(parts, tokens, names)
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            if entry.is_dir():
+                if not os.path.isfile(os.path.join(entry.path, '__init__.py')):
+                    continue
+                if _is_token_package(entry.path):
+                    self._walk(entry.path, parts, tokens + (entry.name,),
+                               names + (entry.name,))
+                else:
+                    self._walk(entry.path, parts + (entry.name,), tokens,
+                               names + (entry.name,))
+            elif entry.name.endswith('.py') and entry.name != '__init__.py':
+                name = entry.name[:-3]
+                self._add(parts + (name,), tokens, names + (name,))
+
+    def _add(self, parts, tokens, names):
+        self.modules.setdefault('.'.join(parts), {}).setdefault(
+            tokens, '.'.join(names))
+
+    def __contains__(self, name):
+        return name in self.modules
+
+    def candidates(self, name, tokens):
+        '''Modules of a generic module name for the device tokens.
+
+        Args:
+            name (`str`): Module name without the package and the tokens,
+                          e.g. 'libs.abstracted_libs.restore'
+            tokens (`list`): Device abstraction tokens, e.g. ['iosxe', 'cat9k']
+
+        Returns:
+            `list` of module names, from the most specific to the generic one
+        '''
+        tokens = list(tokens)
+        found = []
+        for module_tokens, module in self.modules.get(name, {}).items():
+            positions = _match(module_tokens, tokens)
+            if positions is not None:
+                found.append((len(positions), positions, module))
+        return [module for _, _, module in sorted(found, reverse=True)]
+
+    def resolve(self, name, attribute, tokens):
+        '''Get an attribute of the most specific module having it.
+
+        Only the candidate modules are imported, until the attribute is found.
+
+        Raises:
+            LookupError: No module of the device tokens has the attribute
+        '''
+        key = (name, attribute, tuple(tokens))
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        for module_name in self.candidates(name, tokens):
+            module = importlib.import_module(module_name)
+            if hasattr(module, attribute):
+                value = self._resolved[key] = getattr(module, attribute)
+                return value
+        raise LookupError("'{a}' not found in '{p}.{n}' for tokens {t}"
+                          .format(a=attribute, p=self.package, n=name,
+                                  t=list(tokens)))
+
+
+def get_abstract_index(package):
+    '''Index of an abstraction package, built once per process'''
+    try:
+        return _indexes[package]
+    except KeyError:
+        pass
+    with _indexes_lock:
+        if package not in _indexes:
+            _indexes[package] = AbstractIndex(package)
+        return _indexes[package]
+
+
+class LazyLookup(object):
+    '''Drop-in replacement of `Lookup.from_device()` attribute lookups.
+
+    Args:
+        device (`obj`): Device object
+        packages (`dict`): {name: package module}, defaults to the
+                           'genie.libs.<name>' package of each name used
+    '''
+
+    def __init__(self, device, packages=None):
+        self.device = device
+        self.packages = packages
+        self.tokens = Lookup.tokens_from_device(device)
+        self._lookup = None
+
+    @classmethod
+    def from_device(cls, device, packages=None):
+        return cls(device, packages=packages)
+
+    @property
+    def lookup(self):
+        '''`Lookup` of the device, used for what the index cannot resolve'''
+        if self._lookup is None:
+            if self.packages is None:
+                self._lookup = Lookup.from_device(self.device)
+            else:
+                self._lookup = Lookup.from_device(self.device,
+                                                  packages=self.packages)
+        return self._lookup
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if self.packages is None:
+            package = 'genie.libs.{}'.format(name)
+        elif name in self.packages:
+            package = self.packages[name].__name__
+        else:
+            return getattr(self.lookup, name)
+        try:
+            index = get_abstract_index(package)
+        except ImportError:
+            return getattr(self.lookup, name)
+        return _LazyModule(self, name, index, ())
+
+
+class _LazyModule(object):
+    '''Generic module of a `LazyLookup`, resolved on attribute access'''
+
+    def __init__(self, lookup, package, index, parts):
+        self._lookup = lookup
+        self._package = package
+        self._index = index
+        self._parts = parts
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        parts = self._parts + (name,)
+        if '.'.join(parts) in self._index:
+            return _LazyModule(self._lookup, self._package, self._index, parts)
+        try:
+            return self._index.resolve('.'.join(self._parts), name,
+                                       self._lookup.tokens)
+        except LookupError:
+            log.debug('Resolving {} with Lookup'.format(
+                '.'.join((self._package,) + parts)))
+        value = getattr(self._lookup.lookup, self._package)
+        for part in parts:
+            value = getattr(value, part)
+        return value
+
+    def __repr__(self):
+        return '<LazyModule {}>'.format(
+            '.'.join((self._index.package,) + self._parts))
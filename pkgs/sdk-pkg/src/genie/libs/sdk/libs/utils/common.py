@@ -58,6 +58,9 @@ class UpdateLearntDatabase(object):
         self.update_feature_list = update_feature_list
         # build up abstract object based on the os of device
         self.abstract = Lookup.from_device(device)
+        # parser outputs of the verifications being updated, so that the
+        # verifications sharing a command only send it once
+        self._outputs = {}
 
     @property
     def is_local_ver_enabled(self):
@@ -220,11 +223,24 @@ class UpdateLearntDatabase(object):
                Metaparser errors
         '''
 
+        # check if has parameters
+        if 'parameters' in self.obj.parent.verifications[ver]:
+            para = self.obj.parent.verifications[ver]['parameters']
+        else:
+            para = {}
+
         # Check if verificaiton is parser, callable or Ops
         if 'cmd' in self.obj.parent.verifications[ver]:
+            cmd_class = self.obj.parent.verifications[ver]['cmd']['class']
+            key = (cmd_class, repr(sorted(para.items())))
+            if key in self._outputs:
+                log.info('Reusing the output of {c} for verification {v}'
+                         .format(c=cmd_class, v=ver))
+                return deepcopy(self._outputs[key])
+
             # compose the command object
             execute_obj = self.abstract.parser
-            for item in self.obj.parent.verifications[ver]['cmd']['class'].split('.'):
+            for item in cmd_class.split('.'):
                 execute_obj = getattr(execute_obj, item)
             execute_obj = execute_obj(self.device)
         elif 'source' in self.obj.parent.verifications[ver]:
@@ -236,12 +252,9 @@ class UpdateLearntDatabase(object):
         
         # parser update
         if hasattr(execute_obj, 'parse'):
-            # check if has parameters
-            if 'parameters' in self.obj.parent.verifications[ver]:
-                para = self.obj.parent.verifications[ver]['parameters']
-            else:
-                para = {}
             output = execute_obj.parse(**para)
+            if 'cmd' in self.obj.parent.verifications[ver]:
+                self._outputs[key] = deepcopy(output)
             return output
 
         # Ops update
@@ -296,6 +309,9 @@ class UpdateLearntDatabase(object):
             # inital the global summary object
             self.is_global_ver_enabled
 
+        # outputs are only shared within one update
+        self._outputs = {}
+
         # Initial lists for updating local/global vers
         tmp_list_local = []
         tmp_list_global = []
@@ -407,7 +423,86 @@ class UpdateLearntDatabase(object):
         self._update_msg_summary(self.global_summary, 
                                  success_list_global,
                                  skip_dict_global)
-     
+
+    def _learn_pts(self, pts, attributes=None):
+        '''Learn again the feature of a PTS object.
+
+           Args:
+              Mandatory:
+                pts (`obj`) : Ops object stored in the PTS.
+              Optional:
+                attributes (`list`) : Ops attributes to learn, only the
+                                      commands of their leafs are sent.
+                                      Default: None (learn the whole feature)
+
+           Returns:
+               ops object: ops object after learn
+
+           Raises:
+               Exception when the feature cannot be learned
+        '''
+        if attributes:
+            module = pts.__class__(self.device, attributes=list(attributes))
+            try:
+                module.learn()
+            except Exception as e:
+                # Some learn post-process the leafs they did not learn
+                log.info('Feature {f} cannot be learned for {a}, learning '
+                         'the whole feature: {e}'
+                         .format(f=pts.__class__.__name__, a=attributes, e=e))
+            else:
+                return module
+
+        module = pts.__class__(self.device)
+        module.learn()
+        return module
+
+    @staticmethod
+    def _split_attribute(attribute):
+        '''Split an ops attribute path, 'info[vrf][(.*)]' gives
+        ['info', 'vrf', '(.*)']'''
+        name, _, keys = attribute.partition('[')
+        if not keys:
+            return [name]
+        return [name] + keys.rstrip(']').split('][')
+
+    @classmethod
+    def _merge_keys(cls, stored, learned, keys):
+        '''Overwrite the keys path of stored with the one of learned, keys
+        starting with '(' being regular expressions'''
+        key, keys = keys[0], keys[1:]
+        if key.startswith('('):
+            names = [name for name in list(stored) +
+                     [name for name in learned if name not in stored]
+                     if re.match(key, str(name))]
+        else:
+            names = [key]
+
+        for name in names:
+            if name not in learned:
+                stored.pop(name, None)
+            elif not keys or not isinstance(learned[name], dict):
+                stored[name] = learned[name]
+            else:
+                if not isinstance(stored.get(name), dict):
+                    stored[name] = {}
+                cls._merge_keys(stored[name], learned[name], keys)
+
+    def _merge_pts(self, pts, module, attribute):
+        '''Overwrite an attribute path of the PTS object with the one of
+        the newly learned ops object'''
+        name, *keys = self._split_attribute(attribute)
+        if not keys:
+            if hasattr(module, name):
+                setattr(pts, name, getattr(module, name))
+            elif hasattr(pts, name):
+                delattr(pts, name)
+            return
+
+        if not isinstance(getattr(pts, name, None), dict):
+            setattr(pts, name, {})
+        self._merge_keys(getattr(pts, name), getattr(module, name, {}), keys)
+
     def update_pts(self, update_attributes=None):
         '''Learn the PTS from the given list and
         overwrite it.
@@ -418,6 +513,9 @@ class UpdateLearntDatabase(object):
             update_attributes (`dict`) : 
                 Attributes from the PTSs that want to be updatd,
                 should be {'feature': ['key1_path', 'key2_path']}.
+                The paths follow the ops attributes format, like
+                'info' or 'info[instance][default][vrf][(.*)]', and
+                only the commands of their leafs are sent.
                 Default: None (will update the whole PTS)
 
        Returns:
@@ -429,7 +527,7 @@ class UpdateLearntDatabase(object):
        Example:
            >>> update_obj = UpdateLearntDatabase(object, device, 
                    update_feature_list=['platform', 'bgp'])
-           >>> update_obj.update_verification(
+           >>> update_obj.update_pts(
                    update_attributes={'bgp': ['info'],
                                       'platform': ['chassis_sn', 'slot']})
         '''
@@ -447,12 +545,12 @@ class UpdateLearntDatabase(object):
 
             # check if pts runs on this device before
             if self.device.alias in self.obj.parent.parameters['pts'][feature]:
+                pts = self.obj.parent.parameters['pts'][feature][self.device.alias]
+                attributes = (update_attributes or {}).get(feature)
 
                 # learn the ops again
                 try:
-                    module = self.obj.parent.parameters['pts'][feature][self.device.alias]\
-                        .__class__(self.device)
-                    module.learn()
+                    module = self._learn_pts(pts, attributes)
                 except Exception as e:
                     skip_dict_pts.update({feature: e.__class__.__name__})
                     log.warning('Feature {} cannot be learned, Skip updating'
@@ -460,11 +558,14 @@ class UpdateLearntDatabase(object):
                     log.warning(str(e))
                     continue
 
+                # update the whole feature
+                if not attributes:
+                    self.obj.parent.parameters['pts'][feature][self.device.alias] = module
+
                 # update the given keys
-                for attr in update_attributes[feature]:
+                for attr in attributes or []:
                     try:
-                        setattr(self.obj.parent.parameters['pts'][feature][self.device.alias],
-                                   attr, (getattr(module, attr)))
+                        self._merge_pts(pts, module, attr)
                     except Exception as e:
                         skip_dict_pts.update({feature: e.__class__.__name__})
                         
@@ -0,0 +1,209 @@
+'''Cached, indexed configuration trees.
+
+Building `Config(...).tree()` for a large configuration and running a full
+`Diff` on it is slow, and restore and config-replace checks do it on every
+`show running-config` they fetch, even though only a few sections changed.
+
+A configuration is made of top-level sections: a line without indentation
+and the indented lines below it. `ConfigTreeCache` keeps, per device, the
+parsed tree of every section it has seen, keyed by the section text, so
+only the sections which changed since the previous fetch are parsed again.
+
+Example::
+
+    >>> from genie.libs.sdk.libs.utils.config_tree import ConfigTreeCache
+    >>> cache = ConfigTreeCache.get(device)
+    >>> before = cache.tree(device.execute('show running-config'))
+    >>> ...
+    >>> after = cache.tree(device.execute('show running-config'))
+    >>> after.sections('interface')
+    ['interface GigabitEthernet1', 'interface GigabitEthernet2']
+    >>> diff = before.diff(after)
+
+The dictionaries of a tree are shared with the cache and with the other
+trees of the device; they must not be modified.
+'''
+
+# Python
+import re
+import logging
+from collections import OrderedDict
+
+# Genie
+from genie.utils.diff import Diff
+from genie.utils.config import Config
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def split_config_sections(config):
+    '''Split a configuration text into its top-level sections.
+
+    Args:
+        config (`str`): Configuration text
+
+    Returns:
+        `list` of section texts, in order
+    '''
+    sections = []
+    current = []
+    for line in config.splitlines():
+        if line[:1] not in (' ', '\t', '') and current:
+            sections.append('\n'.join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append('\n'.join(current))
+    return sections
+
+
+def diff_config_dicts(a, b, exclude=None):
+    '''Diff two configuration dicts, comparing only the top-level sections
+    which are not equal.
+
+    Returns the same differences as `Diff(a, b, exclude)`, without walking
+    the sections both dicts have in common.
+
+    Args:
+        a (`dict`): Configuration dict
+        b (`dict`): Configuration dict
+        exclude (`list`): Items to ignore, see `Diff`
+
+    Returns:
+        `Diff` after `findDiff()`
+    '''
+    changed = [key for key, value in a.items()
+               if b.get(key, _MISSING) is not value
+               and b.get(key, _MISSING) != value]
+    changed.extend(key for key in b if key not in a)
+
+    diff = Diff({key: a[key] for key in changed if key in a},
+                {key: b[key] for key in changed if key in b},
+                exclude=exclude)
+    diff.findDiff()
+    return diff
+
+
+class ConfigTree(object):
+    '''Configuration tree built from cached sections, indexed by the first
+    keyword of each top-level line.'''
+
+    def __init__(self, config, index):
+        # `dict` as `Config(...).tree()` builds it
+        self.config = config
+        # first keyword -> top-level lines
+        self._index = index
+
+    def sections(self, keyword=None):
+        '''Return the top-level lines starting with `keyword`, e.g.
+        'interface', or all of them.'''
+        if keyword is None:
+            return list(self.config)
+        return list(self._index.get(keyword, []))
+
+    def section(self, line):
+        '''Return the tree below the top-level `line`, or None.'''
+        return self.config.get(line)
+
+    def find(self, pattern, keyword=None):
+        '''Return the top-level lines matching the regex `pattern`, searched
+        among the lines starting with `keyword` if given.'''
+        regex = re.compile(pattern)
+        return [line for line in self.sections(keyword) if regex.search(line)]
+
+    def diff(self, other, exclude=None):
+        '''Diff this tree against `other`, a `ConfigTree` or a dict,
+        comparing only the sections which are not equal.'''
+        if isinstance(other, ConfigTree):
+            other = other.config
+        return diff_config_dicts(self.config, other, exclude=exclude)
+
+
+class ConfigTreeCache(object):
+    '''Parsed configuration sections of one device, keyed by their text.'''
+
+    # Attribute of the device holding its cache
+    DEVICE_ATTR = '_config_tree_cache'
+
+    def __init__(self, max_sections=100000):
+        '''
+        Args:
+            max_sections (`int`): Number of parsed sections kept, the least
+                recently used ones are dropped first. Default to 100000
+        '''
+        self.max_sections = max_sections
+        # section text -> (config dict, index entries)
+        self._sections = OrderedDict()
+        # command -> latest ConfigTree fetched with it
+        self.latest = {}
+        self.parsed = 0
+        self.reused = 0
+
+    @classmethod
+    def get(cls, device):
+        '''Return the cache of `device`, creating it if needed.'''
+        cache = getattr(device, cls.DEVICE_ATTR, None)
+        if not isinstance(cache, cls):
+            cache = cls()
+            setattr(device, cls.DEVICE_ATTR, cache)
+        return cache
+
+    def _parse_section(self, text):
+        entry = self._sections.get(text)
+        if entry is not None:
+            self._sections.move_to_end(text)
+            self.reused += 1
+            return entry
+
+        cfg = Config(text)
+        cfg.tree()
+        index = [(line.split(' ', 1)[0], line) for line in cfg.config]
+        entry = (cfg.config, index)
+        self._sections[text] = entry
+        self.parsed += 1
+        if len(self._sections) > self.max_sections:
+            self._sections.popitem(last=False)
+        return entry
+
+    def tree(self, config):
+        '''Return the `ConfigTree` of the configuration text `config`,
+        parsing only the sections not seen before.
+
+        Args:
+            config (`str`): Configuration text
+
+        Returns:
+            `ConfigTree`
+        '''
+        tree = {}
+        index = {}
+        for text in split_config_sections(config):
+            section_config, section_index = self._parse_section(text)
+            for keyword, line in section_index:
+                if line not in tree:
+                    index.setdefault(keyword, []).append(line)
+            tree.update(section_config)
+        return ConfigTree(tree, index)
+
+    def refresh(self, command, config):
+        '''Build the tree of `config`, the new output of `command`, and
+        return it with the tree of the previous output.
+
+        Args:
+            command (`str`): Command the configuration was fetched with
+            config (`str`): Configuration text
+
+        Returns:
+            `tuple` of the new `ConfigTree` and the previous one, or None
+        '''
+        tree = self.tree(config)
+        previous = self.latest.get(command)
+        self.latest[command] = tree
+        return tree, previous
+
+    def clear(self):
+        '''Drop all the parsed sections and trees.'''
+        self._sections.clear()
+        self.latest.clear()
@@ -0,0 +1,12 @@
+'''Helpers about the connections of a device.'''
+
+
+def is_connection_pool(device):
+    '''Whether the default connection of the device is a connection pool,
+    which runs the commands of several threads at once'''
+    try:
+        from pyats.connections.pool import ConnectionPool
+    except ImportError:
+        return False
+    alias = getattr(device, 'default_connection_alias', 'default')
+    return isinstance(getattr(device, alias, None), ConnectionPool)
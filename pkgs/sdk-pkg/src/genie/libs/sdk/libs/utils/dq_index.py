@@ -0,0 +1,250 @@
+'''Indexed evaluation of Dq queries over parsed output.
+
+Each Dq query (`contains('software').get_values('system_image_file', 0)`)
+starts from `Dq(output)`, which walks the whole parsed output again. On large
+outputs verified by many queries, `PathIndex` flattens the output once and
+keeps an inverted index of every key and value to the leaves it appears on.
+Queries starting with a `contains`-like filter are then evaluated by Dq on
+the (usually tiny) part of the output holding those leaves, and query strings
+are compiled once into cached plans.
+
+Example::
+
+    >>> from genie.libs.sdk.libs.utils.dq_index import PathIndex
+    >>> index = PathIndex(parsed)
+    >>> index.query("contains('software').get_values('system_image_file', 0)")
+    >>> index.q.contains_key_value('process', 'BGP', value_regex=True).get_values('sort')
+
+Results are the same as evaluating the query with Dq on the whole output.
+'''
+
+# Python
+import re
+import ast
+import logging
+import functools
+from collections import abc
+
+# Genie
+from genie.utils.dq import Dq
+
+log = logging.getLogger(__name__)
+
+# Dq methods filtering paths on a key (or value) given as first argument,
+# along with their argument enabling regex. The leaves of the output holding
+# a token matching that argument are a superset of the paths kept by the
+# method, so the output can be narrowed down to these leaves before running
+# Dq.
+_NARROWING_METHODS = {
+    'contains': 'regex',
+    'contains_key_value': 'key_regex',
+}
+
+# Dq methods reading the whole data rather than the filtered paths
+_WHOLE_DATA_METHODS = {'raw'}
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_dq_query(query):
+    '''Compile a Dq query string into a plan.
+
+    Args:
+        query (`str`): Dq query, e.g. "contains('a').get_values('b')"
+
+    Returns:
+        `tuple` of (method, args, kwargs) steps, or None if the query cannot
+        be compiled (it is then evaluated by `Dq.str_to_dq_query`)
+    '''
+    try:
+        node = ast.parse(str(query).strip(), mode='eval').body
+    except SyntaxError:
+        return None
+
+    plan = []
+    while isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Attribute):
+            method, parent = node.func.attr, node.func.value
+        elif isinstance(node.func, ast.Name):
+            method, parent = node.func.id, None
+        else:
+            return None
+        if method.startswith('_') or not callable(getattr(Dq, method, None)):
+            return None
+        if any(kw.arg is None for kw in node.keywords) or \
+                any(isinstance(arg, ast.Starred) for arg in node.args):
+            return None
+        try:
+            args = tuple(ast.literal_eval(arg) for arg in node.args)
+            kwargs = tuple((kw.arg, ast.literal_eval(kw.value))
+                           for kw in node.keywords)
+        except ValueError:
+            return None
+        plan.append((method, args, kwargs))
+        node = parent
+
+    if node is not None or not plan:
+        return None
+
+    plan.reverse()
+    return tuple(plan)
+
+
+def _tokens(value):
+    '''Yield every key and scalar value held by `value`.'''
+    if isinstance(value, abc.Mapping):
+        for key, item in value.items():
+            yield key
+            yield from _tokens(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            yield from _tokens(item)
+    else:
+        yield value
+
+
+class PathIndex(object):
+    '''Flattened view of a parsed output, built once.
+
+    Every non-dict value (including lists, kept whole) is a leaf. The index
+    maps the string of every key and value to the leaves it appears on.
+    '''
+
+    def __init__(self, data):
+        '''
+        Args:
+            data (`dict`): Parsed output
+        '''
+        self.data = data
+        # leaf number -> tuple of keys leading to the leaf
+        self.paths = []
+        # leaf number -> value of the leaf
+        self.values = []
+        # str(token) -> set of leaf numbers
+        self.tokens = {}
+        self._dq = None
+        self._flatten(data, ())
+
+    def _flatten(self, data, path):
+        for key, value in data.items():
+            key_path = path + (key,)
+            if isinstance(value, abc.Mapping) and value:
+                self._flatten(value, key_path)
+                continue
+            leaf = len(self.paths)
+            self.paths.append(key_path)
+            self.values.append(value)
+            for token in key_path:
+                self.tokens.setdefault(str(token), set()).add(leaf)
+            for token in _tokens(value):
+                self.tokens.setdefault(str(token), set()).add(leaf)
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def dq(self):
+        '''Dq of the whole output, created once.'''
+        if self._dq is None:
+            self._dq = Dq(self.data)
+        return self._dq
+
+    @property
+    def q(self):
+        '''Drop-in replacement of `parsed.q` using the index.'''
+        return _IndexedQuery(self)
+
+    def leaves(self, token, regex=False):
+        '''Return the sorted leaf numbers holding `token`.
+
+        Args:
+            token (`str`): Key or value to look for
+            regex (`bool`): Whether `token` is a regex. Default to False
+        '''
+        if not regex:
+            return sorted(self.tokens.get(str(token), ()))
+        pattern = re.compile(str(token))
+        leaves = set()
+        for key, numbers in self.tokens.items():
+            if pattern.search(key):
+                leaves.update(numbers)
+        return sorted(leaves)
+
+    def subset(self, leaves):
+        '''Return the part of the output holding `leaves`, in the original
+        order.'''
+        ret = {}
+        for leaf in leaves:
+            node = ret
+            path = self.paths[leaf]
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = self.values[leaf]
+        return ret
+
+    def narrow(self, method, args, kwargs):
+        '''Return a Dq ready to run `method`, over the leaves that may be
+        kept by it, or over the whole output.'''
+        regex_arg = _NARROWING_METHODS.get(method)
+        if regex_arg is None or not args:
+            return self.dq
+        leaves = self.leaves(args[0], regex=bool(kwargs.get(regex_arg)))
+        if len(leaves) == len(self.paths):
+            return self.dq
+        return Dq(self.subset(leaves))
+
+    def evaluate(self, plan):
+        '''Run a plan from `compile_dq_query` and return its result.'''
+        (method, args, kwargs), rest = plan[0], plan[1:]
+        kwargs = dict(kwargs)
+        if any(step[0] in _WHOLE_DATA_METHODS for step in rest):
+            dq = self.dq
+        else:
+            dq = self.narrow(method, args, kwargs)
+        result = getattr(dq, method)(*args, **kwargs)
+        for method, args, kwargs in rest:
+            result = getattr(result, method)(*args, **dict(kwargs))
+        return result
+
+    def query(self, query):
+        '''Evaluate a Dq query string, same as `Dq.str_to_dq_query`.'''
+        plan = compile_dq_query(query)
+        if plan is None:
+            return Dq.str_to_dq_query(self.data, query)
+        return self.evaluate(plan)
+
+
+class _IndexedQuery(object):
+    '''First step of a Dq chain started from a `PathIndex`.'''
+
+    def __init__(self, index):
+        self._index = index
+
+    def __getattr__(self, method):
+        index = self._index
+
+        if method not in _NARROWING_METHODS:
+            return getattr(index.dq, method)
+
+        def call(*args, **kwargs):
+            return getattr(index.narrow(method, args, kwargs), method)(
+                *args, **kwargs)
+        return call
+
+
+def query_output(output, query, index=None):
+    '''Evaluate a Dq query on a parsed output, through `index` when the
+    output is a dict.
+
+    Args:
+        output (`dict`): Parsed output
+        query (`str`): Dq query string
+        index (`PathIndex`): Index of `output`, built if not provided
+
+    Returns:
+        Same as `Dq.str_to_dq_query`
+    '''
+    if not isinstance(output, abc.Mapping):
+        return Dq.str_to_dq_query(output, query)
+    if index is None or index.data is not output:
+        index = PathIndex(output)
+    return index.query(query)
@@ -18,7 +18,8 @@ from genie.utils.timeout import Timeout
 
 from genie.libs import ops
 from genie.libs.sdk.libs.utils.triggeractions import Configure
-from genie.libs.sdk.libs.utils.normalize import GroupKeys, _to_dict, LearnPollDiff
+from genie.libs.sdk.libs.utils.normalize import GroupKeys, _to_dict, LearnPollDiff,\
+                                               compile_req_regex
 
 from genie.abstract import Lookup
 
@@ -996,15 +997,14 @@ class Mapping(object):
                         continue
                     elif item.startswith('(?P<'):
                         # Modify it with an item of key
+                        # Get the variable name
                         try:
-                            com = re.compile(item)
+                            com, var = compile_req_regex(item)
                         except Exception as e:
                             raise ValueError("'{item}' is not a valid regex "
                                              "expression".format(item=item))\
                                              from e
 
-                        # Get the variable name
-                        var = list(com.groupindex)[0]
                         # Does var exists in key?
                         if var not in key:
                             # So key does not exists
@@ -1101,13 +1101,12 @@ class Mapping(object):
                         temp_path = self._append_to_many(temp_path, item)
                         continue
                     # Modify it with an item of key
+                    # Get the variable name
                     try:
-                        com = re.compile(item)
+                        com, var = compile_req_regex(item)
                     except Exception as e:
                         raise ValueError("'{item}' is not a valid regex "
                                         "expression".format(item=item)) from e
-                    # Get the variable name
-                    var = list(com.groupindex)[0]
                     if var in standard_keys:
                         # This mean var is in key
                         vkeys = standard_keys[var]
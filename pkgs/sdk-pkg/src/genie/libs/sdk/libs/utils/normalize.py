@@ -4,10 +4,11 @@
 import re
 import random
 import logging
+import functools
 from enum import Enum
 from copy import deepcopy
 from ipaddress import _BaseAddress
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from collections.abc import Iterable
 
 # import genie
@@ -23,6 +24,140 @@ from pyats.utils.objects import find, R, Operator
 log = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=128)
+def compile_req_regex(req):
+    '''Compile a requirement path item such as '(?P<vrf>.*)' once and
+    return the compiled regex along with its first group name.'''
+    com = re.compile(req)
+    return com, next(iter(com.groupindex), None)
+
+
+class RequirementPath():
+    '''A requirement path compiled once into per-item matchers.
+
+    Found paths sharing a prefix (e.g. thousands of BGP neighbors under the
+    same vrf) are matched against the same items over and over; results can
+    therefore be memoized per (depth, item) for the found paths of one find
+    call, so every distinct node of their prefix tree is evaluated once.
+    '''
+
+    # Compiled requirement paths, shared by every caller (i.e. per trigger),
+    # the least recently used ones being dropped
+    _compiled = OrderedDict()
+    _max_compiled = 128
+
+    def __init__(self, req):
+        self.req = req
+        self.matchers = []
+        for item in req:
+            # find operator has overrided __eq__, have to check type
+            is_find_operator = bool(isinstance(item, Operator) and item.regex)
+            com = var = error = None
+            # check if it's type of formatted regex
+            if isinstance(item, str) and item.startswith('(?P<'):
+                try:
+                    com, var = compile_req_regex(item)
+                except Exception as e:
+                    error = e
+            # check if it's type of find.operator
+            elif is_find_operator and item.value.startswith('(?P<'):
+                com = item.regex
+                var = next(iter(com.groupindex), None)
+            self.matchers.append((item, is_find_operator, com, var, error))
+
+    @classmethod
+    def compile(cls, req):
+        '''Return the compiled RequirementPath of `req`, reusing the one
+        compiled previously for the same requirement.'''
+        # find operators are keyed by identity and current value, as their
+        # value can be modified in place when populating paths
+        key = tuple(item if isinstance(item, str) else
+                    (type(item), id(item), str(getattr(item, 'value', None)))
+                    for item in req)
+        try:
+            cls._compiled.move_to_end(key)
+            return cls._compiled[key]
+        except KeyError:
+            pass
+        if len(cls._compiled) >= cls._max_compiled:
+            cls._compiled.popitem(last=False)
+        compiled = cls._compiled[key] = cls(req)
+        return compiled
+
+    @staticmethod
+    def _memoized(memo, depth, item, func):
+        if memo is None:
+            return func()
+        key = (depth, type(item), item)
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable item, e.g. the found value itself
+            return func()
+        ret = memo[key] = func()
+        return ret
+
+    def keys(self, found_path):
+        '''Return {variable: item} for every regex item of the requirement
+        that differs from the found path.'''
+        ret_source = {}
+        for item, (req, is_find_operator, com, var, error) in \
+                zip(found_path, self.matchers):
+            # continue if source equals to any requirement path item
+            if not is_find_operator and item == req:
+                continue
+            if error is not None:
+                raise ValueError("'{v}' is not a valid regex "
+                                 "expression".format(v=found_path)) from error
+            if com is None:
+                continue
+            if var is None:
+                raise IndexError("'{r}' has no named group"
+                                 .format(r=getattr(req, 'value', req)))
+            ret_source[var] = item
+        return ret_source
+
+    def match_keys(self, found_path, memo=None):
+        '''Return all named groups of the requirement regexes matched
+        against the found path, keeping the type of the found items.
+
+        `memo` is a dict shared by the found paths of one find call, to
+        match their common items once.'''
+        ret_source = {}
+        for depth, (item, (req, is_find_operator, com, var, error)) in \
+                enumerate(zip(found_path, self.matchers)):
+            # continue if source equals to any requirement path item
+            if not is_find_operator and item == req:
+                continue
+            if error is not None:
+                raise ValueError("'{v}' is not a valid regex "
+                                 "expression".format(v=found_path)) from error
+            if com is None:
+                continue
+
+            def _match(item=item, com=com):
+                matched = com.match(str(item))
+                if not matched:
+                    return None
+                # It's possible the regex has multiple group
+                # If issue with type, we can use ast.literal_eval.
+                # But its not recommended, so trying with type first
+                origin_type = type(item)
+                return {k: origin_type(v)
+                        for k, v in matched.groupdict().items()}
+
+            groups = self._memoized(memo, depth, item, _match)
+            if groups is None:
+                # I don't understand how it could
+                # go here; so raise an exception
+                raise Exception('{item} does not match {req}'
+                                .format(item=item, req=req))
+            ret_source.update(groups)
+        return ret_source
+
+
 class GroupKeys():
     ''' Compose the dict which contains the headers as keys, and values
           from the source corresponding keys
@@ -98,80 +233,20 @@ class GroupKeys():
         # For each requirement, will have different source
         if not all_keys:
             for source, found_req in zip(sources, reqs):
-                # Each req can have multiple path 
+                # Each req can have multiple path
+                matcher = RequirementPath.compile(found_req)
                 for found_path in source:
                     # pairing found path with its requirement path
-                    ret_source = {}
-                    # Go for each item on the path and see if it match with req
-                    for item, req in zip(found_path, found_req):
-                        # find operator has overrided __eq__, have to check type
-                        is_find_operator = isinstance(req, Operator) and req.regex
-                        # continue if source equals to any requirement path item
-                        if not is_find_operator and item == req:
-                            continue
-
-                        # check if it's type of formatted regex
-                        if isinstance(req, str) and req.startswith('(?P<'):
-                            try:
-                                com = re.compile(req)
-                            except Exception as e:
-                                raise ValueError("'{v}' is not a valid regex "
-                                                 "expression".format(v=found_path)) from e
-                        # check if it's type of find.operator
-                        elif is_find_operator and req.value.startswith('(?P<'):
-                            com = req.regex
-                        # none of above, move on
-                        else:
-                            continue
-
-                        # Get the variable name
-                        var = list(com.groupindex)[0]
-                        ret_source[var] = item
-
-                    temp_ret.append(ret_source)
+                    temp_ret.append(matcher.keys(found_path))
         else:
             for source, found_req in zip(sources, reqs):
+                matcher = RequirementPath.compile(found_req)
+                # regex results of this find output only
+                memo = {}
                 temp_dict = []
                 for sour in sorted(source):
                     # pairing found path with its requirement path
-                    ret_source = {}
-                    # Go for each item on the path and see if it match with req
-                    for item, req in zip(sour, found_req):
-                        # find operator has overrided __eq__, have to check type
-                        is_find_operator = isinstance(req, Operator) and req.regex
-                        # continue if source equals to any requirement path item
-                        if not is_find_operator and item == req:
-                            continue
-
-                        # check if it's type of formatted regex
-                        if isinstance(req, str) and req.startswith('(?P<'):
-                            try:
-                                com = re.compile(req)
-                            except Exception as e:
-                                raise ValueError("'{v}' is not a valid regex "
-                                                 "expression".format(v=sour)) from e
-                        # check if it's type of find.operator
-                        elif is_find_operator and req.value.startswith('(?P<'):
-                            com = req.regex
-                        # none of above, move on
-                        else:
-                            continue
-
-                        # Get the variable name
-                        # It's possible the regex has multiple group
-                        matched = com.match(str(item))
-                        original_type = type(item)
-                        if matched:
-                            origin_type = type(item)
-                            for k, v in matched.groupdict().items():
-                                # If issue with type, we can use ast.literal_eval. 
-                                # But its not recommended, so trying with type first
-                                ret_source[k] = origin_type(v)
-                        else:
-                            # I don't understand how it could
-                            # go here; so raise an exception
-                            raise Exception('{item} does not match {req}'\
-                                            .format(item=item, req=req))
+                    ret_source = matcher.match_keys(sour, memo)
                     temp_dict = cls.merge_all_keys(temp_ret, temp_dict, ret_source)
 
                 temp_ret = temp_dict.copy()
@@ -0,0 +1,256 @@
+'''Shared polling of parsed commands for verify APIs.
+
+Verify APIs poll a device with `Timeout(max_time, check_interval)` and
+`device.parse(...)` until their condition holds. When several verifications
+run concurrently on the same device from threads, each of them sends the same
+`show` commands. While a `CommandPoller` is active on a device, verifications
+using `wait_for_parsed` subscribe their condition to it instead:
+
+* the parsed output of a command is shared by every caller within the
+  `freshness` window, and concurrent callers wait for the same round trip,
+* different commands are sent one at a time, as the threads share the
+  device connection, unless the connection is a connection pool,
+* the polling interval grows by `backoff` while the output does not change,
+  up to `max_interval`, and goes back to `check_interval` when it changes.
+
+Example::
+
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from genie.libs.sdk.libs.utils.poller import CommandPoller
+    >>> with CommandPoller(device, freshness=5), ThreadPoolExecutor() as pool:
+    ...     routes = [pool.submit(device.api.verify_route_known_via,
+    ...                           route=route, ...) for route in prefixes]
+
+The poller lives in the process which started it, and is shared by the
+threads of that process only. Callers forked by `pcall` (Blitz parallel
+sections, parallel triggers) each get a copy of it and poll on their own.
+
+Without an active poller, `wait_for_parsed` polls exactly like the usual
+`Timeout` loop.
+'''
+
+# Python
+import copy
+import time
+import logging
+import threading
+from contextlib import nullcontext
+
+# Genie
+from genie.utils.timeout import Timeout
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+from genie.libs.sdk.libs.utils.connection import is_connection_pool
+
+log = logging.getLogger(__name__)
+
+
+class CommandPoller(object):
+    '''Coalesced, cached polling of parsed commands on one device.'''
+
+    # Attribute of the device holding the active poller
+    DEVICE_ATTR = '_command_poller'
+
+    def __init__(self, device, freshness=5, backoff=1.5, max_interval=None):
+        '''
+        Args:
+            device (`obj`): Device object
+            freshness (`int`): Seconds a parsed output is shared with other
+                callers. Default to 5
+            backoff (`float`): Factor applied to the polling interval each
+                time the output did not change. Default to 1.5
+            max_interval (`int`): Longest polling interval. Default to three
+                times the check_interval of each verification
+        '''
+        if backoff < 1:
+            raise ValueError('backoff must be at least 1, not {}'.format(backoff))
+        self.device = device
+        self.freshness = freshness
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.round_trips = 0
+        self.hits = 0
+        # (command, kwargs) -> (timestamp, output, exception)
+        self._results = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        # Serializes the commands sent on the device connection
+        self._device_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, device):
+        '''Return the poller active on `device`, or None.'''
+        return getattr(device, cls.DEVICE_ATTR, None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        '''Activate the poller for the verifications on the device.'''
+        if self.get(self.device) is not None:
+            raise RuntimeError('A command poller is already active on '
+                               'device {}'.format(self.device.name))
+        setattr(self.device, self.DEVICE_ATTR, self)
+        return self
+
+    def stop(self):
+        '''Deactivate the poller and drop all outputs.'''
+        if self.get(self.device) is self:
+            delattr(self.device, self.DEVICE_ATTR)
+        log.debug('Command poller on {}: {} round trips, {} shared outputs'.
+                  format(self.device.name, self.round_trips, self.hits))
+        with self._lock:
+            self._results.clear()
+            self._locks.clear()
+
+    @staticmethod
+    def _key(command, kwargs):
+        return (command, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+
+    def _command_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _parse(self, command, **kwargs):
+        # A connection pool runs the commands of several threads at once,
+        # other connections would interleave their outputs
+        lock = nullcontext() if is_connection_pool(self.device) \
+            else self._device_lock
+        with lock:
+            return self.device.parse(command, **kwargs)
+
+    def parse(self, command, freshness=None, **kwargs):
+        '''Return `device.parse(command, **kwargs)`, shared with every
+        caller within the freshness window. Each caller gets its own copy
+        of the parsed output.
+
+        Args:
+            command (`str`): Command to parse
+            freshness (`int`): Override the freshness window of the poller
+            kwargs (`dict`): Arguments of `device.parse`
+
+        Raises:
+            SchemaEmptyParserError, also when shared with other callers
+        '''
+        if freshness is None:
+            freshness = self.freshness
+        key = self._key(command, kwargs)
+
+        # Callers of the same command wait for the ongoing round trip
+        with self._command_lock(key):
+            entry = self._results.get(key)
+            if entry and time.monotonic() - entry[0] <= freshness:
+                self.hits += 1
+            else:
+                self.round_trips += 1
+                try:
+                    output = self._parse(command, **kwargs)
+                except SchemaEmptyParserError as e:
+                    entry = (time.monotonic(), None, e)
+                else:
+                    entry = (time.monotonic(), output, None)
+                self._results[key] = entry
+
+        if entry[2] is not None:
+            raise entry[2]
+        return copy.deepcopy(entry[1])
+
+    def wait_for(self, command, predicate, max_time=60, check_interval=10,
+                 ignore=(SchemaEmptyParserError,), **kwargs):
+        '''Poll `command` until `predicate` returns a true value.
+
+        Args:
+            command (`str`): Command to parse
+            predicate (`callable`): Called with the parsed output
+            max_time (`int`): Max time in seconds. Default to 60
+            check_interval (`int`): Shortest interval in seconds between two
+                checks. Default to 10
+            ignore (`tuple`): Exceptions of the parser treated as the
+                condition not being met. Default to SchemaEmptyParserError
+            kwargs (`dict`): Arguments of `device.parse`
+
+        Returns:
+            Value returned by `predicate`, or False if max_time was reached
+        '''
+        deadline = time.monotonic() + max_time
+        max_interval = self.max_interval or check_interval * 3
+        interval = check_interval
+        previous = output = None
+
+        while True:
+            try:
+                output = self.parse(command,
+                                    freshness=min(self.freshness, interval),
+                                    **kwargs)
+            except ignore as e:
+                log.debug('Could not parse {}: {}'.format(command, e))
+                output = None
+            else:
+                result = predicate(output)
+                if result:
+                    return result
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            # Back off while the device state does not change
+            if output is not None and output == previous:
+                interval = min(interval * self.backoff, max_interval)
+            else:
+                interval = check_interval
+            previous = output
+            time.sleep(min(interval, remaining))
+
+
+def parse_command(device, command, **kwargs):
+    '''Return `device.parse(command)`, through the poller active on the
+    device if any.'''
+    poller = CommandPoller.get(device)
+    if poller is None:
+        return device.parse(command, **kwargs)
+    return poller.parse(command, **kwargs)
+
+
+def wait_for_parsed(device, command, predicate, max_time=60, check_interval=10,
+                    ignore=(SchemaEmptyParserError,), **kwargs):
+    '''Poll `command` on the device until `predicate` returns a true value.
+
+    Subscribes to the poller active on the device if any, otherwise parses
+    the command every check_interval.
+
+    Args:
+        device (`obj`): Device object
+        command (`str`): Command to parse
+        predicate (`callable`): Called with the parsed output
+        max_time (`int`): Max time in seconds. Default to 60
+        check_interval (`int`): Interval in seconds between two checks.
+            Default to 10
+        ignore (`tuple`): Exceptions of the parser treated as the condition
+            not being met. Default to SchemaEmptyParserError
+        kwargs (`dict`): Arguments of `device.parse`
+
+    Returns:
+        Value returned by `predicate`, or False if max_time was reached
+    '''
+    poller = CommandPoller.get(device)
+    if poller is not None:
+        return poller.wait_for(command, predicate, max_time=max_time,
+                               check_interval=check_interval, ignore=ignore,
+                               **kwargs)
+
+    timeout = Timeout(max_time, check_interval)
+    while timeout.iterate():
+        try:
+            output = device.parse(command, **kwargs)
+        except ignore as e:
+            log.debug('Could not parse {}: {}'.format(command, e))
+            timeout.sleep()
+            continue
+        result = predicate(output)
+        if result:
+            return result
+        timeout.sleep()
+    return False
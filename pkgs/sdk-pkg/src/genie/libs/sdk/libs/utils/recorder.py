@@ -0,0 +1,196 @@
+'''Background recording of periodic command outputs.
+
+Soak tests need the output of commands such as `show processes memory`
+every N seconds on many devices, for hours, while the test runs.
+`CommandRecorder` runs one scheduling thread per device, each with its own
+connection so the test connection is left alone. Outputs are appended to a
+compressed file per device as they are collected; nothing is kept in memory.
+
+Example::
+
+    >>> from genie.libs.sdk.libs.utils.recorder import CommandRecorder
+    >>> recorder = CommandRecorder(directory=runtime.directory)
+    >>> recorder.add(device, ['show processes memory'], interval=60)
+    >>> recorder.start()
+    >>> ...
+    >>> recorder.stop()
+    {'R1': '/path/R1_commands.txt.gz'}
+
+Recorders are registered by name, so they can be started and stopped from
+different places (Blitz `api` actions, the health plugin) with the
+`start_command_recorder` and `stop_command_recorder` APIs.
+'''
+
+# Python
+import os
+import gzip
+import time
+import logging
+import threading
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+# name -> running CommandRecorder
+_recorders = {}
+_recorders_lock = threading.Lock()
+
+
+def get_recorder(name='default'):
+    '''Return the recorder registered with `name`, or None.'''
+    return _recorders.get(name)
+
+
+class _DeviceRecorder(threading.Thread):
+    '''Runs the commands of one device on schedule.'''
+
+    def __init__(self, recorder, device, path):
+        super().__init__(name='recorder-{}'.format(device.name), daemon=True)
+        self.recorder = recorder
+        self.device = device
+        self.path = path
+        # command -> interval in seconds
+        self.commands = {}
+        self.samples = 0
+        self.errors = 0
+        self._connection = None
+
+    def _get_connection(self):
+        alias = self.recorder.alias
+        if alias is None:
+            return self.device
+        if self._connection is None:
+            if alias not in self.device.connectionmgr.connections:
+                self.device.connect(alias=alias, log_stdout=False)
+            self._connection = getattr(self.device, alias)
+        return self._connection
+
+    def run(self):
+        stop_event = self.recorder._stop_event
+        # command -> next time it is due
+        due = {command: time.monotonic() for command in self.commands}
+
+        with gzip.open(self.path, 'at', compresslevel=self.recorder.compresslevel) as f:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                for command, interval in self.commands.items():
+                    if due[command] > now:
+                        continue
+                    self._record(f, command)
+                    # skip the runs missed while the device was busy
+                    due[command] += interval * max(
+                        1, int((time.monotonic() - due[command]) // interval) + 1)
+                stop_event.wait(max(0, min(due.values()) - time.monotonic()))
+
+        if self._connection is not None and self.recorder.alias is not None:
+            try:
+                self._connection.disconnect()
+            except Exception as e:
+                log.warning('Could not disconnect recorder connection of '
+                            '{d}: {e}'.format(d=self.device.name, e=e))
+
+    def _record(self, f, command):
+        timestamp = datetime.now().isoformat()
+        try:
+            output = self._get_connection().execute(command)
+        except Exception as e:
+            self.errors += 1
+            log.warning('Recorder failed to execute {c} on {d}: {e}'.format(
+                c=command, d=self.device.name, e=e))
+            output = 'Failed to execute command: {e}'.format(e=e)
+        else:
+            self.samples += 1
+        f.write('\n===== {t} {d} "{c}" =====\n{o}\n'.format(
+            t=timestamp, d=self.device.name, c=command, o=output))
+        f.flush()
+
+
+class CommandRecorder(object):
+    '''Record command outputs periodically on several devices, in the
+    background.'''
+
+    def __init__(self, directory, name='default', alias='recorder',
+                 compresslevel=6):
+        '''
+        Args:
+            directory (`str`): Directory of the output files
+            name (`str`): Name to register the recorder with when started.
+                Default to 'default'
+            alias (`str`): Alias of the connection opened on each device to
+                run the commands; None to use the device default connection.
+                Default to 'recorder'
+            compresslevel (`int`): gzip compression level. Default to 6
+        '''
+        self.directory = directory
+        self.name = name
+        self.alias = alias
+        self.compresslevel = compresslevel
+        self._devices = {}
+        self._stop_event = threading.Event()
+        self._started = False
+
+    def add(self, device, commands, interval=60):
+        '''Schedule `commands` every `interval` seconds on `device`.
+
+        Args:
+            device (`obj`): Device object
+            commands (`list`): Commands to record
+            interval (`int`): Seconds between two runs of each command.
+                Default to 60
+        '''
+        if self._started:
+            raise RuntimeError('Cannot add commands to a running recorder')
+        if interval <= 0:
+            raise ValueError('interval must be positive, not {}'.format(interval))
+        if isinstance(commands, str):
+            commands = [commands]
+
+        if device.name not in self._devices:
+            path = os.path.join(self.directory, '{d}_commands.txt.gz'.format(
+                d=device.name))
+            self._devices[device.name] = _DeviceRecorder(self, device, path)
+        for command in commands:
+            self._devices[device.name].commands[command] = interval
+
+    def start(self):
+        '''Start recording and register the recorder by its name.'''
+        with _recorders_lock:
+            if self.name in _recorders:
+                raise RuntimeError("A command recorder named '{}' is already "
+                                   "running".format(self.name))
+            _recorders[self.name] = self
+        os.makedirs(self.directory, exist_ok=True)
+        self._started = True
+        for device_recorder in self._devices.values():
+            device_recorder.start()
+        log.info('Recording commands on {} device(s) to {}'.format(
+            len(self._devices), self.directory))
+        return self
+
+    def stop(self, timeout=None):
+        '''Stop recording and unregister the recorder.
+
+        Args:
+            timeout (`int`): Seconds to wait for each device to finish its
+                current command
+
+        Returns:
+            `dict` of device name to output file
+        '''
+        self._stop_event.set()
+        for device_recorder in self._devices.values():
+            if device_recorder.is_alive():
+                device_recorder.join(timeout)
+        with _recorders_lock:
+            if _recorders.get(self.name) is self:
+                del _recorders[self.name]
+        for name, device_recorder in self._devices.items():
+            log.info('Recorded {s} outputs ({e} errors) on {d} to {p}'.format(
+                s=device_recorder.samples, e=device_recorder.errors, d=name,
+                p=device_recorder.path))
+        return {name: device_recorder.path
+                for name, device_recorder in self._devices.items()}
+
+    @property
+    def running(self):
+        return self._started and not self._stop_event.is_set()
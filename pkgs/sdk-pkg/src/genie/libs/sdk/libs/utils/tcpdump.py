@@ -1,5 +1,132 @@
 import os
-from pyats.utils.fileutils import FileUtils
+import re
+import time
+import struct
+import logging
+from collections import deque, namedtuple
+
+from genie.libs.filetransferutils.session import session_pool
+
+log = logging.getLogger(__name__)
+
+# One captured packet of a pcap stream
+PcapRecord = namedtuple('PcapRecord', ['timestamp', 'orig_len', 'data'])
+
+
+class PcapStreamDecoder(object):
+    '''
+        Incremental decoder of a pcap stream, fed with chunks of bytes as
+        they are received.
+
+        Example:
+            decoder = PcapStreamDecoder()
+            for record in decoder.feed(chunk):
+                record.timestamp, record.data
+    '''
+    # magic number -> (byte order, timestamp fraction divisor)
+    MAGICS = {
+        b'\xd4\xc3\xb2\xa1': ('<', 1e6),
+        b'\xa1\xb2\xc3\xd4': ('>', 1e6),
+        b'\x4d\x3c\xb2\xa1': ('<', 1e9),
+        b'\xa1\xb2\x3c\x4d': ('>', 1e9),
+    }
+    GLOBAL_HEADER_LEN = 24
+    RECORD_HEADER_LEN = 16
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._byte_order = None
+        self._divisor = None
+        self.header = None
+        self.linktype = None
+
+    def feed(self, data):
+        '''Add received bytes and return the records completed by them'''
+        self._buffer.extend(data)
+        records = []
+
+        if self.header is None:
+            if len(self._buffer) < self.GLOBAL_HEADER_LEN:
+                return records
+            header = bytes(self._buffer[:self.GLOBAL_HEADER_LEN])
+            try:
+                self._byte_order, self._divisor = self.MAGICS[header[:4]]
+            except KeyError:
+                raise ValueError('Not a pcap stream, magic number is '
+                                 '{}'.format(header[:4].hex())) from None
+            self.header = header
+            self.linktype = struct.unpack(self._byte_order + 'I',
+                                          header[20:24])[0]
+            del self._buffer[:self.GLOBAL_HEADER_LEN]
+
+        record_header = self._byte_order + 'IIII'
+        offset = 0
+        while len(self._buffer) - offset >= self.RECORD_HEADER_LEN:
+            ts_sec, ts_frac, incl_len, orig_len = struct.unpack_from(
+                record_header, self._buffer, offset)
+            end = offset + self.RECORD_HEADER_LEN + incl_len
+            if len(self._buffer) < end:
+                break
+            records.append(PcapRecord(
+                timestamp=ts_sec + ts_frac / self._divisor,
+                orig_len=orig_len,
+                data=bytes(self._buffer[offset + self.RECORD_HEADER_LEN:end])))
+            offset = end
+        del self._buffer[:offset]
+        return records
+
+    def pack(self, record):
+        '''Return the bytes of a record, as written in the stream'''
+        ts_sec = int(record.timestamp)
+        ts_frac = int(round((record.timestamp - ts_sec) * self._divisor))
+        return struct.pack(self._byte_order + 'IIII', ts_sec, ts_frac,
+                           len(record.data), record.orig_len) + record.data
+
+
+class PcapRotatingWriter(object):
+    '''
+        Write pcap records to files of at most max_bytes, keeping the last
+        backup_count files: <name>.pcap, <name>.1.pcap, ...
+    '''
+    def __init__(self, path, header, max_bytes=None, backup_count=1):
+        self.path = path
+        self.header = header
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._size = 0
+        self._open()
+
+    def _filename(self, index):
+        if not index:
+            return self.path
+        root, ext = os.path.splitext(self.path)
+        return '{r}.{i}{e}'.format(r=root, i=index, e=ext)
+
+    def _open(self):
+        self._file = open(self.path, 'wb')
+        self._file.write(self.header)
+        self._size = len(self.header)
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self._filename(index - 1)
+            if os.path.exists(source):
+                os.replace(source, self._filename(index))
+        self._open()
+
+    def write(self, data):
+        if self.max_bytes and self._size > len(self.header) and \
+                self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
 
 
 class TcpDump(object):
@@ -25,12 +152,22 @@ class TcpDump(object):
             t.stop()
             x = t.parse()
             x[0]['IP']['dst']
+
+            # Or decode the packets while they are captured, until a
+            # predicate is met
+            records = t.stream('tcpdump -i any udp port 514', duration=60,
+                               predicates=[lambda r: b'%LINK' in r.data])
+            x = t.parse_records()
     '''
     def __init__(self, device, pcap_file=None, protocol='scp', local_dir=None):
         self.device = device
         self.protocol = protocol
         self.pcap_file = pcap_file
         self.local_dir = local_dir
+        # streaming capture, see stream()
+        self.decoder = None
+        self.records = deque()
+        self.packet_count = 0
 
     def send(self, cmd, attach_pcap=True):
         cmd = '{c}'.format(c=cmd)
@@ -64,15 +201,132 @@ class TcpDump(object):
 
             # Create directory if doesnt exists
             os.makedirs(self.local_dir, exist_ok=True)
-            with FileUtils(testbed=self.device.testbed) as futils:
-                futils.get_child(self.protocol)
-                futils.children[self.protocol].SSH_DEFAULT_PORT = port
+            # sessions to another port are pooled apart
+            with session_pool.session(self.device.testbed, ip, self.protocol,
+                                      port=None if port == 22 else port) \
+                    as futils:
                 futils.copyfile(
                     source = '{p}://{i}/{path}'.format(p=self.protocol, i=ip,
                                                        path=self.pcap_file),
                     destination = self.local_dir)
         return output
 
+    # 'od -An -v -tx1' output line, the only lines carrying the pcap stream
+    HEX_LINE = re.compile(r'^\s*(?:[0-9a-f]{2}\s+)*[0-9a-f]{2}\s*$')
+
+    def stream(self, cmd, duration=60, predicates=None, max_packets=None,
+               ring_size=10000, rotate_bytes=None, rotate_count=1,
+               read_timeout=1):
+        '''
+            Run the tcpdump command with its pcap output streamed over the
+            device connection, and decode the packets while they are
+            captured.
+
+            The pcap stream is hex encoded on the server ('od'), so binary
+            data goes through the terminal unaltered. The last ring_size
+            packets are kept in self.records. If local_dir and pcap_file are
+            provided, every packet is also written to local_dir, rotating
+            the file every rotate_bytes and keeping rotate_count files.
+
+            Args:
+                cmd (`str`): tcpdump command, without -w
+                duration (`int`): Max seconds to capture. Default to 60
+                predicates (`list`): Callables called with each PcapRecord;
+                    the capture ends as soon as one returns True
+                max_packets (`int`): End the capture after that many packets
+                ring_size (`int`): Number of packets kept in memory.
+                    Default to 10000
+                rotate_bytes (`int`): Max size of a local pcap file
+                rotate_count (`int`): Number of local pcap files kept.
+                    Default to 1
+                read_timeout (`int`): Seconds to wait for data on each read
+
+            Returns:
+                `list` of the PcapRecord kept in memory
+        '''
+        predicates = predicates or []
+        self.decoder = PcapStreamDecoder()
+        self.records = deque(maxlen=ring_size)
+        self.packet_count = 0
+        writer = None
+        pending = ''
+
+        self.device.send('{c} -U -w - | od -An -v -tx1\n'.format(c=cmd))
+        end_time = time.time() + duration
+        try:
+            done = False
+            while not done and time.time() < end_time:
+                output = self._read(read_timeout)
+                if not output:
+                    continue
+                # only complete lines are decoded, the rest is kept
+                lines = (pending + output).split('\n')
+                pending = lines.pop()
+                chunk = bytes.fromhex(''.join(
+                    line for line in lines if self.HEX_LINE.match(line)))
+                for record in self.decoder.feed(chunk):
+                    self.packet_count += 1
+                    self.records.append(record)
+                    if self.local_dir and self.pcap_file:
+                        if writer is None:
+                            writer = self._stream_writer(rotate_bytes,
+                                                         rotate_count)
+                        writer.write(self.decoder.pack(record))
+                    if any(predicate(record) for predicate in predicates):
+                        log.info('Capture ended by predicate after {n} '
+                                 'packets'.format(n=self.packet_count))
+                        done = True
+                        break
+                    if max_packets and self.packet_count >= max_packets:
+                        done = True
+                        break
+        finally:
+            if writer:
+                writer.close()
+            # send cntrl+c and drain the rest of the output
+            self.device.send('\x03')
+            self._read(read_timeout)
+
+        return list(self.records)
+
+    def _read(self, timeout):
+        '''Return what the device sent within timeout seconds'''
+        if self.device.receive(r'[\s\S]+', timeout=timeout):
+            return self.device.receive_buffer()
+        return ''
+
+    def _stream_writer(self, rotate_bytes, rotate_count):
+        os.makedirs(self.local_dir, exist_ok=True)
+        local_file = os.path.join(self.local_dir,
+                                  os.path.basename(self.pcap_file))
+        return PcapRotatingWriter(local_file, self.decoder.header,
+                                  max_bytes=rotate_bytes,
+                                  backup_count=rotate_count)
+
+    def parse_records(self, records=None):
+        '''
+            Decode the records of a streamed capture with scapy
+
+            Args:
+                records (`list`): PcapRecord, default to the ones kept by
+                    the last stream()
+        '''
+        try:
+            from scapy.all import conf, Raw
+        except ImportError:
+            raise ImportError('scapy is not installed, please install it by running: '
+            'pip install scapy') from None
+
+        if records is None:
+            records = self.records
+        layer = conf.l2types.get(self.decoder.linktype, Raw)
+        packets = []
+        for record in records:
+            packet = layer(record.data)
+            packet.time = record.timestamp
+            packets.append(packet)
+        return packets
+
     def parse(self):
         try:
             from scapy.all import rdpcap
@@ -368,6 +368,7 @@ def parse(self,
           max_time=None,
           check_interval=None,
           continue_=True,
+          poll_queries_together=False,
           processor='',
           health_uids=None,
           health_groups=None,
@@ -401,6 +402,7 @@ def parse(self,
                           'check_interval': check_interval,
                           'continue_': continue_,
                           'expected_failure': expected_failure,
+                          'poll_queries_together': poll_queries_together,
                           'arguments': arguments,
                           'custom_verification_message': kwargs.pop('custom_verification_message', None)}
 
@@ -425,6 +427,7 @@ def execute(self,
             max_time=None,
             check_interval=None,
             continue_=True,
+            poll_queries_together=False,
             processor='',
             health_uids=None,
             health_groups=None,
@@ -454,7 +457,8 @@ def execute(self,
             'max_time': max_time,
             'check_interval': check_interval,
             'continue_': continue_,
-            'expected_failure': expected_failure
+            'expected_failure': expected_failure,
+            'poll_queries_together': poll_queries_together
         })
 
         output = execute_handler(**kwargs)
@@ -477,6 +481,7 @@ def api(self,
         max_time=None,
         check_interval=None,
         continue_=True,
+        poll_queries_together=False,
         processor='',
         health_uids=None,
         health_groups=None,
@@ -511,6 +516,7 @@ def api(self,
                        'continue_': continue_,
                        'arguments': arguments,
                        'expected_failure': expected_failure,
+                       'poll_queries_together': poll_queries_together,
                        'blitz_obj': self})
 
         output = api_handler(**kwargs)
@@ -534,6 +540,7 @@ def learn(self,
           check_interval=None,
           expected_failure=False,
           continue_=True,
+          poll_queries_together=False,
           processor='',
           health_uids=None,
           health_groups=None,
@@ -559,7 +566,8 @@ def learn(self,
                         'max_time': max_time,
                         'check_interval': check_interval,
                         'continue_': continue_,
-                        'expected_failure': expected_failure})
+                        'expected_failure': expected_failure,
+                        'poll_queries_together': poll_queries_together})
 
         output = learn_handler(**kwargs)
 
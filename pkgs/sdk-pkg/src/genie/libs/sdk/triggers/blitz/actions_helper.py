@@ -15,6 +15,7 @@ from genie.conf.base.utils import QDict
 from genie.utils.timeout import Timeout
 from genie.ops.utils import get_ops_exclude
 from genie.libs.parser.utils import get_parser_exclude
+from genie.libs.sdk.libs.utils.dq_index import PathIndex
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 
 # from pyats
@@ -85,6 +86,7 @@ def parse_handler(step,
                   max_time=None,
                   check_interval=None,
                   continue_=True,
+                  poll_queries_together=False,
                   arguments=None,
                   **extra_kwargs):
 
@@ -107,6 +109,7 @@ def parse_handler(step,
               'check_interval': check_interval,
               'continue_': continue_,
               'action': 'parse',
+              'poll_queries_together': poll_queries_together,
               'expected_failure': expected_failure,
               'extra_kwargs': extra_kwargs}
 
@@ -145,6 +148,7 @@ def execute_handler(step,
                     max_time=None,
                     check_interval=None,
                     continue_=True,
+                    poll_queries_together=False,
                     **extra_kwargs):
 
     if 'reply' in extra_kwargs:
@@ -177,6 +181,7 @@ def execute_handler(step,
               'check_interval': check_interval,
               'continue_': continue_,
               'action': 'execute',
+              'poll_queries_together': poll_queries_together,
               'expected_failure': expected_failure,
               'extra_kwargs': extra_kwargs}
 
@@ -192,6 +197,7 @@ def learn_handler(step,
                   max_time=None,
                   check_interval=None,
                   continue_=True,
+                  poll_queries_together=False,
                   **extra_kwargs):
 
     # Save the to_dict learn output,
@@ -210,6 +216,7 @@ def learn_handler(step,
               'check_interval': check_interval,
               'continue_': continue_,
               'action': 'learn',
+              'poll_queries_together': poll_queries_together,
               'expected_failure': expected_failure,
               'extra_kwargs': extra_kwargs}
 
@@ -226,6 +233,7 @@ def api_handler(step,
                 max_time=None,
                 check_interval=None,
                 continue_=True,
+                poll_queries_together=False,
                 arguments=None,
                 **kwargs):
 
@@ -286,6 +294,7 @@ def api_handler(step,
               'check_interval': check_interval,
               'continue_': continue_,
               'action': 'api',
+              'poll_queries_together': poll_queries_together,
               'expected_failure': expected_failure,
               'arguments':arguments,
               'extra_kwargs':kwargs}
@@ -589,6 +598,7 @@ def _output_query_template(output,
                            arguments=None,
                            rest_device_alias=None,
                            expected_failure=False,
+                           poll_queries_together=False,
                            extra_kwargs=None):
 
     if not extra_kwargs:
@@ -600,7 +610,45 @@ def _output_query_template(output,
             device=device, max_time=max_time, check_interval=check_interval)
     timeout = Timeout(max_time, check_interval)
 
-    for query, style in keys:
+    # index the parsed output once when several Dq queries are verified on it
+    use_path_index = sum(1 for query, _ in keys
+                         if _is_dq_query(query, action)) > 1
+    path_index = None
+
+    # queries verified with their own retry loop
+    retry_keys = keys
+    if poll_queries_together and keys:
+        # Fetch the output once per poll interval for all the queries,
+        # then report the outcome of each query in its own step
+        custom_message = extra_kwargs.pop('custom_verification_message', None)
+        output, results = _poll_queries(output=output,
+                                        keys=keys,
+                                        timeout=timeout,
+                                        command=command,
+                                        device=device,
+                                        action=action,
+                                        expected_failure=expected_failure,
+                                        failed_result_status=failed_result_status,
+                                        arguments=arguments,
+                                        rest_device_alias=rest_device_alias,
+                                        use_path_index=use_path_index,
+                                        extra_kwargs=extra_kwargs)
+        retry_keys = []
+        for (query, style), (step_result, message) in results:
+            step_msg = custom_message or \
+                "Verify that '{query}' is {style} in the output".\
+                    format(query=query, style=style)
+            custom_message = None
+            with steps.start(step_msg, continue_=continue_) as substep:
+                _query_result_to_step(substep,
+                                      step_result,
+                                      message,
+                                      action,
+                                      result_status=result_status,
+                                      failed_result_status=failed_result_status,
+                                      expected_failure=expected_failure)
+
+    for query, style in retry_keys:
 
         step_msg = "Verify that '{query}' is {style} in the output".\
                         format(query=query, style=style)
@@ -609,9 +657,9 @@ def _output_query_template(output,
             if custom_message:
                 step_msg = custom_message
 
-        # dict that would be sent with various data for inclusion/exclusion check
-        kwargs = {}
         send_cmd = False
+        if action == 'execute':
+            pattern = re.compile(str(query))
         # for each query and style
         with steps.start(step_msg, continue_=continue_) as substep:
 
@@ -630,27 +678,14 @@ def _output_query_template(output,
                         # add empty to proceed `include`/`exclude`/`max_time`/`check_interval`
                         output = ''
 
-                if action == 'execute':
-                    # validating the inclusion/exclusion of action execute,
-                    pattern = re.compile(str(query))
-                    found = pattern.search(str(output))
-                    kwargs.update({
-                        'action_output': found,
-                        'operation': None,
-                        'expected_value': None,
-                        'style': style,
-                        'key': query,
-                        'query_type': 'execute_query'
-                    })
-
-                else:
-                    # verifying the inclusion/exclusion of actions : learn, parse and api
-                    found = _get_output_from_query_validators(output, query)
-                    kwargs = found
-                    kwargs.update({'style': style, 'key': None})
+                if use_path_index:
+                    path_index = _get_path_index(output, path_index)
 
                 # Function would return (pass | fail | error)
-                step_result, message = _verify_include_exclude(**kwargs)
+                step_result, message = _verify_query(
+                    output, query, style, action,
+                    pattern=pattern if action == 'execute' else None,
+                    path_index=path_index)
 
                 if expected_failure and step_result == Failed:
                     substep.passed(message)
@@ -714,6 +749,159 @@ def _output_query_template(output,
 
     return output
 
+def _is_dq_query(query, action):
+    """
+    check if the query is a Dq query verified on a parsed output
+    """
+    return action != 'execute' and isinstance(query, str) and \
+        bool(Dq.query_validator(query))
+
+def _get_path_index(output, path_index=None):
+    """
+    return the PathIndex of the output, reusing path_index if it was built
+    for this output. None if the output is not a dictionary
+    """
+    if not isinstance(output, dict):
+        return None
+    if path_index is None or path_index.data is not output:
+        path_index = PathIndex(output)
+    return path_index
+
+def _verify_query(output, query, style, action, pattern=None, path_index=None):
+    """
+    verify the inclusion/exclusion of one query in the output,
+    returns the (result, message) of _verify_include_exclude
+    """
+    if action == 'execute':
+        # validating the inclusion/exclusion of action execute,
+        if pattern is None:
+            pattern = re.compile(str(query))
+        kwargs = {
+            'action_output': pattern.search(str(output)),
+            'operation': None,
+            'expected_value': None,
+            'style': style,
+            'key': query,
+            'query_type': 'execute_query'
+        }
+    else:
+        # verifying the inclusion/exclusion of actions : learn, parse and api
+        kwargs = _get_output_from_query_validators(output, query,
+                                                   path_index=path_index)
+        kwargs.update({'style': style, 'key': None})
+
+    return _verify_include_exclude(**kwargs)
+
+def _poll_queries(output,
+                  keys,
+                  timeout,
+                  command,
+                  device,
+                  action,
+                  expected_failure=False,
+                  failed_result_status=None,
+                  arguments=None,
+                  rest_device_alias=None,
+                  use_path_index=False,
+                  extra_kwargs=None):
+    """
+    verify all the queries against the same output, sending the command
+    again once per check_interval while some queries are not settled yet.
+    A query is settled once its result would end its step.
+
+    returns the last output and the list of ((query, style), (result, message))
+    """
+    if not extra_kwargs:
+        extra_kwargs = {}
+
+    # compile the regexes of action execute only once
+    patterns = [re.compile(str(query)) if action == 'execute' else None
+                for query, _ in keys]
+    results = [None] * len(keys)
+    pending = list(range(len(keys)))
+    send_cmd = False
+    path_index = None
+
+    while True:
+        if send_cmd:
+            try:
+                output = _send_command(command,
+                                       device,
+                                       action,
+                                       arguments=arguments,
+                                       rest_device_alias=rest_device_alias,
+                                       **extra_kwargs)
+            except SchemaEmptyParserError:
+                # add empty to proceed `include`/`exclude`/`max_time`/`check_interval`
+                output = ''
+
+        if use_path_index:
+            path_index = _get_path_index(output, path_index)
+
+        still_pending = []
+        for index in pending:
+            query, style = keys[index]
+            results[index] = _verify_query(output, query, style, action,
+                                           pattern=patterns[index],
+                                           path_index=path_index)
+            step_result = results[index][0]
+            if not (expected_failure and step_result == Failed
+                    or not expected_failure and step_result == Passed
+                    or failed_result_status and step_result == Failed):
+                still_pending.append(index)
+        pending = still_pending
+
+        if not pending:
+            break
+        log.debug('{} of {} queries are not verified yet'.format(
+            len(pending), len(keys)))
+        send_cmd = True
+        timeout.sleep()
+        if not timeout.iterate():
+            break
+
+    return output, list(zip(keys, results))
+
+def _query_result_to_step(substep,
+                          step_result,
+                          message,
+                          action,
+                          result_status=None,
+                          failed_result_status=None,
+                          expected_failure=False):
+    """
+    set the result of the step of one query, same as the retry loop of
+    _output_query_template does
+    """
+    if expected_failure and step_result == Failed:
+        substep.passed(message)
+    if not expected_failure and step_result == Passed:
+        # step_result will only change to result_status if it is passed.
+        if result_status:
+            log.warning('The result status is changed from passed to {}' \
+                        ' based on the result_status'.format(result_status))
+            getattr(substep, result_status)(message)
+        else:
+            substep.passed(message)
+    if failed_result_status and step_result == Failed:
+        # step_result will only change to failed_result_status if it failed.
+        log.warning('The result status is changed from failed to {}' \
+                    ' based on the failed_result_status'.format(failed_result_status))
+        getattr(substep, failed_result_status)(message)
+
+    # failing logic in case of timeout
+    if (
+        not expected_failure
+        and step_result == Failed
+        or expected_failure
+        and step_result == Passed
+    ):
+        substep.failed(message)
+    else:
+        log.info(
+            '{} failed as expected, the step test result is set as passed'.format(action)
+        )
+
 def _include_exclude_list(include, exclude):
     """
     create the list of queries that would be checked for include or exclude
@@ -801,14 +989,18 @@ def _send_command(command,
 
     return getattr(device, action)(command, **kwargs)
 
-def _get_output_from_query_validators(output, query):
+def _get_output_from_query_validators(output, query, path_index=None):
     """the function determines the type of query and
        returns the appropriate result"""
 
     ret_dict = {}
     # if it is a valid dq query than apply the query and return the output
     if Dq.query_validator(query):
-        output = Dq.str_to_dq_query(output, query)
+        if path_index is not None and path_index.data is output:
+            # evaluated on the index built once for this output
+            output = path_index.query(query)
+        else:
+            output = Dq.str_to_dq_query(output, query)
         ret_dict.update({
             'action_output': output,
             'query_type': 'dq_query',
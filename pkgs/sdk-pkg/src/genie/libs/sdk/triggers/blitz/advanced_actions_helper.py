@@ -171,6 +171,7 @@ def _loop_iterator(self,
                    iterator_item=None,
                    every_seconds=None,
                    parallel=None,
+                   max_workers=None,
                    **kwargs):
     """actually iterate over the actions under loop and call them"""
 
@@ -253,7 +254,8 @@ def _loop_iterator(self,
         _report_every_seconds(loop_start_time, every_seconds)
 
     # execute each iteration of the loop in parallel
-    _actions_execute_in_loop_in_parallel(self, section, pcall_payload, ret_list, steps)
+    _actions_execute_in_loop_in_parallel(self, section, pcall_payload, ret_list,
+                                         steps, max_workers=max_workers)
     return ret_list
 
 def _save_iterator_items(self, section, loop_variable_name,
@@ -359,17 +361,26 @@ def _check_loop_until(self, ret_list, loop_until=None):
         if str(ret_list[index_]['step_result']) == loop_until.lower():
             return index_
 
-def _actions_execute_in_loop_in_parallel(self, section, payload, ret_list, steps):
-
+def _actions_execute_in_loop_in_parallel(self, section, payload, ret_list, steps,
+                                         max_workers=None):
+    """
+    run the actions concurrently. With max_workers, the actions run in
+    batches of at most max_workers actions, one batch after the other.
+    Batches are forked from this thread only, and the results are reported
+    in the order of the payload
+    """
     if not payload:
         return
 
-    try:
-        pcall_returns = pcall(self.dispatcher, ikwargs=payload)
-    except Exception:
-        steps.errored("Unable to execute actions concurrently")
+    batch_size = max_workers or len(payload)
+    for index in range(0, len(payload), batch_size):
+        try:
+            pcall_returns = pcall(self.dispatcher,
+                                  ikwargs=payload[index:index + batch_size])
+        except Exception:
+            steps.errored("Unable to execute actions concurrently")
 
-    ret_list.append(_parallel(self, section, pcall_returns, steps))
+        ret_list.append(_parallel(self, section, pcall_returns, steps))
 
 def _check_user_input_error(step, action_item, loop_return_items):
     """
@@ -379,6 +390,7 @@ def _check_user_input_error(step, action_item, loop_return_items):
     3 - must have actions
     4 - needs at least one iterable or terminating condition
     5 - parallel in loop would not work with until, do_until and loop_until
+    6 - max_workers must be a positive integer
     """
     keys = [(not 'actions' in action_item,
             "No actions was provided to be looped over."),
@@ -392,7 +404,11 @@ def _check_user_input_error(step, action_item, loop_return_items):
             'At least one iterable item or terminating condition should be in the loop'),
             (('until' in action_item or 'do_until' in action_item or
               'lop_until' in action_item) and 'parallel' in action_item,
-            'Parallel execution of items in loop cannot be done with until, do_until or loop_until')]
+            'Parallel execution of items in loop cannot be done with until, do_until or loop_until'),
+            ('max_workers' in action_item and
+              not (isinstance(action_item['max_workers'], int) and
+                   action_item['max_workers'] > 0),
+            'max_workers should be a positive integer.')]
 
     for key in keys:
         if key[0]:
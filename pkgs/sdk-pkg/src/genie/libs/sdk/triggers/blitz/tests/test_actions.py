@@ -8,6 +8,7 @@ from unittest.mock import patch
 
 from genie.libs import sdk
 from genie.testbed import load
+from genie.utils.dq import Dq
 from genie.conf.base.api import API
 from genie.conf.base import Testbed, Device
 from genie.harness.script import TestScript
@@ -15,6 +16,7 @@ from genie.harness.standalone import run_genie_sdk
 from genie.libs.sdk.triggers.blitz.blitz import Blitz
 from genie.libs.ops.platform.nxos.platform import Platform
 from genie.libs.sdk.libs.abstracted_libs.restore import Restore
+from genie.libs.sdk.libs.utils.dq_index import PathIndex
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 from genie.libs.sdk.triggers.blitz.actions import (compare, rest, sleep,
                                                    restore_config_snapshot,
@@ -589,6 +591,46 @@ class TestActions(unittest.TestCase):
         parse(**self.kwargs)
         self.assertEqual(steps.result, Passed)
 
+    def test_parse_poll_queries_together(self):
+
+        # the second query is only satisfied by the second output
+        first_output = {'platform': {'os': 'NX-OS'}}
+        self.dev.parse = Mock(side_effect = [first_output,
+                                             self.parser_output])
+        steps =  Steps()
+        self.kwargs.update({'device': self.dev,
+                            'steps': steps,
+                            'command': 'cmd',
+                            'include': ["contains('os')",
+                                        "contains('os')",
+                                        "contains('software')"],
+                            'max_time': 5,
+                            'check_interval': 0.1,
+                            'poll_queries_together': True})
+
+        parse(**self.kwargs)
+        self.assertEqual(steps.result, Passed)
+        self.assertEqual(self.dev.parse.call_count, 2)
+        self.assertEqual(len(steps.details[0].details), 3)
+
+    def test_parse_poll_queries_together_fail(self):
+
+        self.dev.parse = Mock(return_value=self.parser_output)
+        steps =  Steps()
+        self.kwargs.update({'device': self.dev,
+                            'steps': steps,
+                            'command': 'cmd',
+                            'include': ["contains('software')",
+                                        "contains('sas')"],
+                            'max_time': 0.3,
+                            'check_interval': 0.1,
+                            'poll_queries_together': True})
+
+        parse(**self.kwargs)
+        self.assertEqual(steps.result, Failed)
+        results = [s.result for s in steps.details[0].details]
+        self.assertEqual(results, [Passed, Failed])
+
     def test_execute(self):
 
       self.dev.execute = Mock(side_effect = [self.execute_output])
@@ -718,6 +760,23 @@ class TestActions(unittest.TestCase):
         execute(**self.kwargs)
         self.assertEqual(steps.result, Passx)
 
+    def test_execute_poll_queries_together(self):
+
+        self.dev.execute = Mock(side_effect=['Cisco', self.execute_output])
+        steps = Steps()
+        self.kwargs.update({'device': self.dev,
+                            'steps': steps,
+                            'command': 'cmd',
+                            'include': ['Cisco', 'NX-OS'],
+                            'exclude': ['TESTSTSTS'],
+                            'max_time': 5,
+                            'check_interval': 0.1,
+                            'poll_queries_together': True})
+
+        execute(**self.kwargs)
+        self.assertEqual(steps.result, Passed)
+        self.assertEqual(self.dev.execute.call_count, 2)
+
     def test_learn(self):
 
       self.dev.learn = Mock(return_value = Platform(self.dev))
@@ -1121,6 +1180,21 @@ class TestActions(unittest.TestCase):
       for substep in steps.details:
         self.assertEqual(substep.result, Passed)
 
+    def test_dq_query_path_index(self):
+
+      index = PathIndex(self.parser_output)
+      for query in ["contains('software').get_values('bios_version', 0)",
+                    "contains('os', regex=True).get_values('os')",
+                    "contains_key_value('days', 61).get_values('kernel_uptime')",
+                    "get_values('system_version')",
+                    "contains('hardware').contains('slots').reconstruct()"]:
+        self.assertEqual(index.query(query),
+                         Dq.str_to_dq_query(self.parser_output, query))
+
+      self.assertEqual(
+        index.q.contains('memory').get_values('hardware'),
+        Dq(self.parser_output).contains('memory').get_values('hardware'))
+
     def test_dq_query_include_fail(self):
 
       steps = Steps()
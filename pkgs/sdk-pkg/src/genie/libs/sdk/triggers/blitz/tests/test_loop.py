@@ -4,6 +4,7 @@ import sys
 import yaml
 import logging
 import tempfile
+import threading
 import unittest
 import importlib
 from unittest import mock
@@ -221,6 +222,26 @@ class TestLoop(unittest.TestCase):
                   command: show version
                   device: "%VARIABLES{dev_name}"
             """
+    loop_parallel_max_workers = """
+            loop_variable_name: dev_name
+            value: ['PE1', 'PE2', 'PE1']
+            parallel: True
+            max_workers: 2
+            actions:
+              - execute:
+                  command: show version
+                  device: "%VARIABLES{dev_name}"
+            """
+    loop_parallel_max_workers_error = """
+            loop_variable_name: dev_name
+            value: ['PE1', 'PE2']
+            parallel: True
+            max_workers: 0
+            actions:
+              - execute:
+                  command: show version
+                  device: "%VARIABLES{dev_name}"
+            """
     loop_parallel_error = """
             loop_variable_name: dev_name
             value: ['PE', 'PE2']
@@ -576,6 +597,41 @@ class TestLoop(unittest.TestCase):
       out = loop(**self.kwargs)
       self.assertEqual(steps.result, Passed)
 
+    def test_loop_with_parallel_max_workers(self):
+
+      steps = Steps()
+      data = yaml.safe_load(self.loop_parallel_max_workers)
+      self.kwargs.update({'steps': steps, 'action_item': data})
+      threads = []
+
+      def pcall(func, ikwargs):
+        threads.append(threading.current_thread())
+        return [func(**kw) for kw in ikwargs]
+
+      helper = 'genie.libs.sdk.triggers.blitz.advanced_actions_helper'
+      with patch(helper + '.pcall', side_effect=pcall) as mock_pcall, \
+           patch(helper + '._parallel',
+                 wraps=importlib.import_module(helper)._parallel) as parallel:
+        out = loop(**self.kwargs)
+      self.assertEqual(steps.result, Passed)
+      # iterations are forked in batches of 2 from the main thread
+      self.assertEqual([len(c.kwargs['ikwargs']) for c in mock_pcall.call_args_list],
+                       [2, 1])
+      self.assertEqual(threads, [threading.main_thread()] * 2)
+      # results are reported in the order of the iterations
+      self.assertEqual([each_return['device']
+                        for c in parallel.call_args_list
+                        for each_return in c.args[2]],
+                       ['PE1', 'PE2', 'PE1'])
+
+    def test_loop_with_parallel_max_workers_errored(self):
+
+      steps = Steps()
+      data = yaml.safe_load(self.loop_parallel_max_workers_error)
+      self.kwargs.update({'steps': steps, 'action_item': data})
+      out = loop(**self.kwargs)
+      self.assertEqual(steps.result, Errored)
+
     def test_loop_with_parallel_errored(self):
 
       steps = Steps()
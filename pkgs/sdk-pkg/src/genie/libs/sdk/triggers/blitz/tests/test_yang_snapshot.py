@@ -5,7 +5,8 @@ from lxml import etree
 from ncclient import xml_
 from genie import testbed
 from unittest.mock import Mock
-from genie.libs.sdk.triggers.blitz.yang_snapshot import YangSnapshot
+from genie.libs.sdk.triggers.blitz.yang_snapshot import (
+    YangSnapshot, XpathTrie, split_xpath)
 
 
 class Testcase(object):
@@ -518,3 +519,59 @@ class TestYangSnapshot(unittest.TestCase):
             e.attrib['{urn:ietf:params:xml:ns:netconf:base:1.0}operation'],
             'remove',
         )
+
+    def test_split_xpath(self):
+        self.assertEqual(
+            split_xpath('/ios:native/ios:interface'
+                        '/ios:GigabitEthernet[ios:name="0/0/1"]/ios:mtu'),
+            ['', 'ios:native', 'ios:interface',
+             'ios:GigabitEthernet[ios:name="0/0/1"]', 'ios:mtu'])
+
+    def test_xpath_trie(self):
+        trie = XpathTrie([
+            '/ios:native/ios:ntp/ios-ntp:peer/ios-ntp:source',
+            '/ios:native/ios:ntp/ios-ntp:peer/ios-ntp:burst-opt',
+            '/ios:native/ios:hostname',
+        ])
+        visited = []
+        trie.walk(visited.append)
+        self.assertEqual(sorted(visited), [
+            '/ios:native',
+            '/ios:native/ios:ntp',
+            '/ios:native/ios:ntp/ios-ntp:peer',
+        ])
+
+    def test_collect_configs_batch_error(self):
+        native = '{http://cisco.com/ns/yang/Cisco-IOS-XE-native}native'
+        ntp = '{http://cisco.com/ns/yang/Cisco-IOS-XE-ntp}ntp'
+
+        def get_config(filter, source):
+            # Several roots or the ntp root alone are rejected
+            reply = Mock(ok=len(filter) == 1 and filter[0].tag != ntp)
+            reply.data_ele.find.side_effect = etree.Element
+            return reply
+        connection = Mock()
+        connection.get_config.side_effect = get_config
+
+        configs = self.yang_snapshot.collect_configs(
+            connection, ['ios:native', 'ios-ntp:ntp'])
+        self.assertEqual(connection.get_config.call_count, 3)
+        self.assertEqual(configs['ios:native'].getroot().tag, native)
+        self.assertIsNone(configs['ios-ntp:ntp'])
+
+    def test_plan_restore(self):
+        self.yang_snapshot.register(
+            device=self.device,
+            connection='netconf',
+            protocol='netconf',
+            operation='edit-config',
+            content=self.data[0]['yang']['content'],
+        )
+        xpath_set = self.yang_snapshot.plan_restore(self.device)
+        self.assertEqual(xpath_set, {'/ios:native/ios:ntp'})
+
+        expected = set()
+        for xpath in self.yang_snapshot.xpath['PE1']:
+            self.yang_snapshot.update_remove_xpaths(
+                xpath, expected, self.device)
+        self.assertEqual(xpath_set, expected)
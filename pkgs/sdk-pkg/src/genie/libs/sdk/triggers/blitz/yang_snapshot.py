@@ -9,6 +9,72 @@ log = logging.getLogger(__name__)
 FILTER_TAG = '{' + xml_.BASE_NS_1_0 + '}filter'
 
 
+def split_xpath(xpath):
+    '''Split an Xpath on '/' while keeping list keys intact, e.g.
+    /ios:native/ios:interface/ios:GigabitEthernet[ios:name="0/0/1"] is split
+    into ['', 'ios:native', 'ios:interface',
+    'ios:GigabitEthernet[ios:name="0/0/1"]'].'''
+
+    if '[' not in xpath:
+        return xpath.split('/')
+    pieces = []
+    start = 0
+    depth = 0
+    quote = None
+    for idx, char in enumerate(xpath):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == '/' and depth == 0:
+            pieces.append(xpath[start:idx])
+            start = idx + 1
+    pieces.append(xpath[start:])
+    return pieces
+
+
+class XpathTrie(object):
+    '''Prefix tree of Xpaths. Every node is one Xpath segment, so Xpaths
+    sharing ancestors share trie nodes and each ancestor is visited only once
+    no matter how many Xpaths were recorded below it.'''
+
+    def __init__(self, xpaths=()):
+        self.root = {}
+        for xpath in xpaths:
+            self.add(xpath)
+
+    def add(self, xpath):
+        '''Insert an absolute Xpath. Relative Xpaths are ignored.'''
+
+        segments = split_xpath(xpath)
+        if segments[0] != '' or len(segments) < 2:
+            return
+        node = self.root
+        for segment in segments[1:]:
+            node = node.setdefault(segment, {})
+
+    def walk(self, visit):
+        '''Walk the trie depth first, calling visit(xpath) for every
+        node that has children, i.e. every ancestor of a recorded Xpath. The
+        subtree below a node is skipped when visit() returns False.'''
+
+        stack = [('/' + segment, child)
+                 for segment, child in self.root.items()]
+        while stack:
+            xpath, node = stack.pop()
+            if not node:
+                continue
+            if visit(xpath) is False:
+                continue
+            stack.extend((xpath + '/' + segment, child)
+                         for segment, child in node.items())
+
+
 class YangSnapshot(object):
     '''Remove containers and list instances that are created and left over by
     Yang actions. We do not want to clean up config after every Yang action
@@ -152,9 +218,7 @@ class YangSnapshot(object):
                         "configured by 'yang' action.".format(device.name))
             return None
 
-        xpath_set = set()
-        for xpath in self.xpath[device.name]:
-            self.update_remove_xpaths(xpath, xpath_set, device)
+        xpath_set = self.plan_restore(device)
         if xpath_set:
             log.info("Removing Xpath:\n{}"
                      .format("\n".join(sorted(list(xpath_set)))))
@@ -318,18 +382,58 @@ class YangSnapshot(object):
         return device.name
 
     def collect_pre_config(self, device_name, connection, xpaths):
-        '''Collect configuration before Xpaths are manipulated.'''
+        '''Collect configuration before Xpaths are manipulated. All roots
+        of the device are collected by one get-config.'''
 
-        self.pre_config[device_name] = {}
-        result = True
+        roots = []
         for xpath in xpaths:
             root = self.get_root(xpath)
-            if root is not None and root not in self.pre_config[device_name]:
-                self.pre_config[device_name][root] = self.collect_config(
-                    connection, root)
-                if self.pre_config[device_name][root] is None:
-                    result = False
-        return result
+            if root is not None and root not in roots:
+                roots.append(root)
+        self.pre_config[device_name] = self.collect_configs(connection, roots)
+        return all(v is not None for v in self.pre_config[device_name].values())
+
+    def collect_configs(self, connection, roots):
+        '''Collect configuration of several roots by one Netconf get-config
+        whose subtree filter holds every root. If the device replies with
+        an error, each root is collected by its own get-config, so that
+        only the failing roots are missing. Returns a dictionary of root
+        to ElementTree, or None for a root that could not be collected.'''
+
+        configs = {}
+        ele_names = {}
+        for root in roots:
+            prefix, id = self.split_tag(root)
+            if prefix is None or prefix not in self.namespace:
+                log.warning("Prefix '{}' is not in self.namespace = {}"
+                            .format(prefix, self.namespace))
+                configs[root] = None
+            else:
+                ele_names[root] = "{{{}}}{}".format(
+                    self.namespace[prefix], id)
+        if not ele_names:
+            return configs
+
+        filter_ele = etree.Element(FILTER_TAG, type='subtree')
+        for ele_name in ele_names.values():
+            etree.SubElement(filter_ele, ele_name)
+        reply = connection.get_config(filter=filter_ele, source='running')
+        if not reply.ok and len(ele_names) > 1:
+            log.warning("Received error in reply when collecting {}, "
+                        "collecting them one by one"
+                        .format(', '.join(ele_names)))
+            for root in ele_names:
+                configs[root] = self.collect_config(connection, root)
+            return configs
+        for root, ele_name in ele_names.items():
+            if reply.ok:
+                configs[root] = etree.ElementTree(
+                    reply.data_ele.find(ele_name))
+            else:
+                log.warning("Received error in reply when collecting '{}'"
+                            .format(root))
+                configs[root] = None
+        return configs
 
     def collect_config(self, connection, root):
         '''Collect configuration by Netconf get-config.'''
@@ -367,6 +471,36 @@ class YangSnapshot(object):
         )
         return rpc_args
 
+    def plan_restore(self, device):
+        '''Determine containers and list instances to remove on a device.
+
+        Recorded Xpaths are loaded into an XpathTrie so that every ancestor
+        is checked against the snapshot once, and a removed ancestor prunes
+        all Xpaths below it.'''
+
+        xpath_set = set()
+        pre_config = self.pre_config.get(device.name, {})
+
+        def visit(xpath):
+            root = xpath.split('/', 2)[1]
+            if root not in pre_config:
+                return False
+            if pre_config[root] is None:
+                xpath_set.add(xpath)
+                return False
+            try:
+                node = pre_config[root].xpath(xpath,
+                                              namespaces=self.namespace)
+            except Exception:
+                return True
+            if not node:
+                xpath_set.add(xpath)
+                return False
+            return True
+
+        XpathTrie(self.xpath.get(device.name, ())).walk(visit)
+        return xpath_set
+
     def update_remove_xpaths(self, modified_xpath, xpath_set, device):
         '''Examine a modified Xpath and determine which container or list
         instance should be removed.'''